@@ -0,0 +1,270 @@
+from collections import Counter
+from decimal import ROUND_HALF_UP, Decimal
+
+from cache import VersionedCopy
+from schema import PREPARED_QUERIES, TABLE_COLUMNS
+
+SNAPSHOT_ARRAYSIZE = 10000
+MISMATCH_SAMPLE = 10
+
+# Prepared queries answered from the store
+AGGREGATE_QUERIES = ('8', '12', '17')
+
+# Every result the store keeps, with the SQL the consistency check compares it to
+AGGREGATE_SQL = {
+    **{key: PREPARED_QUERIES[key] for key in AGGREGATE_QUERIES},
+    'program_outcome_view': """
+SELECT Program_ID, Program_Name, Total_Applications, Accepted, Rejected, Pending, Avg_Applicant_GPA
+FROM Program_Outcome_View
+ORDER BY Program_ID
+""",
+    'applicant_summary_view': """
+SELECT Applicant_ID, First_Name, Last_Name, Institution_Name, GPA, Total_Applications, Accepted_Count
+FROM Applicant_Summary_View
+ORDER BY Applicant_ID
+""",
+}
+
+# Columns of each table the store keeps
+STORE_COLUMNS = {
+    'INSTITUTION': ('ID', 'NAME'),
+    'PROGRAM': ('ID', 'NAME'),
+    'APPLICANT': ('ID', 'FIRST_NAME', 'LAST_NAME', 'INSTITUTION_ID', 'GPA'),
+    'APPLICATION': ('ID', 'APPLICANT_ID', 'PROGRAM_ID', 'STATUS', 'OUTCOME'),
+    'APPLICATION_DOCUMENT': ('ID', 'APPLICATION_ID'),
+}
+
+CENT = Decimal("0.01")
+
+
+def _round(value: Decimal) -> Decimal:
+    # Oracle's ROUND(x, 2) rounds halves away from zero
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def _number(value: Decimal | None):
+    # What python-oracledb returns for a computed NUMBER: int when integral
+    if value is None:
+        return None
+    return int(value) if value == value.to_integral_value() else float(value)
+
+
+class AggregateStore(VersionedCopy):
+    # Counts of applications per status, outcome, program and applicant, and
+    # GPA sums for the averages, behind queries #8, #12 and #17 and the
+    # Program_Outcome_View and Applicant_Summary_View views. Loaded once and
+    # then updated by delta from the API's writes, so a result is a few
+    # dictionary walks instead of a GROUP BY over Application.
+    name = "Aggregate store"
+
+    def __init__(self, versions):
+        super().__init__(versions)
+        self.served = 0
+        self._clear()
+        self._results = {
+            '8': self._applications_by_status,
+            '12': self._accepted_by_program,
+            '17': self._acceptance_rates,
+            'program_outcome_view': self._program_outcomes,
+            'applicant_summary_view': self._applicant_summaries,
+        }
+
+    def _clear(self):
+        self.institutions = {}  # id -> name
+        self.programs = {}  # id -> name
+        self.applicants = {}  # id -> [first name, last name, institution id, GPA, applications, accepted]
+        self.applications = {}  # id -> (applicant id, program id, status, outcome)
+        self.documents = {}  # id -> application id
+        self.documents_by_application = {}  # application id -> document ids
+        self.status_counts = Counter()
+        self.program_stats = {}  # id -> [applications, accepted, rejected, pending, GPA sum]
+
+    def snapshot(self, conn):
+        current = self.versions.as_dict()
+        data = {}
+        with conn.cursor() as cur:
+            cur.arraysize = SNAPSHOT_ARRAYSIZE
+            cur.prefetchrows = SNAPSHOT_ARRAYSIZE
+            for oracle_table, columns in STORE_COLUMNS.items():
+                cur.execute(f"SELECT {', '.join(columns)} FROM {oracle_table}")
+                data[oracle_table] = (columns, cur.fetchall())
+        self.load(data, current)
+
+    def load(self, data, versions=None):
+        # data has the same layout as schema.SEED_DATA
+        self.ready = False
+        with self._lock:
+            self._clear()
+            for oracle_table in STORE_COLUMNS:
+                columns, rows = data.get(oracle_table, ((), []))
+                self._insert_rows(oracle_table, columns, rows)
+        self._loaded(versions)
+
+    def apply_inserts(self, oracle_table: str, rows):
+        # rows are TABLE_COLUMNS tuples read back from Oracle
+        self._apply(self._insert_rows, oracle_table, TABLE_COLUMNS[oracle_table], rows)
+
+    def apply_deletes(self, oracle_table: str, ids):
+        self._apply(self._delete_rows, oracle_table, ids)
+
+    def _apply(self, method, *args):
+        if not self.ready:
+            return
+        with self._lock:
+            try:
+                method(*args)
+            except KeyError:
+                # A row refers to one the store never saw; it is out of step
+                # and stays unused until the next snapshot
+                self.ready = False
+
+    def _insert_rows(self, oracle_table: str, columns, rows):
+        positions = [[c.upper() for c in columns].index(c) for c in STORE_COLUMNS[oracle_table]]
+        for row in rows:
+            self._insert(oracle_table, *(row[i] for i in positions))
+
+    def _insert(self, oracle_table: str, row_id, *values):
+        if self._exists(oracle_table, row_id):
+            self._delete(oracle_table, row_id)
+        if oracle_table == 'INSTITUTION':
+            self.institutions[row_id] = values[0]
+        elif oracle_table == 'PROGRAM':
+            self.programs[row_id] = values[0]
+            self.program_stats[row_id] = [0, 0, 0, 0, Decimal(0)]
+        elif oracle_table == 'APPLICANT':
+            first_name, last_name, institution_id, gpa = values
+            self.applicants[row_id] = [first_name, last_name, institution_id, Decimal(str(gpa)), 0, 0]
+        elif oracle_table == 'APPLICATION':
+            self._count_application(*values, 1)
+            self.applications[row_id] = values
+        elif oracle_table == 'APPLICATION_DOCUMENT':
+            self.documents[row_id] = values[0]
+            self.documents_by_application.setdefault(values[0], set()).add(row_id)
+
+    def _exists(self, oracle_table: str, row_id) -> bool:
+        return row_id in {
+            'INSTITUTION': self.institutions,
+            'PROGRAM': self.programs,
+            'APPLICANT': self.applicants,
+            'APPLICATION': self.applications,
+            'APPLICATION_DOCUMENT': self.documents,
+        }[oracle_table]
+
+    def _delete_rows(self, oracle_table: str, ids):
+        for row_id in ids:
+            if self._exists(oracle_table, row_id):
+                self._delete(oracle_table, row_id)
+
+    def _delete(self, oracle_table: str, row_id):
+        # Oracle refuses to delete institutions, programs and applicants that
+        # are still referenced, so only applications have dependents here
+        if oracle_table == 'INSTITUTION':
+            del self.institutions[row_id]
+        elif oracle_table == 'PROGRAM':
+            del self.programs[row_id]
+            del self.program_stats[row_id]
+        elif oracle_table == 'APPLICANT':
+            del self.applicants[row_id]
+        elif oracle_table == 'APPLICATION':
+            self._count_application(*self.applications.pop(row_id), -1)
+            # ON DELETE CASCADE
+            for document_id in self.documents_by_application.pop(row_id, ()):
+                del self.documents[document_id]
+        elif oracle_table == 'APPLICATION_DOCUMENT':
+            application_id = self.documents.pop(row_id)
+            self.documents_by_application[application_id].discard(row_id)
+
+    def _count_application(self, applicant_id, program_id, status, outcome, sign: int):
+        applicant = self.applicants[applicant_id]
+        stats = self.program_stats[program_id]
+        self.status_counts[status] += sign
+        if not self.status_counts[status]:
+            del self.status_counts[status]
+        applicant[4] += sign
+        applicant[5] += sign * (outcome == 'Accepted')
+        stats[0] += sign
+        stats[1] += sign * (outcome == 'Accepted')
+        stats[2] += sign * (outcome == 'Rejected')
+        stats[3] += sign * (outcome == 'Pending')
+        stats[4] += sign * applicant[3]
+
+    def result(self, name: str) -> tuple[list[str], list[tuple]]:
+        # Same columns, values and order as the SQL in AGGREGATE_SQL
+        with self._lock:
+            self.served += 1
+            return self._results[name]()
+
+    def _applications_by_status(self):
+        rows = sorted(self.status_counts.items(), key=lambda r: (-r[1], r[0]))
+        return ["status", "application_count"], rows
+
+    def _accepted_by_program(self):
+        accepted = Counter()
+        for program_id, stats in self.program_stats.items():
+            if stats[1]:
+                accepted[self.programs[program_id]] += stats[1]
+        rows = sorted(accepted.items(), key=lambda r: (-r[1], r[0]))
+        return ["program_name", "accepted_applications"], rows
+
+    def _acceptance_rates(self):
+        rows = []
+        for program_id, (total, accepted, _, _, gpa_sum) in self.program_stats.items():
+            if total:
+                rate = _round(Decimal(accepted) / total * 100)
+                rows.append((self.programs[program_id], total, accepted, rate, _round(gpa_sum / total)))
+        rows.sort(key=lambda r: (-r[3], -r[4]))
+        rows = [(name, total, accepted, _number(rate), _number(gpa)) for name, total, accepted, rate, gpa in rows]
+        return ["program_name", "total_applications", "accepted", "acceptance_rate", "avg_applicant_gpa"], rows
+
+    def _program_outcomes(self):
+        rows = []
+        for program_id in sorted(self.program_stats):
+            total, accepted, rejected, pending, gpa_sum = self.program_stats[program_id]
+            avg_gpa = _number(_round(gpa_sum / total)) if total else None
+            rows.append((program_id, self.programs[program_id], total, accepted, rejected, pending, avg_gpa))
+        columns = ["program_id", "program_name", "total_applications", "accepted", "rejected", "pending", "avg_applicant_gpa"]
+        return columns, rows
+
+    def _applicant_summaries(self):
+        rows = []
+        for applicant_id in sorted(self.applicants):
+            first_name, last_name, institution_id, gpa, total, accepted = self.applicants[applicant_id]
+            if institution_id in self.institutions:
+                rows.append((applicant_id, first_name, last_name, self.institutions[institution_id], float(gpa), total, accepted))
+        columns = ["applicant_id", "first_name", "last_name", "institution_name", "gpa", "total_applications", "accepted_count"]
+        return columns, rows
+
+    def check(self, conn) -> dict:
+        # Runs every AGGREGATE_SQL statement on Oracle and compares the rows
+        # with the store's; on any difference the store is reloaded.
+        mismatches = {}
+        with conn.cursor() as cur:
+            for name, sql in AGGREGATE_SQL.items():
+                cur.execute(sql)
+                expected = Counter(tuple(row) for row in cur.fetchall())
+                with self._lock:
+                    actual = Counter(self._results[name]()[1]) if self.ready else Counter()
+                if expected != actual:
+                    mismatches[name] = {
+                        "missing": [list(row) for row in (expected - actual)][:MISMATCH_SAMPLE],
+                        "unexpected": [list(row) for row in (actual - expected)][:MISMATCH_SAMPLE],
+                    }
+        if mismatches:
+            self.snapshot(conn)
+        return {"consistent": not mismatches, "mismatches": mismatches, "reloaded": bool(mismatches)}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "current_tables": self.current_tables(),
+                "snapshots": self.snapshots,
+                "results_served": self.served,
+                "rows": {
+                    "institutions": len(self.institutions),
+                    "programs": len(self.programs),
+                    "applicants": len(self.applicants),
+                    "applications": len(self.applications),
+                    "application_documents": len(self.documents),
+                },
+            }
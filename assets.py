@@ -0,0 +1,166 @@
+import io
+import os
+import re
+import sys
+import gzip
+import tarfile
+import hashlib
+import argparse
+import mimetypes
+import posixpath
+import urllib.request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; assets are then served gzip-only
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_URL = "/static"
+INDEX_PAGE = "index.html"
+MIN_COMPRESS_BYTES = 1024
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+# Front-end libraries copied into static/vendor by `python assets.py`:
+# local path -> (npm package, version, path inside the package)
+VENDOR_FILES = {
+    "vendor/vue/vue.global.prod.js": ("vue", "3.5.13", "dist/vue.global.prod.js"),
+    "vendor/vuetify/vuetify.min.js": ("vuetify", "3.7.6", "dist/vuetify.min.js"),
+    "vendor/vuetify/vuetify.min.css": ("vuetify", "3.7.6", "dist/vuetify.min.css"),
+    "vendor/mdi/css/materialdesignicons.min.css": ("@mdi/font", "7.4.47", "css/materialdesignicons.min.css"),
+    "vendor/mdi/fonts/materialdesignicons-webfont.woff2": ("@mdi/font", "7.4.47", "fonts/materialdesignicons-webfont.woff2"),
+    "vendor/mdi/fonts/materialdesignicons-webfont.woff": ("@mdi/font", "7.4.47", "fonts/materialdesignicons-webfont.woff"),
+    "vendor/mdi/fonts/materialdesignicons-webfont.ttf": ("@mdi/font", "7.4.47", "fonts/materialdesignicons-webfont.ttf"),
+}
+
+_ASSET_REF = re.compile(r'(src|href)="asset:([^"]+)"')
+_CSS_URL = re.compile(r'url\(\s*["\']?([^"\')?#]+)([^"\')]*)["\']?\s*\)')
+
+mimetypes.add_type("font/woff2", ".woff2")
+mimetypes.add_type("font/woff", ".woff")
+mimetypes.add_type("font/ttf", ".ttf")
+
+
+class Asset:
+    # One static file with its precompressed variants
+    def __init__(self, path: str, body: bytes, hashed: bool = True):
+        self.path = path
+        self.media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if self.media_type.startswith("text/") or self.media_type == "application/javascript":
+            self.media_type += "; charset=utf-8"
+        digest = hashlib.sha256(body).hexdigest()
+        self.etag = f'W/"{digest[:24]}"'
+        root, ext = posixpath.splitext(path)
+        self.url = f"{STATIC_URL}/{root}.{digest[:12]}{ext}" if hashed else f"{STATIC_URL}/{path}"
+        self.variants = {"identity": body}
+        if len(body) >= MIN_COMPRESS_BYTES and self.media_type.startswith(COMPRESSIBLE_TYPES):
+            self.variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.variants["br"] = brotli.compress(body, quality=11)
+
+    def negotiate(self, accept_encoding: str) -> tuple[str, bytes]:
+        accepted = {part.split(";")[0].strip() for part in accept_encoding.lower().split(",")}
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.variants:
+                return encoding, self.variants[encoding]
+        return "identity", self.variants["identity"]
+
+
+class StaticAssets:
+    # Reads static/ once, gives every file a content-hashed URL so it can be
+    # cached forever, and renders index.html with those URLs. Until every
+    # vendored file has been downloaded, the page loads all of them from the
+    # CDN instead, so a fresh clone works wherever there is internet access.
+    def __init__(self, root: str = STATIC_DIR):
+        self.root = root
+        self.by_url = {}
+        self.index = None
+        self.missing_vendor_files = []
+
+    def build(self):
+        files = {}
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                full = os.path.join(directory, name)
+                path = os.path.relpath(full, self.root).replace(os.sep, "/")
+                with open(full, "rb") as f:
+                    files[path] = f.read()
+        page = files.pop(INDEX_PAGE)
+
+        assets = {}
+        # Stylesheets refer to fonts and images by relative URL, so those are
+        # hashed first and the references rewritten to the hashed URLs.
+        for path in sorted(files, key=lambda p: p.endswith(".css")):
+            body = files[path]
+            if path.endswith(".css"):
+                body = self._rewrite_css(path, body, assets)
+            assets[path] = Asset(path, body)
+
+        self.missing_vendor_files = sorted(p for p in VENDOR_FILES if p not in assets)
+
+        def resolve(match):
+            path = match.group(2)
+            if path in VENDOR_FILES and self.missing_vendor_files:
+                # The vendored files are used all or none, so a stylesheet never
+                # refers to fonts that are not there
+                url = cdn_url(path)
+            elif path in assets:
+                url = assets[path].url
+            else:
+                raise FileNotFoundError(f"{INDEX_PAGE} refers to missing asset {path}")
+            return f'{match.group(1)}="{url}"'
+
+        self.index = Asset(INDEX_PAGE, _ASSET_REF.sub(resolve, page.decode()).encode(), hashed=False)
+        self.by_url = {asset.url: asset for asset in assets.values()}
+
+    def _rewrite_css(self, path: str, body: bytes, assets: dict) -> bytes:
+        base = posixpath.dirname(path)
+
+        def resolve(match):
+            target = posixpath.normpath(posixpath.join(base, match.group(1)))
+            if target not in assets:
+                return match.group(0)
+            return f"url({assets[target].url}{match.group(2)})"
+
+        return _CSS_URL.sub(resolve, body.decode()).encode()
+
+
+def cdn_url(path: str) -> str:
+    package, version, file = VENDOR_FILES[path]
+    return f"https://cdn.jsdelivr.net/npm/{package}@{version}/{file}"
+
+
+def download_vendor_files(root: str = STATIC_DIR):
+    packages = {}
+    for path, (package, version, _) in VENDOR_FILES.items():
+        packages.setdefault((package, version), []).append(path)
+    for (package, version), paths in packages.items():
+        name = package.rsplit("/", 1)[-1]
+        url = f"https://registry.npmjs.org/{package}/-/{name}-{version}.tgz"
+        print(f"Downloading {url}")
+        with urllib.request.urlopen(url) as response:
+            archive = tarfile.open(fileobj=io.BytesIO(response.read()), mode="r:gz")
+        for path in paths:
+            member = archive.extractfile(f"package/{VENDOR_FILES[path][2]}")
+            target = os.path.join(root, *path.split("/"))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as f:
+                f.write(member.read())
+            print(f"  {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download the pinned front-end libraries into static/vendor.")
+    parser.add_argument("--check", action="store_true", help="Only list vendored files that are missing; exits 1 if any")
+    args = parser.parse_args()
+    if args.check:
+        missing = [p for p in VENDOR_FILES if not os.path.exists(os.path.join(STATIC_DIR, *p.split("/")))]
+        for path in missing:
+            print(f"missing {path}")
+        return 1 if missing else 0
+    download_vendor_files()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+import sys
+import json
+import time
+import argparse
+import datetime
+import statistics
+
+import orjson
+
+from datagen import generate
+from schema import ALLOWED_TABLES, PREPARED_QUERIES, default_binds
+
+DEFAULT_SCALES = "1000,10000,50000"
+PAGE_SIZE = 50
+
+
+class LocalBackend:
+    name = "local"
+
+    def __init__(self, latency_ms: float = 0.0):
+        from local_db import LocalDatabase
+        self.db = LocalDatabase(latency_ms=latency_ms)
+
+    def load(self, data):
+        self.db.load(data)
+
+    def fetch(self, sql, params=None):
+        return self.db.fetch(sql, params)
+
+
+class OracleBackend:
+    name = "oracle"
+
+    def __init__(self):
+        import main
+        self.main = main
+
+    def load(self, data):
+        with self.main.checkout() as conn:
+            self.main.reset_schema(conn, data)
+
+    def fetch(self, sql, params=None):
+        with self.main.checkout() as conn:
+            return self.main.fetch_result(conn, sql, params)
+
+
+def benchmark_cases():
+    # The SQL each endpoint runs, bypassing the HTTP layer and the result cache
+    for key, sql in PREPARED_QUERIES.items():
+        yield "prepared-query", key, sql, default_binds(key)
+    for table, oracle_table in ALLOWED_TABLES.items():
+        yield "table", table, f"SELECT * FROM {oracle_table} ORDER BY ID", None
+        yield "table-page", table, f"SELECT * FROM {oracle_table} ORDER BY ID FETCH FIRST :limit ROWS ONLY", {"limit": PAGE_SIZE + 1}
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "min": round(ordered[0], 3),
+        "median": round(statistics.median(ordered), 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def run_case(backend, sql, params, repeat: int) -> dict:
+    fetch_ms, serialize_ms = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        columns, rows = backend.fetch(sql, params)
+        fetched = time.perf_counter()
+        body = orjson.dumps([dict(zip(columns, row)) for row in rows], default=str)
+        fetch_ms.append((fetched - start) * 1000)
+        serialize_ms.append((time.perf_counter() - fetched) * 1000)
+    return {"rows": len(rows), "bytes": len(body), "fetch_ms": summarize(fetch_ms), "serialize_ms": summarize(serialize_ms)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every prepared query and table endpoint query at several dataset sizes.")
+    parser.add_argument("--backend", choices=["local", "oracle"], default="local",
+                        help="local runs offline against the SQLite stand-in (default: %(default)s)")
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="Comma-separated applicant counts (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query (default: %(default)s)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated round-trip latency for the local backend")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_results.json", help="Results file (default: %(default)s)")
+    args = parser.parse_args()
+
+    backend = LocalBackend(args.latency_ms) if args.backend == "local" else OracleBackend()
+    report = {
+        "backend": backend.name,
+        "repeat": args.repeat,
+        "started_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "scales": [],
+    }
+    for scale in [int(s) for s in args.scales.split(",") if s.strip()]:
+        data = generate(scale, seed=args.seed)
+        start = time.perf_counter()
+        backend.load(data)
+        load_s = time.perf_counter() - start
+        print(f"scale={scale} loaded in {load_s:.2f}s")
+        cases = []
+        for kind, name, sql, params in benchmark_cases():
+            result = {"kind": kind, "name": name, **run_case(backend, sql, params, args.repeat)}
+            cases.append(result)
+            print(f"  {kind:<15}{name:<24}{result['rows']:>9} rows  "
+                  f"fetch {result['fetch_ms']['median']:>9.2f} ms  serialize {result['serialize_ms']['median']:>8.2f} ms")
+        report["scales"].append({
+            "applicants": scale,
+            "row_counts": {table: len(rows) for table, (_, rows) in data.items()},
+            "load_s": round(load_s, 3),
+            "cases": cases,
+        })
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
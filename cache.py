@@ -0,0 +1,232 @@
+import re
+import logging
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)", re.IGNORECASE)
+_VIEW_DEF = re.compile(r"CREATE\s+OR\s+REPLACE\s+VIEW\s+(\w+)\s+AS\b(.*?)^/", re.IGNORECASE | re.DOTALL | re.MULTILINE)
+
+
+def referenced_names(sql: str) -> set[str]:
+    return {name.upper() for name in _TABLE_REF.findall(sql)}
+
+
+def view_definitions(script: str) -> dict[str, set[str]]:
+    return {name.upper(): referenced_names(body) for name, body in _VIEW_DEF.findall(script)}
+
+
+def base_tables(sql: str, views: dict[str, set[str]], tables) -> frozenset[str]:
+    # Expand views into the tables they read so a write to a base table reaches
+    # every query that depends on it, directly or through a view.
+    found = set()
+    pending = list(referenced_names(sql))
+    seen = set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        if name in views:
+            pending.extend(views[name])
+        elif name in tables:
+            found.add(name)
+    return frozenset(found)
+
+
+class TableVersions:
+    def __init__(self, tables):
+        self._lock = threading.Lock()
+        self._versions = dict.fromkeys(tables, 0)
+        # Identifies this set of counters, which restart from 0 when recreated
+        self.epoch = secrets.token_hex(8)
+
+    def bump(self, tables) -> dict[str, int]:
+        with self._lock:
+            for table in set(tables):
+                self._versions[table] += 1
+            return {table: self._versions[table] for table in tables}
+
+    def snapshot(self, tables) -> tuple:
+        with self._lock:
+            return tuple(self._versions[table] for table in sorted(tables))
+
+    def as_dict(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._versions)
+
+
+class SharedTableVersions:
+    # Same interface as TableVersions, but the counters live in a SQLite file
+    # so every worker process on the host sees the writes made by the others
+    # and drops its own cached results for them.
+    def __init__(self, path: str, tables):
+        self.path = path
+        self.tables = list(tables)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("CREATE TABLE IF NOT EXISTS table_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+        conn.executemany("INSERT OR IGNORE INTO table_versions (name, version) VALUES (?, 0)", [(t,) for t in self.tables])
+        conn.execute("CREATE TABLE IF NOT EXISTS epoch (value TEXT NOT NULL)")
+        conn.execute("INSERT INTO epoch (value) SELECT ? WHERE NOT EXISTS (SELECT 1 FROM epoch)", (secrets.token_hex(8),))
+        self.epoch = conn.execute("SELECT value FROM epoch").fetchone()[0]
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._local.conn = conn
+        return conn
+
+    def bump(self, tables) -> dict[str, int]:
+        tables = sorted(set(tables))
+        placeholders = ", ".join("?" for _ in tables)
+        rows = self._conn().execute(
+            f"UPDATE table_versions SET version = version + 1 WHERE name IN ({placeholders}) RETURNING name, version",
+            tables,
+        ).fetchall()
+        return dict(rows)
+
+    def snapshot(self, tables) -> tuple:
+        versions = self.as_dict()
+        return tuple(versions[table] for table in sorted(tables))
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(self._conn().execute("SELECT name, version FROM table_versions").fetchall())
+
+
+class QueryCache:
+    # LRU cache of query results. Each entry remembers the versions of the
+    # tables it was computed from; an entry whose versions no longer match is
+    # treated as a miss, so a result computed while a write was in flight is
+    # never served after that write.
+    def __init__(self, maxsize: int, versions: TableVersions):
+        self.maxsize = maxsize
+        self.versions = versions
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, tables):
+        current = self.versions.snapshot(tables)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == current:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            if entry is not None:
+                del self._entries[key]
+                self.invalidations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, tables, snapshot, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (frozenset(tables), snapshot, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, tables):
+        tables = set(tables)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[0] & tables]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+REFRESH_INTERVAL_S = 5
+
+
+class VersionedCopy:
+    # Base for the in-process copies of the tables (the analytic replica and
+    # the aggregate store). They are loaded from a snapshot and then kept
+    # current by the API's own write paths. A copy records the shared table
+    # version it reflects for each table; when another worker process writes a
+    # table the versions no longer match, and reads of that table go to Oracle
+    # until the copy has refreshed itself.
+    name = "copy"
+
+    def __init__(self, versions):
+        self.versions = versions
+        self.ready = False
+        self._applied = {}
+        self._lock = threading.RLock()
+        self._refreshing = False
+        self._last_refresh = 0.0
+        self.snapshots = 0
+
+    def snapshot(self, conn):
+        raise NotImplementedError
+
+    def _loaded(self, versions):
+        with self._lock:
+            self._applied = dict(versions or {})
+            self.snapshots += 1
+        self.ready = True
+
+    def refresh_in_background(self, checkout):
+        with self._lock:
+            if self._refreshing or time.monotonic() - self._last_refresh < REFRESH_INTERVAL_S:
+                return
+            self._refreshing = True
+            self._last_refresh = time.monotonic()
+
+        def refresh():
+            try:
+                with checkout() as conn:
+                    self.snapshot(conn)
+            except Exception:
+                logger.exception("%s refresh failed", self.name)
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def is_current(self, tables) -> bool:
+        if not self.ready:
+            return False
+        current = self.versions.snapshot(tables)
+        with self._lock:
+            return current == tuple(self._applied.get(table) for table in sorted(tables))
+
+    def advance(self, bumped: dict[str, int]):
+        # Called with the new versions after a write this process applied to
+        # the copy; a gap means another process wrote in between.
+        with self._lock:
+            for table, version in bumped.items():
+                if self._applied.get(table) == version - 1:
+                    self._applied[table] = version
+                else:
+                    self._applied.pop(table, None)
+
+    def current_tables(self) -> list[str]:
+        with self._lock:
+            return sorted(self._applied)
@@ -0,0 +1,78 @@
+import re
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+# Media types worth gzipping. Arrow IPC streams and Parquet (already
+# zstd-compressed) are binary and pass through, as do server-sent events,
+# which must reach the client as each event is sent.
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+def compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(EXCLUDED_TYPES)
+
+
+class CompressionMiddleware:
+    # Gzips JSON and text responses for clients that accept it, whole bodies
+    # of at least minimum_size bytes and streamed bodies as they are sent.
+    # Responses that already have a Content-Encoding, such as the
+    # precompressed static assets, and paths matching exclude are left alone.
+    def __init__(self, app, minimum_size: int = 500, compresslevel: int = 6, exclude: re.Pattern | None = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.exclude = exclude
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or "gzip" not in Headers(scope=scope).get("accept-encoding", "")
+                or (self.exclude is not None and self.exclude.match(scope["path"]))):
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                passthrough = "content-encoding" in headers or not compressible(headers.get("content-type", ""))
+                if passthrough:
+                    await send(message)
+                else:
+                    # Held back until the first body shows whether it is worth compressing
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = "gzip"
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = compressor.compress(body) + compressor.flush()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start)
+            data = compressor.compress(body)
+            if not more_body:
+                data += compressor.flush()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,140 @@
+import sys
+import random
+import argparse
+import datetime
+
+FIRST_NAMES = ["John", "Jane", "Alice", "Bob", "Carlos", "Dana", "Emily", "Farah", "George", "Hana",
+               "Ivan", "Julia", "Kenji", "Laura", "Mohammed", "Nina", "Omar", "Priya", "Quinn", "Rosa"]
+LAST_NAMES = ["Doe", "Smith", "Johnson", "Brown", "Garcia", "Lee", "Martin", "Nguyen", "Patel", "Rossi",
+              "Silva", "Tanaka", "Wilson", "Young", "Zhang", "Khan", "Murphy", "Novak", "Okafor", "Dubois"]
+CITIES = [("Toronto", "ON", "Canada"), ("Vancouver", "BC", "Canada"), ("Montreal", "QC", "Canada"),
+          ("London", "England", "UK"), ("Boston", "MA", "USA"), ("Sydney", "NSW", "Australia"),
+          ("Dublin", None, "Ireland"), ("Singapore", None, "Singapore")]
+SCHOOL_WORDS = ["Central", "Riverside", "Oakwood", "Maple", "Lakeview", "Hillcrest", "Northgate", "St. Mary's"]
+SCHOOL_KINDS = ["Secondary", "Academy", "School", "Collegiate", "High School"]
+# The first two names are the ones prepared query #14 compares
+PROGRAM_NAMES = ["Computer Science", "Business Admin", "Engineering", "Nursing", "Economics", "Psychology",
+                 "Biology", "Mathematics", "Architecture", "Law", "History", "Physics"]
+
+ACCREDITATION_STATUSES = ["Accredited"] * 8 + ["Provisional"] * 2 + ["Unaccredited"]
+DOCUMENT_TYPES = ["Transcript", "Essay", "Recommendation", "Certificate", "English Test"]
+OUTCOMES = ["Accepted", "Rejected", "Pending", "Waitlisted"]
+
+
+def generate(applicants: int, institutions: int | None = None, programs: int | None = None,
+             applications_per_applicant: float = 1.5, documents_per_application: float = 2.0,
+             seed: int = 0, today: datetime.date | None = None) -> dict:
+    # Returns rows in the layout of schema.SEED_DATA, satisfying every CHECK
+    # in RESET_SCRIPT: enumerated values, GPA ranges, no future birth or
+    # submission dates, unique emails, ck_application_decision_logic and
+    # chk_transcript_institution.
+    rng = random.Random(seed)
+    today = today or datetime.date.today()
+    institutions = institutions or max(3, applicants // 50)
+    programs = programs or max(3, applicants // 200)
+
+    institution_rows = []
+    for i in range(1, institutions + 1):
+        city, province, country = rng.choice(CITIES)
+        name = f"{rng.choice(SCHOOL_WORDS)} {rng.choice(SCHOOL_KINDS)} {i}"
+        institution_rows.append((i, name, city, province, country, rng.choice(ACCREDITATION_STATUSES)))
+
+    program_rows = []
+    for i in range(1, programs + 1):
+        base = PROGRAM_NAMES[(i - 1) % len(PROGRAM_NAMES)]
+        name = base if i <= len(PROGRAM_NAMES) else f"{base} {(i - 1) // len(PROGRAM_NAMES) + 1}"
+        program_rows.append((i, name, round(rng.uniform(2.5, 3.9), 2), rng.randint(1, 6),
+                             "Open" if rng.random() < 0.7 else "Closed"))
+
+    applicant_rows = []
+    applicant_institution = {}
+    for i in range(1, applicants + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        birth = today - datetime.timedelta(days=rng.randint(16 * 365, 25 * 365))
+        institution_id = rng.randint(1, institutions)
+        applicant_institution[i] = institution_id
+        email = f"{first}.{last}.{i}@example.com".lower()
+        applicant_rows.append((i, first, last, birth, email, institution_id, round(rng.uniform(2.0, 4.0), 2)))
+
+    application_rows = []
+    document_rows = []
+    max_applications = min(programs, max(1, round(applications_per_applicant * 2)))
+    for applicant_id in range(1, applicants + 1):
+        count = rng.randint(0, max_applications)
+        for program_id in rng.sample(range(1, programs + 1), count):
+            application_id = len(application_rows) + 1
+            submitted = today - datetime.timedelta(days=rng.randint(0, 730))
+            outcome = rng.choice(OUTCOMES)
+            if outcome == "Pending":
+                status, decided = rng.choice(["Submitted", "Under Review"]), None
+            else:
+                status = "Completed"
+                decided = min(today, submitted + datetime.timedelta(days=rng.randint(0, 120)))
+            application_rows.append((application_id, applicant_id, program_id, submitted, status, decided,
+                                     outcome, f"Generated application {application_id}"))
+
+            for n in range(rng.randint(0, max(1, round(documents_per_application * 2)))):
+                document_type = rng.choice(DOCUMENT_TYPES)
+                if document_type == "Transcript":
+                    institution_id = applicant_institution[applicant_id]
+                else:
+                    institution_id = None
+                file_name = f"{document_type.lower().replace(' ', '_')}_{application_id}_{n + 1}.pdf"
+                document_rows.append((len(document_rows) + 1, application_id, institution_id, document_type, file_name,
+                                      None, None))
+
+    return {
+        'INSTITUTION': (
+            ('ID', 'Name', 'City', 'State_Province', 'Country', 'Accreditation_Status'),
+            institution_rows,
+        ),
+        'PROGRAM': (
+            ('ID', 'Name', 'Minimum_GPA', 'Duration_Years', 'Enrollment_Status'),
+            program_rows,
+        ),
+        'APPLICANT': (
+            ('ID', 'First_Name', 'Last_Name', 'Date_of_Birth', 'Email', 'Institution_ID', 'GPA'),
+            applicant_rows,
+        ),
+        'APPLICATION': (
+            ('ID', 'Applicant_ID', 'Program_ID', 'Submission_Date', 'Status', 'Decision_Date', 'Outcome', 'Outcome_Notes'),
+            application_rows,
+        ),
+        'APPLICATION_DOCUMENT': (
+            ('ID', 'Application_ID', 'Institution_ID', 'Document_Type', 'Document_File', 'Document_SHA256', 'Document_Size'),
+            document_rows,
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset that satisfies the schema's constraints.")
+    parser.add_argument("applicants", type=int, help="Number of applicants")
+    parser.add_argument("--institutions", type=int, help="Number of institutions (default: applicants / 50, at least 3)")
+    parser.add_argument("--programs", type=int, help="Number of programs (default: applicants / 200, at least 3)")
+    parser.add_argument("--applications-per-applicant", type=float, default=1.5)
+    parser.add_argument("--documents-per-application", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: %(default)s)")
+    parser.add_argument("--load", action="store_true", help="Reset the Oracle database and load the data into it")
+    parser.add_argument("--sqlite", metavar="PATH", help="Write the data to a SQLite stand-in database file")
+    args = parser.parse_args()
+
+    data = generate(args.applicants, args.institutions, args.programs,
+                    args.applications_per_applicant, args.documents_per_application, args.seed)
+    for oracle_table, (_, rows) in data.items():
+        print(f"{oracle_table:<22}{len(rows):>10}")
+
+    if args.sqlite:
+        from local_db import LocalDatabase
+        LocalDatabase(args.sqlite).load(data)
+        print(f"Wrote {args.sqlite}")
+    if args.load:
+        from main import checkout, reset_schema
+        with checkout() as conn:
+            reset_schema(conn, data)
+        print("Loaded into Oracle")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import os
+import time
+import asyncio
+import hashlib
+import tempfile
+import threading
+
+# Files not referenced by any row are kept at least this long, so a sweep
+# cannot remove one whose upload has not been recorded on its row yet
+SWEEP_GRACE_S = 3600
+
+TEMP_DIR = "tmp"
+
+
+class DocumentTooLarge(Exception):
+    pass
+
+
+class DocumentStore:
+    # Uploaded document files on local disk, named by the SHA-256 of their
+    # content (root/ab/cdef...), so identical files are stored once. An upload
+    # is written to root/tmp while it is hashed and renamed into place when
+    # complete; memory use does not depend on the file size.
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.uploads = 0
+        self.deduplicated = 0
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def _open_temp(self):
+        os.makedirs(os.path.join(self.root, TEMP_DIR), exist_ok=True)
+        return tempfile.NamedTemporaryFile(dir=os.path.join(self.root, TEMP_DIR), delete=False)
+
+    @staticmethod
+    def _write(f, digest, chunk: bytes):
+        # Both release the GIL for chunks of this size
+        digest.update(chunk)
+        f.write(chunk)
+
+    def _store(self, f, digest: str, size: int):
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+        path = self.path(digest)
+        if os.path.exists(path):
+            # Touched so the grace period of the next sweep starts again
+            os.unlink(f.name)
+            os.utime(path)
+            with self._lock:
+                self.deduplicated += 1
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(f.name, path)
+            with self._lock:
+                self.bytes_written += size
+        with self._lock:
+            self.uploads += 1
+
+    @staticmethod
+    def _discard(f):
+        f.close()
+        os.unlink(f.name)
+
+    async def save(self, chunks) -> tuple[str, int]:
+        # Stores the bytes of an async iterator, such as Request.stream(), and
+        # returns their hex digest and size
+        f = await asyncio.to_thread(self._open_temp)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise DocumentTooLarge(f"Files are limited to {self.max_bytes} bytes")
+                if chunk:
+                    await asyncio.to_thread(self._write, f, digest, chunk)
+            await asyncio.to_thread(self._store, f, digest.hexdigest(), size)
+        except BaseException:
+            # Also on client disconnects and cancellation
+            if not f.closed:
+                self._discard(f)
+            raise
+        return digest.hexdigest(), size
+
+    def sweep(self, referenced: set[str]) -> dict:
+        # Removes the files no row refers to any more, and abandoned uploads
+        removed = removed_bytes = kept = 0
+        cutoff = time.time() - SWEEP_GRACE_S
+        for dirpath, _, filenames in os.walk(self.root):
+            in_temp = os.path.basename(dirpath) == TEMP_DIR
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                digest = os.path.basename(dirpath) + filename
+                try:
+                    stat = os.stat(path)
+                    if (in_temp or digest not in referenced) and stat.st_mtime < cutoff:
+                        os.unlink(path)
+                        removed += 1
+                        removed_bytes += stat.st_size
+                    else:
+                        kept += 1
+                except FileNotFoundError:
+                    pass
+        return {"removed": removed, "removed_bytes": removed_bytes, "kept": kept}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "path": os.path.abspath(self.root),
+                "max_bytes": self.max_bytes,
+                "uploads": self.uploads,
+                "deduplicated": self.deduplicated,
+                "bytes_written": self.bytes_written,
+            }
+
@@ -0,0 +1,94 @@
+import sys
+import json
+import argparse
+
+from main import PREPARED_QUERIES, checkout
+from schema import default_binds
+
+BASELINE_FILE = "query_plans.json"
+
+
+def capture_plan(conn, key: str, sql: str) -> dict:
+    statement_id = f"pq_{key}"
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM plan_table WHERE statement_id = :id", {"id": statement_id})
+        cur.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {sql}", default_binds(key))
+        cur.execute(
+            """
+            SELECT id, operation, options, object_name, cost, cardinality
+            FROM plan_table
+            WHERE statement_id = :id
+            ORDER BY id
+            """,
+            {"id": statement_id},
+        )
+        steps = cur.fetchall()
+        cur.execute(
+            "SELECT plan_table_output FROM TABLE(DBMS_XPLAN.DISPLAY('PLAN_TABLE', :id, 'TYPICAL'))",
+            {"id": statement_id},
+        )
+        text = [row[0] for row in cur]
+    conn.rollback()
+    operations = [" ".join(part for part in (operation, options, object_name) if part)
+                  for _, operation, options, object_name, _, _ in steps]
+    return {
+        "cost": steps[0][4] if steps else None,
+        "cardinality": steps[0][5] if steps else None,
+        "operations": operations,
+        "full_scans": sorted({op.split()[-1] for op in operations if op.startswith("TABLE ACCESS FULL")}),
+        "plan": text,
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    problems = []
+    if baseline.get("cost") is not None and current["cost"] is not None:
+        if current["cost"] > baseline["cost"] * (1 + tolerance):
+            problems.append(f"cost {baseline['cost']} -> {current['cost']}")
+    new_scans = sorted(set(current["full_scans"]) - set(baseline.get("full_scans", [])))
+    if new_scans:
+        problems.append(f"new full scans of {', '.join(new_scans)}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture EXPLAIN PLAN output for every prepared query and compare it against a stored baseline.")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline file (default: %(default)s)")
+    parser.add_argument("--update", action="store_true", help="Write the captured plans as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative cost increase before flagging a regression (default: %(default)s)")
+    parser.add_argument("--show", action="store_true", help="Print the full plan of every query")
+    args = parser.parse_args()
+
+    with checkout() as conn:
+        plans = {key: capture_plan(conn, key, sql) for key, sql in PREPARED_QUERIES.items()}
+
+    if args.update:
+        with open(args.baseline, "w") as f:
+            json.dump(plans, f, indent=2)
+        print(f"Wrote {len(plans)} plans to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+
+    regressions = 0
+    for key, plan in plans.items():
+        if key not in baseline:
+            status = "NEW"
+        else:
+            problems = compare(baseline[key], plan, args.tolerance)
+            status = "REGRESSED: " + "; ".join(problems) if problems else "ok"
+            regressions += bool(problems)
+        print(f"#{key:>3}  cost={plan['cost']!s:>8}  rows={plan['cardinality']!s:>8}  {status}")
+        if args.show:
+            print("\n".join(plan["plan"]))
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --update to create one")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
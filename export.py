@@ -0,0 +1,105 @@
+import decimal
+
+import oracledb
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pyarrow is optional; format=arrow and format=parquet then answer 501
+    pyarrow = None
+
+ARROW_FORMATS = ("arrow", "parquet")
+ARROW_MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+ARROW_EXTENSIONS = {"arrow": "arrows", "parquet": "parquet"}
+
+# Fetched batches are collected into Parquet row groups of at least this many rows
+PARQUET_ROW_GROUP_ROWS = 100_000
+
+
+def arrow_type_handler(cursor, metadata):
+    # Used instead of the JSON output type handler for data frame fetches.
+    # Scaled NUMBERs such as the NUMBER(3,2) GPAs become exact decimal128
+    # columns rather than doubles; DATEs are left to the driver, which fetches
+    # them as Arrow timestamps.
+    if metadata.type_code is oracledb.DB_TYPE_NUMBER and metadata.scale is not None and metadata.scale > 0:
+        return cursor.var(decimal.Decimal, arraysize=cursor.arraysize)
+
+
+class _ChunkSink:
+    # Write-only file that hands back what was written since the last take().
+    # It keeps counting the position so Parquet's footer offsets stay right.
+    closed = False
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ArrowWriter:
+    # Encodes python-oracledb data frames as an Arrow IPC stream or a Parquet
+    # file, one chunk of bytes at a time
+    def __init__(self, fmt: str, schema):
+        self.fmt = fmt
+        self._sink = _ChunkSink()
+        self._file = pyarrow.PythonFile(self._sink, mode="w")
+        self._pending = []
+        self._pending_rows = 0
+        if fmt == "parquet":
+            self._writer = pyarrow.parquet.ParquetWriter(self._file, schema, compression="zstd")
+        else:
+            self._writer = pyarrow.ipc.new_stream(self._file, schema)
+
+    def write(self, table) -> bytes:
+        if self.fmt != "parquet":
+            self._writer.write_table(table)
+            return self._sink.take()
+        self._pending.append(table)
+        self._pending_rows += table.num_rows
+        if self._pending_rows >= PARQUET_ROW_GROUP_ROWS:
+            self._flush_row_group()
+        return self._sink.take()
+
+    def _flush_row_group(self):
+        if self._pending_rows:
+            self._writer.write_table(pyarrow.concat_tables(self._pending), row_group_size=self._pending_rows)
+            self._pending.clear()
+            self._pending_rows = 0
+
+    def close(self) -> bytes:
+        self._flush_row_group()
+        self._writer.close()
+        return self._sink.take()
+
+
+def to_arrow_table(df):
+    # python-oracledb data frames expose the Arrow C stream interface
+    return pyarrow.table(df)
@@ -0,0 +1,114 @@
+import asyncio
+import sqlite3
+import threading
+from collections import deque
+
+import orjson
+
+QUEUE_SIZE = 1000
+RECENT_EVENTS = 1000
+POLL_INTERVAL_S = 0.2
+LOG_RETENTION = 10000
+
+# Sent in place of the queued events when a subscriber falls too far behind
+INVALIDATE_ALL = {"table": None, "op": "invalidate", "row": None}
+
+
+class ChangeFeed:
+    # Fans out {table, op, row} change events to the SSE subscribers of this
+    # process. With a shared path the events go through a log table in the
+    # shared SQLite state file, which every worker process polls, so a write in
+    # one worker reaches the browsers connected to the others.
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._loop = None
+        self._subscribers = set()
+        self._recent = deque(maxlen=RECENT_EVENTS)
+        self._seq = 0
+        self.published = 0
+        self.dropped = 0
+        if path is not None:
+            conn = self._conn()
+            conn.execute("CREATE TABLE IF NOT EXISTS changes (seq INTEGER PRIMARY KEY AUTOINCREMENT, event BLOB NOT NULL)")
+            self._seq = conn.execute("SELECT IFNULL(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._local.conn = conn
+        return conn
+
+    async def run(self):
+        # Started by the app lifespan; polls the shared log when there is one
+        self._loop = asyncio.get_running_loop()
+        if self.path is None:
+            return
+        while True:
+            await asyncio.sleep(POLL_INTERVAL_S)
+            if not self._subscribers:
+                self._seq = self._conn().execute("SELECT IFNULL(MAX(seq), 0) FROM changes").fetchone()[0]
+                continue
+            rows = self._conn().execute("SELECT seq, event FROM changes WHERE seq > ? ORDER BY seq", (self._seq,)).fetchall()
+            for seq, event in rows:
+                self._deliver(seq, orjson.loads(event))
+
+    def publish(self, table: str | None, op: str, row: dict | None = None):
+        # Safe to call from the threadpool that runs the sync endpoints
+        event = {"table": table, "op": op, "row": row}
+        with self._lock:
+            self.published += 1
+        if self.path is not None:
+            conn = self._conn()
+            seq = conn.execute("INSERT INTO changes (event) VALUES (?)", (orjson.dumps(event, default=str),)).lastrowid
+            if seq % 1000 == 0:
+                conn.execute("DELETE FROM changes WHERE seq <= ?", (seq - LOG_RETENTION,))
+            return
+        if self._loop is None:
+            return
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        self._loop.call_soon_threadsafe(self._deliver, seq, event)
+
+    def _deliver(self, seq: int, event: dict):
+        self._seq = max(self._seq, seq)
+        self._recent.append((seq, event))
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait((seq, event))
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait((seq, INVALIDATE_ALL))
+                self.dropped += 1
+
+    def subscribe(self, last_event_id: int | None = None) -> asyncio.Queue:
+        # A reconnecting client gets the events it missed if they are still
+        # in the recent history, and a single invalidate-all otherwise (also
+        # when the id is from before a restart of an unshared feed).
+        queue = asyncio.Queue(QUEUE_SIZE)
+        if last_event_id is not None and last_event_id != self._seq:
+            missed = [(seq, event) for seq, event in self._recent if seq > last_event_id]
+            if missed and missed[0][0] == last_event_id + 1 and len(missed) < QUEUE_SIZE:
+                for item in missed:
+                    queue.put_nowait(item)
+            else:
+                queue.put_nowait((self._seq, INVALIDATE_ALL))
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def stats(self) -> dict:
+        return {
+            "shared": self.path is not None,
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+            "last_seq": self._seq,
+        }
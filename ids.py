@@ -0,0 +1,52 @@
+import threading
+from collections import deque
+
+
+def fetch_sequence_values(conn, sequence: str, count: int) -> list[int]:
+    with conn.cursor() as cur:
+        cur.arraysize = max(count, 1)
+        cur.execute(f"SELECT {sequence}.NEXTVAL FROM dual CONNECT BY LEVEL <= :n", {"n": count})
+        return [row[0] for row in cur.fetchall()]
+
+
+class IdAllocator:
+    # Hi/lo style allocator: ids are reserved from the table's sequence in blocks
+    # of block_size with a single round trip and handed out locally until the
+    # block runs out. Reserved but unused ids are simply skipped, like any
+    # sequence gap.
+    def __init__(self, block_size: int):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._reserved = {}
+        self._generation = None
+        self.blocks_fetched = 0
+
+    def allocate(self, conn, sequence: str, count: int = 1, generation=None) -> list[int]:
+        # generation changes whenever the sequences are recreated, possibly by
+        # another worker process; blocks reserved before that are discarded.
+        with self._lock:
+            if generation != self._generation:
+                self._reserved.clear()
+                self._generation = generation
+            reserved = self._reserved.setdefault(sequence, deque())
+            ids = [reserved.popleft() for _ in range(min(count, len(reserved)))]
+        missing = count - len(ids)
+        if missing <= 0:
+            return ids
+        fetched = fetch_sequence_values(conn, sequence, max(missing, self.block_size))
+        with self._lock:
+            self.blocks_fetched += 1
+            self._reserved.setdefault(sequence, deque()).extend(fetched[missing:])
+        return ids + fetched[:missing]
+
+    def reset(self):
+        with self._lock:
+            self._reserved.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "block_size": self.block_size,
+                "blocks_fetched": self.blocks_fetched,
+                "reserved": {sequence: len(ids) for sequence, ids in self._reserved.items()},
+            }
@@ -0,0 +1,252 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import datetime
+import threading
+from collections import Counter
+
+import httpx
+
+from datagen import generate
+from schema import ALLOWED_TABLES, PREPARED_QUERIES
+
+DEFAULT_MIX = "table=50,query=30,insert=10,delete=10"
+PAGE_SIZE = 50
+PERCENTILES = (50, 95, 99)
+
+# Reported route for each kind of request, in the form /metrics uses
+ROUTES = {
+    "table": "GET /api/tables/{table}",
+    "query": "GET /api/prepared-queries/{query_key}",
+    "insert": "POST /api/tables/{table}",
+    "delete": "DELETE /api/tables/{table}/{row_id}",
+}
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in ROUTES:
+            raise argparse.ArgumentTypeError(f"unknown request kind {kind!r}; use {', '.join(ROUTES)}")
+        try:
+            mix[kind] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"weight of {kind} must be a number")
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("the mix needs at least one positive weight")
+    return mix
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    # Nearest rank
+    return ordered[max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))]
+
+
+def summarize(samples: list[float], errors: int, elapsed_s: float) -> dict:
+    ordered = sorted(samples)
+    summary = {"requests": len(ordered), "errors": errors, "throughput_rps": round(len(ordered) / elapsed_s, 2)}
+    if ordered:
+        for p in PERCENTILES:
+            summary[f"p{p}_ms"] = round(percentile(ordered, p), 2)
+        summary["max_ms"] = round(ordered[-1], 2)
+    return summary
+
+
+class Workload:
+    # Builds the requests of the mix. Inserts add institutions nothing refers
+    # to, and deletes remove only rows this run inserted, so the dataset
+    # stays the same size and deletes never hit a foreign key.
+    def __init__(self, mix: dict[str, float], seed: int = 0):
+        self.rng = random.Random(seed)
+        self.kinds = list(mix)
+        self.weights = list(mix.values())
+        self.inserted = []
+        self.sequence = 0
+
+    def next_request(self) -> tuple[str, str, str, dict | None]:
+        kind = self.rng.choices(self.kinds, self.weights)[0]
+        if kind == "delete" and not self.inserted:
+            kind = "insert"
+        if kind == "table":
+            table = self.rng.choice(list(ALLOWED_TABLES))
+            return kind, "GET", f"/api/tables/{table}?limit={PAGE_SIZE}&include_total=true", None
+        if kind == "query":
+            return kind, "GET", f"/api/prepared-queries/{self.rng.choice(list(PREPARED_QUERIES))}", None
+        if kind == "insert":
+            self.sequence += 1
+            row = {
+                "name": f"Load Test {self.sequence}",
+                "city": "Toronto",
+                "state_province": "ON",
+                "country": "Canada",
+                "accreditation_status": "Accredited",
+            }
+            return kind, "POST", "/api/tables/institutions", row
+        row_id = self.inserted.pop(self.rng.randrange(len(self.inserted)))
+        return kind, "DELETE", f"/api/tables/institutions/{row_id}", None
+
+
+async def run_load(base_url: str, workload: Workload, rate: float, duration_s: float, warmup_s: float,
+                   concurrency: int) -> dict:
+    # Open loop: requests start on a fixed schedule whether or not earlier
+    # ones have finished, and latency is measured from the scheduled start, so
+    # a slow server shows up as latency instead of a lower request rate.
+    samples = {kind: [] for kind in ROUTES}
+    errors = Counter()
+    statuses = Counter()
+    dropped = 0
+    in_flight = set()
+    start = time.perf_counter()
+    measure_from = start + warmup_s
+
+    async def send(client, scheduled: float):
+        kind, method, url, body = workload.next_request()
+        try:
+            response = await client.request(method, url, json=body)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            response, status = None, type(e).__name__
+        latency_ms = (time.perf_counter() - scheduled) * 1000
+        if kind == "insert" and response is not None and response.is_success:
+            workload.inserted.append(response.json()["id"])
+        if scheduled < measure_from:
+            return
+        samples[kind].append(latency_ms)
+        statuses[str(status)] += 1
+        if response is None or response.status_code >= 400:
+            errors[kind] += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        total = int(rate * (warmup_s + duration_s))
+        for i in range(total):
+            scheduled = start + i / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= concurrency:
+                if scheduled >= measure_from:
+                    dropped += 1
+                continue
+            task = asyncio.create_task(send(client, scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+    elapsed_s = time.perf_counter() - measure_from
+
+    all_samples = [ms for kind_samples in samples.values() for ms in kind_samples]
+    return {
+        "target_rps": rate,
+        "duration_s": round(elapsed_s, 2),
+        "dropped": dropped,
+        "statuses": dict(statuses),
+        "total": summarize(all_samples, sum(errors.values()), elapsed_s),
+        "routes": {
+            ROUTES[kind]: summarize(kind_samples, errors[kind], elapsed_s)
+            for kind, kind_samples in samples.items() if kind_samples
+        },
+    }
+
+
+def start_local_server(latency_ms: float, scale: int, seed: int):
+    # Runs the app in this process on the embedded SQLite stand-in, loaded
+    # with a generated dataset through the normal reset path
+    os.environ.update(DB_BACKEND="local", LOCAL_LATENCY_MS=str(latency_ms), SHARED_STATE_PATH=":memory:",
+                      SERVE_FRONT_END="0")
+    import uvicorn
+    import main
+
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=0, log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("The app failed to start")
+        time.sleep(0.05)
+    with main.checkout() as conn:
+        main.reset_schema(conn, generate(scale, seed=seed))
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+def regressions(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    found = []
+    if report["total"]["throughput_rps"] < baseline["total"]["throughput_rps"] * (1 - tolerance):
+        found.append(f"throughput {report['total']['throughput_rps']} rps, baseline {baseline['total']['throughput_rps']} rps")
+    for route, summary in report["routes"].items():
+        before = baseline["routes"].get(route)
+        if before and "p99_ms" in summary and summary["p99_ms"] > before["p99_ms"] * (1 + tolerance):
+            found.append(f"{route} p99 {summary['p99_ms']} ms, baseline {before['p99_ms']} ms")
+    return found
+
+
+def print_report(report: dict):
+    print(f"{'route':<42}{'requests':>9}{'errors':>8}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for route, s in [*report["routes"].items(), ("total", report["total"])]:
+        print(f"{route:<42}{s['requests']:>9}{s['errors']:>8}{s['throughput_rps']:>9.1f}"
+              f"{s.get('p50_ms', 0):>9.1f}{s.get('p95_ms', 0):>9.1f}{s.get('p99_ms', 0):>9.1f}")
+    if report["dropped"]:
+        print(f"{report['dropped']} requests not sent: {report['concurrency']} already in flight")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a mix of API requests at a fixed rate and report latency percentiles per route.")
+    parser.add_argument("--url", help="Base URL of a running app; by default the app is started in this process on the SQLite stand-in")
+    parser.add_argument("--rate", type=float, default=50, help="Requests per second (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds (default: %(default)s)")
+    parser.add_argument("--warmup", type=float, default=3, help="Seconds of traffic before measuring (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=64, help="Most requests in flight at once (default: %(default)s)")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="Relative weights of table, query, insert and delete requests (default: %(default)s)")
+    parser.add_argument("--scale", type=int, default=1000, help="Applicants in the generated dataset for the stand-in (default: %(default)s)")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Simulated round-trip latency per statement for the stand-in (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", help="Earlier results file; exits 1 if throughput or a route's p99 is worse by more than --tolerance")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression against --baseline, as a fraction (default: %(default)s)")
+    parser.add_argument("--out", default="loadtest_results.json", help="Results file (default: %(default)s)")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server, thread, base_url = start_local_server(args.latency_ms, args.scale, args.seed)
+        print(f"App started at {base_url} on the SQLite stand-in: {args.scale} applicants, {args.latency_ms} ms per statement")
+    try:
+        workload = Workload(args.mix, args.seed)
+        report = asyncio.run(run_load(base_url, workload, args.rate, args.duration, args.warmup, args.concurrency))
+    finally:
+        if server is not None:
+            server.should_exit = True
+            thread.join(timeout=10)
+
+    report = {
+        "started_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "target": args.url or "local",
+        "scale": None if args.url else args.scale,
+        "latency_ms": None if args.url else args.latency_ms,
+        "mix": args.mix,
+        "concurrency": args.concurrency,
+        **report,
+    }
+    print_report(report)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(report, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import re
+import math
+import time
+import sqlite3
+import decimal
+import datetime
+import threading
+
+from schema import RESET_SCRIPT, script_statements
+
+# Rewrites that let the Oracle SQL in schema.py run on SQLite. They cover the
+# constructs this application uses, not Oracle SQL in general.
+_QUERY_REWRITES = [
+    # SQLite does not accept parenthesised members in a compound SELECT
+    (re.compile(r"^\s*\((SELECT .*?)\)\s*MINUS\s*\((SELECT .*?)\)", re.IGNORECASE | re.DOTALL), r"\1\nEXCEPT\n\2"),
+    (re.compile(r"\bMINUS\b", re.IGNORECASE), "EXCEPT"),
+    (re.compile(r"\bNVL\(", re.IGNORECASE), "IFNULL("),
+    # Oracle division is never integer division
+    (re.compile(r"/\s*NULLIF\(", re.IGNORECASE), "* 1.0 / NULLIF("),
+    (re.compile(r"FETCH\s+FIRST\s+(:\w+)\s+ROWS\s+ONLY", re.IGNORECASE), r"LIMIT \1"),
+    # Positional binds :1, :2 ... become ?1, ?2 ...
+    (re.compile(r":(\d+)\b"), r"?\1"),
+]
+
+_DDL_REWRITES = [
+    (re.compile(r"CREATE\s+OR\s+REPLACE\s+VIEW", re.IGNORECASE), "CREATE VIEW"),
+    (re.compile(r"DEFAULT\s+SYSDATE", re.IGNORECASE), "DEFAULT CURRENT_TIMESTAMP"),
+    # Keep NUMBER(3,2) values such as 3.0 as floats instead of integer affinity
+    (re.compile(r"NUMBER\(\d+,\s*[1-9]\d*\)", re.IGNORECASE), "REAL"),
+]
+
+# PL/SQL blocks, stored functions and sequences have no SQLite equivalent
+_SKIPPED_DDL = re.compile(r"^(BEGIN|DECLARE|CREATE\s+OR\s+REPLACE\s+FUNCTION|CREATE\s+SEQUENCE)\b", re.IGNORECASE)
+
+
+def translate_sql(sql: str) -> str:
+    for pattern, replacement in _QUERY_REWRITES:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+
+def translate_ddl(stmt: str) -> str | None:
+    if _SKIPPED_DDL.match(stmt):
+        return None
+    for pattern, replacement in _DDL_REWRITES:
+        stmt = pattern.sub(replacement, stmt)
+    return translate_sql(stmt)
+
+
+def _is_date_not_future(value):
+    if value is None:
+        return None
+    return "N" if str(value)[:10] > datetime.date.today().isoformat() else "Y"
+
+
+def _adapt_date(value: datetime.date) -> str:
+    # Stored in the same ISO format the Oracle backend returns
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return datetime.datetime(value.year, value.month, value.day).isoformat()
+
+
+sqlite3.register_adapter(datetime.date, _adapt_date)
+sqlite3.register_adapter(datetime.datetime, _adapt_date)
+sqlite3.register_adapter(decimal.Decimal, float)
+
+
+class _StdDev:
+    # Oracle's STDDEV: sample standard deviation, 0 for a single row
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def step(self, value):
+        if value is None:
+            return
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    def finalize(self):
+        if self.n == 0:
+            return None
+        if self.n == 1:
+            return 0.0
+        return math.sqrt(self.m2 / (self.n - 1))
+
+
+class LocalDatabase:
+    # SQLite stand-in for the Oracle schema, used for offline benchmarks and
+    # tests. latency_ms adds a fixed delay to every statement to mimic a
+    # network round trip.
+    def __init__(self, path: str = ":memory:", latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.create_function("is_date_not_future", 1, _is_date_not_future, deterministic=True)
+        self.conn.create_aggregate("STDDEV", 1, _StdDev)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.create_schema()
+
+    def _delay(self):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def create_schema(self):
+        with self.lock:
+            self.conn.execute("PRAGMA foreign_keys = OFF")
+            for name, kind in self.conn.execute(
+                "SELECT name, type FROM sqlite_master WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%'"
+            ).fetchall():
+                self.conn.execute(f"DROP {kind.upper()} IF EXISTS {name}")
+            self.conn.execute("PRAGMA foreign_keys = ON")
+            for stmt in script_statements(RESET_SCRIPT):
+                ddl = translate_ddl(stmt)
+                if ddl is not None:
+                    self.conn.execute(ddl)
+            self.conn.commit()
+
+    def load(self, data):
+        # data has the same layout as schema.SEED_DATA
+        with self.lock:
+            for oracle_table in reversed(list(data)):
+                self.conn.execute(f"DELETE FROM {oracle_table}")
+            for oracle_table, (columns, rows) in data.items():
+                placeholders = ", ".join("?" for _ in columns)
+                self.conn.executemany(
+                    f"INSERT INTO {oracle_table} ({', '.join(columns)}) VALUES ({placeholders})", rows
+                )
+            self.conn.commit()
+
+    def fetch(self, sql: str, params=None):
+        self._delay()
+        with self.lock:
+            cur = self.conn.execute(translate_sql(sql), params or {})
+            columns = [desc[0].lower() for desc in cur.description]
+            return columns, cur.fetchall()
+
+    def upsert(self, oracle_table: str, columns, rows):
+        placeholders = ", ".join("?" for _ in columns)
+        with self.lock:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {oracle_table} ({', '.join(columns)}) VALUES ({placeholders})", rows
+            )
+            self.conn.commit()
+
+    def delete(self, oracle_table: str, ids):
+        # Child rows go too, through the same ON DELETE CASCADE as in Oracle
+        with self.lock:
+            self.conn.executemany(f"DELETE FROM {oracle_table} WHERE ID = ?", [(i,) for i in ids])
+            self.conn.commit()
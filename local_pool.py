@@ -0,0 +1,315 @@
+import re
+import asyncio
+import sqlite3
+import threading
+from typing import NamedTuple
+
+import oracledb
+
+from export import pyarrow
+from local_db import LocalDatabase, translate_sql
+
+# Oracle constructs main.py sends that the stand-in handles itself
+_SEQUENCE_VALUES = re.compile(r"^\s*SELECT\s+(\w+)\.NEXTVAL\s+FROM\s+dual\s+CONNECT\s+BY\s+LEVEL\s*<=\s*:(\w+)\s*$", re.IGNORECASE)
+_NEXTVAL = re.compile(r"\b(\w+)\.NEXTVAL\b", re.IGNORECASE)
+_RETURNING_ID = re.compile(r"\s+RETURNING\s+ID\s+INTO\s+:(\w+)\s*$", re.IGNORECASE)
+_INSERT_TABLE = re.compile(r"^\s*INSERT\s+INTO\s+(\w+)", re.IGNORECASE)
+_FOR_UPDATE = re.compile(r"\s+FOR\s+UPDATE\s*$", re.IGNORECASE)
+_PLSQL_BLOCK = re.compile(r"^\s*(BEGIN|DECLARE)\b", re.IGNORECASE)
+_REBUILDS_TABLES = re.compile(r"\b(DROP|TRUNCATE)\s+TABLE\b", re.IGNORECASE)
+
+
+class BatchError(NamedTuple):
+    offset: int
+    message: str
+
+
+class LocalVar:
+    def __init__(self):
+        self.value = None
+
+    def getvalue(self, pos: int = 0):
+        # Like a DML RETURNING variable: one value per row
+        return [self.value]
+
+
+class LocalInstance:
+    # An embedded stand-in for the Oracle instance: one LocalDatabase and its
+    # sequences, shared by the sync and async pools the app opens. Every
+    # statement waits latency_ms first to mimic the network round trip, and
+    # commits on its own; commit() and rollback() do nothing.
+    def __init__(self, latency_ms: float = 0.0):
+        self.db = LocalDatabase(latency_ms=latency_ms)
+        self.latency_ms = latency_ms
+        self._sequences = {}
+
+    def create_pool(self, min: int = 1, max: int = 8, increment: int = 1, wait_timeout: int = 5000, **kwargs):
+        return LocalPool(self, min, max, increment, wait_timeout, **kwargs)
+
+    def create_pool_async(self, min: int = 1, max: int = 8, increment: int = 1, wait_timeout: int = 5000, **kwargs):
+        return LocalAsyncPool(self, min, max, increment, wait_timeout, **kwargs)
+
+    def next_values(self, sequence: str, count: int) -> list[int]:
+        # <TABLE>_SEQ continues after the table's highest ID
+        key = sequence.upper()
+        if key not in self._sequences:
+            table = key.removesuffix("_SEQ")
+            self._sequences[key] = self.db.conn.execute(f"SELECT IFNULL(MAX(ID), 0) + 1 FROM {table}").fetchone()[0]
+        start = self._sequences[key]
+        self._sequences[key] += count
+        return list(range(start, start + count))
+
+    def run_block(self, block: str):
+        # The reset's PL/SQL blocks: dropping or truncating the tables
+        # recreates the schema, and every block restarts the sequences
+        if _REBUILDS_TABLES.search(block):
+            self.db.create_schema()
+        self._sequences.clear()
+
+    def execute(self, sql: str, params) -> tuple[list | None, list, int]:
+        # Returns (description, rows, rowcount); called with db.lock held
+        if _PLSQL_BLOCK.match(sql):
+            self.run_block(sql)
+            return None, [], 0
+        match = _SEQUENCE_VALUES.match(sql)
+        if match:
+            values = self.next_values(match.group(1), params[match.group(2)])
+            return [("NEXTVAL",) + (None,) * 6], [(v,) for v in values], len(values)
+        returning = _RETURNING_ID.search(sql)
+        if returning:
+            sql = sql[:returning.start()]
+            var = params[returning.group(1)]
+            params = {k: v for k, v in params.items() if k != returning.group(1)}
+        sql = _NEXTVAL.sub(lambda m: str(self.next_values(m.group(1), 1)[0]), _FOR_UPDATE.sub("", sql))
+        try:
+            cur = self.db.conn.execute(translate_sql(sql), params)
+            rows = cur.fetchall() if cur.description else []
+            self.db.conn.commit()
+        except sqlite3.Error as e:
+            self.db.conn.rollback()
+            raise oracledb.DatabaseError(str(e)) from e
+        if returning:
+            table = _INSERT_TABLE.match(sql).group(1)
+            var.value = self.db.conn.execute(f"SELECT ID FROM {table} WHERE rowid = ?", (cur.lastrowid,)).fetchone()[0]
+        return cur.description, rows, len(rows) if cur.description else cur.rowcount
+
+    def executemany(self, sql: str, rows: list, batcherrors: bool) -> tuple[list[int], list[BatchError]]:
+        counts, errors = [], []
+        sql = translate_sql(sql)
+        try:
+            if not batcherrors:
+                self.db.conn.executemany(sql, rows)
+                counts = [1] * len(rows)
+            for offset, row in enumerate(rows if batcherrors else ()):
+                try:
+                    counts.append(self.db.conn.execute(sql, row).rowcount)
+                except sqlite3.Error as e:
+                    counts.append(0)
+                    errors.append(BatchError(offset, str(e)))
+            self.db.conn.commit()
+        except sqlite3.Error as e:
+            self.db.conn.rollback()
+            raise oracledb.DatabaseError(str(e)) from e
+        return counts, errors
+
+
+class LocalCursor:
+    def __init__(self, instance: LocalInstance):
+        self.instance = instance
+        self.arraysize = oracledb.defaults.arraysize
+        self.prefetchrows = oracledb.defaults.prefetchrows
+        self.description = None
+        self.rowcount = 0
+        self.statement = None
+        self._rows = []
+        self._row_counts = []
+        self._batch_errors = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._rows = []
+
+    def var(self, typ, *args, **kwargs) -> LocalVar:
+        return LocalVar()
+
+    def _run(self, sql: str, parameters):
+        self.statement = sql
+        with self.instance.db.lock:
+            self.description, self._rows, self.rowcount = self.instance.execute(sql, parameters or {})
+
+    def _run_many(self, sql: str, rows: list, batcherrors: bool):
+        self.statement = sql
+        with self.instance.db.lock:
+            self._row_counts, self._batch_errors = self.instance.executemany(sql, rows, batcherrors)
+        self.rowcount = sum(self._row_counts)
+
+    def execute(self, sql: str, parameters=None):
+        self.instance.db._delay()
+        self._run(sql, parameters)
+
+    def executemany(self, sql: str, rows: list, batcherrors: bool = False, arraydmlrowcounts: bool = False):
+        self.instance.db._delay()
+        self._run_many(sql, rows, batcherrors)
+
+    def getbatcherrors(self) -> list[BatchError]:
+        return self._batch_errors
+
+    def getarraydmlrowcounts(self) -> list[int]:
+        return self._row_counts
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size: int | None = None) -> list:
+        size = size or self.arraysize
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self) -> list:
+        rows, self._rows = self._rows, []
+        return rows
+
+
+class LocalAsyncCursor(LocalCursor):
+    # The latency is awaited and SQLite runs in a worker thread, so waiting
+    # requests do not block the event loop, as with the async Oracle driver
+    async def execute(self, sql: str, parameters=None):
+        await asyncio.sleep(self.instance.latency_ms / 1000)
+        await asyncio.to_thread(self._run, sql, parameters)
+
+    async def executemany(self, sql: str, rows: list, batcherrors: bool = False, arraydmlrowcounts: bool = False):
+        await asyncio.sleep(self.instance.latency_ms / 1000)
+        await asyncio.to_thread(self._run_many, sql, rows, batcherrors)
+
+    async def parse(self, sql: str):
+        pass
+
+    async def fetchone(self):
+        return super().fetchone()
+
+    async def fetchmany(self, size: int | None = None) -> list:
+        return super().fetchmany(size)
+
+    async def fetchall(self) -> list:
+        return super().fetchall()
+
+
+class LocalConnection:
+    cursor_class = LocalCursor
+
+    def __init__(self, instance: LocalInstance):
+        self.instance = instance
+        self.outputtypehandler = None
+
+    def cursor(self):
+        return self.cursor_class(self.instance)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class LocalAsyncConnection(LocalConnection):
+    cursor_class = LocalAsyncCursor
+
+    async def _fetch_table(self, statement: str, parameters):
+        # The stand-in's data frames are pyarrow Tables. Column types are
+        # inferred from the values SQLite returns, over the whole result so
+        # every batch has the same schema: scaled NUMBERs are doubles and
+        # DATEs are ISO strings, unlike python-oracledb's decimals and
+        # timestamps.
+        cur = self.cursor()
+        await cur.execute(statement, parameters)
+        columns = [desc[0] for desc in cur.description]
+        rows = await cur.fetchall()
+        return pyarrow.table({name: [row[i] for row in rows] for i, name in enumerate(columns)})
+
+    async def fetch_df_all(self, statement: str, parameters=None, arraysize: int | None = None):
+        return await self._fetch_table(statement, parameters)
+
+    async def fetch_df_batches(self, statement: str, parameters=None, size: int | None = None):
+        table = await self._fetch_table(statement, parameters)
+        size = size or oracledb.defaults.arraysize
+        for offset in range(0, table.num_rows, size):
+            yield table.slice(offset, size)
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+def _pool_timeout() -> oracledb.DatabaseError:
+    return oracledb.DatabaseError("DPY-4005: timed out waiting for the connection pool to return a connection")
+
+
+class _PoolStats:
+    def __init__(self, instance: LocalInstance, min: int, max: int, increment: int, wait_timeout: int,
+                 ping_interval: int = 60, stmtcachesize: int = 20, **kwargs):
+        self.instance = instance
+        self.min = min
+        self.max = max
+        self.increment = increment
+        self.wait_timeout = wait_timeout
+        self.ping_interval = ping_interval
+        self.stmtcachesize = stmtcachesize
+        self.opened = min
+        self.busy = 0
+
+    def _checked_out(self):
+        self.busy += 1
+        self.opened = max(self.opened, self.busy)
+
+    def _checked_in(self):
+        self.busy -= 1
+
+
+class LocalPool(_PoolStats):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max)
+
+    def acquire(self) -> LocalConnection:
+        if not self._slots.acquire(timeout=self.wait_timeout / 1000):
+            raise _pool_timeout()
+        with self._lock:
+            self._checked_out()
+        return LocalConnection(self.instance)
+
+    def release(self, conn):
+        with self._lock:
+            self._checked_in()
+        self._slots.release()
+
+    def close(self, force: bool = False):
+        pass
+
+
+class LocalAsyncPool(_PoolStats):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._slots = asyncio.BoundedSemaphore(self.max)
+
+    async def acquire(self) -> LocalAsyncConnection:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.wait_timeout / 1000)
+        except asyncio.TimeoutError:
+            raise _pool_timeout()
+        self._checked_out()
+        return LocalAsyncConnection(self.instance)
+
+    async def release(self, conn):
+        self._checked_in()
+        self._slots.release()
+
+    async def close(self, force: bool = False):
+        pass
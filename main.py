@@ -1,634 +1,1363 @@
+import io
 import os
+import re
+import csv
+import json
+import math
+import time
+import base64
+import hashlib
+import orjson
+import asyncio
 import datetime
-import getpass
-from fastapi import FastAPI, HTTPException, Body
-from fastapi.responses import HTMLResponse
+import functools
+import logging
+import mimetypes
+import threading
+import contextlib
+from typing import Literal
+from fastapi import FastAPI, HTTPException, Body, Depends, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse, ORJSONResponse
 import oracledb
+from aggregates import AGGREGATE_QUERIES, AGGREGATE_SQL, AggregateStore
+from assets import StaticAssets
+from pydantic import TypeAdapter, ValidationError
+from compression import CompressionMiddleware
+from cache import QueryCache, SharedTableVersions, TableVersions, base_tables, view_definitions
+from export import ARROW_EXTENSIONS, ARROW_FORMATS, ARROW_MEDIA_TYPES, ArrowWriter, arrow_type_handler, pyarrow, to_arrow_table
+from documents import DocumentStore, DocumentTooLarge
+from feed import ChangeFeed
+from ids import IdAllocator, fetch_sequence_values
+from local_pool import LocalInstance
+from metrics import ROW_BUCKETS, Labels, Registry, sql_id
+from models import validate_row
+from replica import AnalyticReplica
+from schema import (
+    ALLOWED_TABLES, FILTER_COLUMNS, PREPARED_QUERIES, QUERY_PARAMETERS, RESET_SCRIPT, SEARCH_COLUMNS, SEED_DATA,
+    TABLE_COLUMNS, script_statements,
+)
+from settings import load_settings
+from writes import WriteQueue
+
+# Settings come from the environment or config.toml (see settings.py); nothing
+# here touches the database until the pool is opened at startup.
+settings = load_settings()
+
+logger = logging.getLogger(__name__)
+
+STREAM_ARRAYSIZE = settings.stream_arraysize
+
+# With DB_BACKEND=local the pools hand out connections to an embedded SQLite
+# stand-in instead, so the app runs offline (see loadtest.py)
+local_instance = LocalInstance(settings.local_latency_ms) if settings.db_backend == "local" else None
+
+# Connection pool; opened by the app lifespan, or on first use by the CLI tools.
+# Each worker process has its own pool.
+pool = None
+_pool_lock = threading.Lock()
+
+def open_pool():
+    global pool
+    with _pool_lock:
+        if pool is None and local_instance is not None:
+            pool = local_instance.create_pool(
+                min=settings.pool_min, max=settings.pool_max, wait_timeout=settings.pool_wait_timeout_ms)
+        if pool is None:
+            if not settings.oracle_user or not settings.oracle_password:
+                raise RuntimeError("Set ORACLE_USER and ORACLE_PASSWORD, or oracle_user and oracle_password in config.toml")
+            pool = oracledb.create_pool(
+                user=settings.oracle_user,
+                password=settings.oracle_password,
+                dsn=settings.oracle_dsn,
+                min=settings.pool_min,
+                max=settings.pool_max,
+                increment=settings.pool_increment,
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=settings.pool_wait_timeout_ms,
+                ping_interval=settings.pool_ping_interval_s,
+                stmtcachesize=settings.stmt_cache_size,
+            )
+    return pool
+
+def close_pool():
+    global pool
+    with _pool_lock:
+        if pool is not None:
+            pool.close(force=True)
+            pool = None
+
+# Async pool for the read endpoints, so a request waiting on Oracle does not
+# hold a threadpool thread. Writes, resets and the CLI tools use the sync pool.
+async_pool = None
+
+def open_async_pool():
+    global async_pool
+    if async_pool is None and local_instance is not None:
+        async_pool = local_instance.create_pool_async(
+            min=settings.pool_min, max=settings.async_pool_max, wait_timeout=settings.pool_wait_timeout_ms)
+    if async_pool is None:
+        open_pool()
+        async_pool = oracledb.create_pool_async(
+            user=settings.oracle_user,
+            password=settings.oracle_password,
+            dsn=settings.oracle_dsn,
+            min=settings.pool_min,
+            max=settings.async_pool_max,
+            increment=settings.pool_increment,
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=settings.pool_wait_timeout_ms,
+            ping_interval=settings.pool_ping_interval_s,
+            stmtcachesize=settings.stmt_cache_size,
+        )
+    return async_pool
+
+async def close_async_pool():
+    global async_pool
+    if async_pool is not None:
+        await async_pool.close(force=True)
+        async_pool = None
+
+async def warm_statement_cache():
+    # Parse every prepared query on each of the async pool's initial
+    # connections so the first requests find them in the statement cache.
+    conns = [await acquire_async_conn() for _ in range(settings.pool_min)]
+    try:
+        for conn in conns:
+            with conn.cursor() as cur:
+                for sql in PREPARED_QUERIES.values():
+                    await cur.parse(sql)
+    finally:
+        for conn in conns:
+            await async_pool.release(conn)
+
+# The page and vendored front-end files, with their gzip and brotli variants,
+# are built once at startup
+static_assets = StaticAssets()
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    if settings.serve_front_end:
+        static_assets.build()
+        if static_assets.missing_vendor_files:
+            logger.warning("Vendored front-end files missing, the page loads them from cdn.jsdelivr.net instead; "
+                           "run `python assets.py` so it works without internet access: %s",
+                           ", ".join(static_assets.missing_vendor_files))
+    open_pool()
+    open_async_pool()
+    if settings.warmup_statements:
+        await warm_statement_cache()
+    for copy in table_copies:
+        try:
+            with checkout() as conn:
+                copy.snapshot(conn)
+        except (oracledb.DatabaseError, HTTPException) as e:
+            # Typically the schema does not exist yet; the next reset loads it
+            logger.warning("%s not loaded: %s", copy.name, e)
+    feed_task = asyncio.create_task(change_feed.run())
+    yield
+    feed_task.cancel()
+    await close_async_pool()
+    close_pool()
+
+# Document files are sent as stored, whatever their type, so byte ranges work
+DOCUMENT_FILE_PATH = re.compile(r"^/api/application_documents/\d+/file$")
+
+app = FastAPI(lifespan=lifespan)
+# JSON and text API responses above the threshold are gzipped on the fly;
+# Arrow and Parquet exports, and the already compressed static assets, pass
+# through untouched.
+app.add_middleware(CompressionMiddleware, minimum_size=settings.gzip_min_bytes, compresslevel=6,
+                   exclude=DOCUMENT_FILE_PATH)
+
+# Latency metrics, exposed in Prometheus format at /metrics. Each worker
+# process keeps its own. Statements are labelled with the endpoint, API table
+# and prepared-query key they ran for.
+metrics_registry = Registry()
+REQUEST_SECONDS = metrics_registry.histogram(
+    "http_request_seconds", "Time to the response headers, by route", ("method", "route", "status"))
+STATEMENT_SECONDS = metrics_registry.histogram(
+    "db_statement_seconds", "Database time per statement, by phase (execute, fetch, replica, aggregate)", (*Labels._fields, "phase"))
+STATEMENT_ROWS = metrics_registry.histogram(
+    "db_statement_rows", "Rows fetched or written per statement", Labels._fields, ROW_BUCKETS)
+WRITE_BATCH_ROWS = metrics_registry.histogram(
+    "write_batch_rows", "Single-row writes per group-committed batch", ("op", "table"), (1, 2, 5, 10, 20, 50, 100, 200, 500))
+ROUND_TRIPS = metrics_registry.counter(
+    "db_round_trips_total", "Database round trips, estimated from prefetchrows and arraysize", Labels._fields)
+SERIALIZE_SECONDS = metrics_registry.histogram(
+    "serialize_seconds", "Time spent encoding results", Labels._fields)
+
+SLOW_QUERY_MS = settings.slow_query_ms
+slow_query_log = logging.getLogger("slow_query")
+
+@app.middleware("http")
+async def record_request_time(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    labels = (request.method, route.path if route else "unmatched", str(response.status_code))
+    REQUEST_SECONDS.observe(time.perf_counter() - start, labels)
+    return response
+
+def record_statement(labels: Labels, sql: str, binds, execute_s: float, fetch_s: float | None = None,
+                     rows: int = 0, round_trips: int = 1):
+    STATEMENT_SECONDS.observe(execute_s, (*labels, "execute"))
+    if fetch_s is not None:
+        STATEMENT_SECONDS.observe(fetch_s, (*labels, "fetch"))
+    STATEMENT_ROWS.observe(rows, labels)
+    ROUND_TRIPS.inc(labels, round_trips)
+    elapsed_ms = (execute_s + (fetch_s or 0.0)) * 1000
+    if 0 < SLOW_QUERY_MS <= elapsed_ms:
+        slow_query_log.warning(
+            "Slow statement sql_id=%s %.1f ms (execute %.1f ms, fetch %.1f ms) rows=%d endpoint=%s table=%s query=%s binds=%s",
+            sql_id(sql), elapsed_ms, execute_s * 1000, (fetch_s or 0.0) * 1000, rows,
+            labels.endpoint, labels.table, labels.query, binds,
+        )
 
-app = FastAPI()
-
-# Database connection
-ORACLE_USER = os.environ.get("ORACLE_USER")
-if ORACLE_USER is None:
-    ORACLE_USER = input("Enter Oracle DB username: ")
-    os.environ["ORACLE_USER"] = ORACLE_USER
-ORACLE_PASSWORD = os.environ.get("ORACLE_PASSWORD")
-if ORACLE_PASSWORD is None:
-    ORACLE_PASSWORD = getpass.getpass("Enter Oracle DB password: ")
-    os.environ["ORACLE_PASSWORD"] = ORACLE_PASSWORD
-ORACLE_DSN = "(DESCRIPTION=(ADDRESS=(PROTOCOL=TCP)(Host=localhost)(Port=1521))(CONNECT_DATA=(SID=orcl12c)))"
-conn = oracledb.connect(user=ORACLE_USER, password=ORACLE_PASSWORD, dsn=ORACLE_DSN)
-
-ALLOWED_TABLES = {
-    'institutions': 'INSTITUTION',
-    'programs': 'PROGRAM',
-    'applicants': 'APPLICANT',
-    'applications': 'APPLICATION',
-    'application_documents': 'APPLICATION_DOCUMENT'
+def fetch_round_trips(cur, rows: int) -> int:
+    # The execute round trip brings back up to prefetchrows rows, each further
+    # fetch up to arraysize; the end of data is seen one row past the last.
+    return 1 + math.ceil(max(rows + 1 - cur.prefetchrows, 0) / cur.arraysize)
+
+def execute_statement(labels: Labels, cur, sql: str, binds=None):
+    start = time.perf_counter()
+    cur.execute(sql, binds or {})
+    record_statement(labels, sql, binds, time.perf_counter() - start, rows=cur.rowcount)
+
+def execute_many(labels: Labels, cur, sql: str, rows: list, **kwargs):
+    # One round trip per call; binds are summarized rather than logged per row
+    start = time.perf_counter()
+    cur.executemany(sql, rows, **kwargs)
+    record_statement(labels, sql, f"<{len(rows)} rows>", time.perf_counter() - start, rows=len(rows))
+
+@contextlib.contextmanager
+def timed(histogram, labels):
+    start = time.perf_counter()
+    yield
+    histogram.observe(time.perf_counter() - start, labels)
+
+def acquire_conn():
+    try:
+        conn = open_pool().acquire()
+    except oracledb.Error as e:
+        raise HTTPException(status_code=503, detail=f"No database connection available: {e}")
+    conn.outputtypehandler = _output_type_handler
+    return conn
+
+@contextlib.contextmanager
+def checkout():
+    conn = acquire_conn()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+def get_conn():
+    with checkout() as conn:
+        yield conn
+
+async def acquire_async_conn():
+    try:
+        conn = await open_async_pool().acquire()
+    except oracledb.Error as e:
+        raise HTTPException(status_code=503, detail=f"No database connection available: {e}")
+    conn.outputtypehandler = _output_type_handler
+    return conn
+
+@contextlib.asynccontextmanager
+async def async_checkout():
+    conn = await acquire_async_conn()
+    try:
+        yield conn
+    finally:
+        await async_pool.release(conn)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+BULK_BATCH_SIZE = settings.bulk_batch_size
+
+# Base tables read by each prepared query, with views expanded
+VIEW_TABLES = view_definitions(RESET_SCRIPT)
+QUERY_TABLES = {
+    key: base_tables(sql, VIEW_TABLES, ALLOWED_TABLES.values())
+    for key, sql in PREPARED_QUERIES.items()
 }
 
-PREPARED_QUERIES = {
-    '1': """
-SELECT DISTINCT Name AS Institution_Name, Accreditation_Status
-FROM Institution
-ORDER BY Name
-""",
-    '2': """
-SELECT Name AS Program_Name, Minimum_GPA, Duration_Years, Enrollment_Status
-FROM Program
-WHERE Enrollment_Status = 'Open'
-GROUP BY Name, Minimum_GPA, Duration_Years, Enrollment_Status
-ORDER BY Name
-""",
-    '3': """
-SELECT DISTINCT First_Name, Last_Name, GPA
-FROM Applicant
-ORDER BY GPA DESC
-""",
-    '4': """
-SELECT ID AS Application_ID, Applicant_ID, Program_ID, Submission_Date, Status
-FROM Application
-GROUP BY ID, Applicant_ID, Program_ID, Submission_Date, Status
-ORDER BY Submission_Date
-""",
-    '5': """
-SELECT DISTINCT Application_ID, Document_Type, Document_File
-FROM Application_Document
-ORDER BY Application_ID, Document_Type
-""",
-    '6': """
-SELECT Name AS Program_Name, Minimum_GPA, Enrollment_Status
-FROM Program
-WHERE Minimum_GPA >= 3.5
-GROUP BY Name, Minimum_GPA, Enrollment_Status
-ORDER BY Minimum_GPA DESC
-""",
-    '7': """
-SELECT DISTINCT First_Name, Last_Name, GPA
-FROM Applicant
-WHERE GPA > (SELECT AVG(GPA) FROM Applicant)
-ORDER BY GPA DESC
-""",
-    '8': """
-SELECT Status, COUNT(*) AS Application_Count
-FROM Application
-GROUP BY Status
-ORDER BY Application_Count DESC
-""",
-    '9': """
-SELECT i.Name AS Institution_Name,
-    ROUND(AVG(a.GPA), 2) AS Avg_GPA,
-    MIN(a.GPA) AS Min_GPA,
-    MAX(a.GPA) AS Max_GPA,
-    ROUND(STDDEV(a.GPA), 2) AS StdDev_GPA
-FROM Applicant a
-JOIN Institution i ON a.Institution_ID = i.ID
-GROUP BY i.Name
-ORDER BY Avg_GPA DESC
-""",
-    '10': """
-SELECT p.Name AS Program_Name, ROUND(AVG(a.GPA), 2) AS Program_Avg_GPA
-FROM Program p
-JOIN Application ap ON p.ID = ap.Program_ID
-JOIN Applicant a ON ap.Applicant_ID = a.ID
-GROUP BY p.Name
-HAVING AVG(a.GPA) > (SELECT AVG(GPA) FROM Applicant)
-ORDER BY Program_Avg_GPA DESC
-""",
-    '11': """
-SELECT ap.First_Name, ap.Last_Name, ap.Email
-FROM Applicant ap
-WHERE NOT EXISTS (
-    SELECT 1
-    FROM Application a
-    JOIN Application_Document d ON a.ID = d.Application_ID
-    WHERE d.Document_Type = 'Transcript'
-      AND a.Applicant_ID = ap.ID)
-ORDER BY ap.Last_Name
-""",
-    '12': """
-SELECT p.Name AS Program_Name, COUNT(a.ID) AS Accepted_Applications
-FROM Program p
-JOIN Application a ON p.ID = a.Program_ID
-WHERE a.Outcome = 'Accepted'
-GROUP BY p.Name
-HAVING COUNT(a.ID) > 0
-ORDER BY Accepted_Applications DESC
-""",
-    '13': """
-SELECT DISTINCT ap.First_Name, ap.Last_Name, p.Name AS Program_Name, a.Status, a.Outcome
-FROM Application a
-JOIN Applicant ap ON a.Applicant_ID = ap.ID
-JOIN Program p ON a.Program_ID = p.ID
-WHERE p.Enrollment_Status = 'Open'
-  AND a.Outcome IN ('Pending', 'Waitlisted')
-ORDER BY ap.Last_Name, p.Name
-""",
-    '14': """
-(SELECT ap.First_Name, ap.Last_Name, ap.Email, p.Name AS Program_Name
-FROM Applicant ap
-JOIN Application a ON ap.ID = a.Applicant_ID
-JOIN Program p ON a.Program_ID = p.ID
-WHERE p.Name = 'Computer Science'
-    AND a.Outcome = 'Accepted')
-MINUS
-(SELECT ap.First_Name, ap.Last_Name, ap.Email, p.Name AS Program_Name
-FROM Applicant ap
-JOIN Application a ON ap.ID = a.Applicant_ID
-JOIN Program p ON a.Program_ID = p.ID
-WHERE p.Name = 'Business Admin'
-    AND a.Outcome = 'Accepted')
-ORDER BY Last_Name
-""",
-    '15': """
-SELECT 
-    asv.First_Name,
-    asv.Last_Name,
-    asv.GPA AS Applicant_GPA,
-    pov.Program_Name,
-    pov.Avg_Applicant_GPA AS Program_Avg_GPA,
-    (asv.GPA - pov.Avg_Applicant_GPA) AS GPA_Difference
-FROM Applicant_Summary_View asv
-JOIN Application a ON asv.Applicant_ID = a.Applicant_ID
-JOIN Program_Outcome_View pov ON a.Program_ID = pov.Program_ID
-ORDER BY GPA_Difference DESC
-""",
-    '16': """
-SELECT DISTINCT
-    asv.First_Name,
-    asv.Last_Name,
-    adv.Program_Name,
-    adv.Document_Type,
-    adv.Document_File
-FROM Applicant_Summary_View asv
-JOIN Application_Document_View adv 
-    ON asv.First_Name = adv.First_Name 
-   AND asv.Last_Name = adv.Last_Name
-JOIN Program_Outcome_View pov 
-    ON adv.Program_Name = pov.Program_Name
-WHERE pov.Accepted > 0
-ORDER BY asv.Last_Name, adv.Program_Name
-""",
-    '17': """
-SELECT 
-    pov.Program_Name,
-    pov.Total_Applications,
-    pov.Accepted,
-    ROUND((pov.Accepted / NULLIF(pov.Total_Applications, 0)) * 100, 2) AS Acceptance_Rate,
-    pov.Avg_Applicant_GPA
-FROM Program_Outcome_View pov
-WHERE pov.Total_Applications > 0
-ORDER BY Acceptance_Rate DESC, pov.Avg_Applicant_GPA DESC
-""",
-    '18': """
-SELECT 
-    asv.Institution_Name,
-    COUNT(DISTINCT asv.Applicant_ID) AS Total_Applicants,
-    SUM(asv.Accepted_Count) AS Total_Accepted,
-    COUNT(DISTINCT adv.Document_File) AS Total_Documents,
-    ROUND(COUNT(DISTINCT adv.Document_File) / NULLIF(COUNT(DISTINCT asv.Applicant_ID), 0), 2) AS Avg_Documents_Per_Applicant
-FROM Applicant_Summary_View asv
-JOIN Application_Document_View adv 
-    ON asv.First_Name = adv.First_Name
-   AND asv.Last_Name = adv.Last_Name
-JOIN Program_Outcome_View pov 
-    ON adv.Program_Name = pov.Program_Name
-GROUP BY asv.Institution_Name
-ORDER BY Total_Accepted DESC
-""",
-    '19': """
-SELECT DISTINCT
-    asv.First_Name,
-    asv.Last_Name,
-    asv.GPA,
-    adv.Program_Name,
-    pov.Pending
-FROM Applicant_Summary_View asv
-JOIN Application_Document_View adv 
-    ON asv.First_Name = adv.First_Name 
-   AND asv.Last_Name = adv.Last_Name
-JOIN Program_Outcome_View pov 
-    ON adv.Program_Name = pov.Program_Name
-WHERE asv.GPA >= 3.7
-  AND pov.Pending > 0
-ORDER BY asv.GPA DESC, adv.Program_Name
-"""
+# Deleting a row also removes the child rows that reference it ON DELETE CASCADE
+CASCADE_DELETES = {
+    'APPLICATION': ('APPLICATION_DOCUMENT',)
 }
 
-RESET_SCRIPT = """
-BEGIN EXECUTE IMMEDIATE 'DROP TABLE Application_Document CASCADE CONSTRAINTS'; EXCEPTION WHEN OTHERS THEN NULL; END;
-/
-BEGIN EXECUTE IMMEDIATE 'DROP TABLE Application CASCADE CONSTRAINTS'; EXCEPTION WHEN OTHERS THEN NULL; END;
-/
-BEGIN EXECUTE IMMEDIATE 'DROP TABLE Applicant CASCADE CONSTRAINTS'; EXCEPTION WHEN OTHERS THEN NULL; END;
-/
-BEGIN EXECUTE IMMEDIATE 'DROP TABLE Program CASCADE CONSTRAINTS'; EXCEPTION WHEN OTHERS THEN NULL; END;
-/
-BEGIN EXECUTE IMMEDIATE 'DROP TABLE Institution CASCADE CONSTRAINTS'; EXCEPTION WHEN OTHERS THEN NULL; END;
-/
-BEGIN EXECUTE IMMEDIATE 'DROP VIEW Applicant_Summary_View'; EXCEPTION WHEN OTHERS THEN NULL; END;
-/
-BEGIN EXECUTE IMMEDIATE 'DROP VIEW Application_Document_View'; EXCEPTION WHEN OTHERS THEN NULL; END;
-/
-BEGIN EXECUTE IMMEDIATE 'DROP VIEW Program_Outcome_View'; EXCEPTION WHEN OTHERS THEN NULL; END;
-/
-
-CREATE OR REPLACE FUNCTION is_date_not_future (
-    p_date IN DATE
-) RETURN VARCHAR2 DETERMINISTIC IS
-BEGIN
-    RETURN CASE WHEN p_date > TRUNC(SYSDATE) THEN 'N' ELSE 'Y' END;
-END;
-/
-
-CREATE TABLE Institution (
-    ID NUMBER(10,0) PRIMARY KEY,
-    Name VARCHAR2(100) NOT NULL,
-    City VARCHAR2(50) NOT NULL,
-    State_Province VARCHAR2(50),
-    Country VARCHAR2(50) NOT NULL,
-    Accreditation_Status VARCHAR2(20) NOT NULL CHECK (Accreditation_Status IN ('Accredited','Provisional','Unaccredited'))
-)
-/
-
-CREATE TABLE Program (
-    ID NUMBER(10,0) PRIMARY KEY,
-    Name VARCHAR2(100) NOT NULL,
-    Minimum_GPA NUMBER(3,2) NOT NULL CHECK (Minimum_GPA BETWEEN 0.0 AND 4.0),
-    Duration_Years NUMBER(2,0) NOT NULL CHECK (Duration_Years > 0),
-    Enrollment_Status VARCHAR2(10) NOT NULL CHECK (Enrollment_Status IN ('Open', 'Closed'))
-)
-/
-
-CREATE TABLE Applicant (
-    ID NUMBER(10,0) PRIMARY KEY,
-    First_Name VARCHAR2(50) NOT NULL,
-    Last_Name VARCHAR2(50) NOT NULL,
-    Date_of_Birth DATE NOT NULL,
-    Email VARCHAR2(100) NOT NULL UNIQUE,
-    Institution_ID NUMBER(10,0) NOT NULL,
-    GPA NUMBER(3,2) NOT NULL CHECK (GPA BETWEEN 0.0 AND 4.0),
-    not_future_birth_ind VARCHAR2(1) GENERATED ALWAYS AS (CAST(is_date_not_future(Date_of_Birth) AS VARCHAR2(1))) VIRTUAL,
-    CONSTRAINT ck_birth_not_future CHECK (not_future_birth_ind = 'Y'),
-    CONSTRAINT fk_applicant_institution FOREIGN KEY (Institution_ID) REFERENCES Institution(ID)
-)
-/
-
-CREATE TABLE Application (
-    ID NUMBER(10,0) PRIMARY KEY,
-    Applicant_ID NUMBER(10,0) NOT NULL,
-    Program_ID NUMBER(10,0) NOT NULL,
-    Submission_Date DATE DEFAULT SYSDATE NOT NULL,
-    Status VARCHAR2(20) DEFAULT 'Submitted' NOT NULL CHECK (Status IN ('Submitted', 'Under Review', 'Completed')),
-    Decision_Date DATE,
-    Outcome VARCHAR2(20) NOT NULL CHECK (Outcome IN ('Accepted', 'Rejected', 'Pending', 'Waitlisted')),
-    Outcome_Notes VARCHAR2(1000),
-    not_future_sub_ind VARCHAR2(1) GENERATED ALWAYS AS (CAST(is_date_not_future(Submission_Date) AS VARCHAR2(1))) VIRTUAL,
-    CONSTRAINT ck_sub_not_future CHECK (not_future_sub_ind = 'Y'),
-    CONSTRAINT fk_application_applicant FOREIGN KEY (Applicant_ID) REFERENCES Applicant(ID),
-    CONSTRAINT fk_application_program FOREIGN KEY (Program_ID) REFERENCES Program(ID),
-    CONSTRAINT ck_application_decision_logic CHECK (
-        (Outcome IN ('Accepted','Rejected','Waitlisted') AND Status='Completed' AND Decision_Date IS NOT NULL AND Decision_Date >= Submission_Date)
-        OR
-        (Outcome='Pending' AND Decision_Date IS NULL AND Status IN ('Submitted','Under Review'))
-    )
-)
-/
-
-CREATE TABLE Application_Document (
-    ID NUMBER(10,0) PRIMARY KEY,
-    Application_ID NUMBER(10,0) NOT NULL,
-    Institution_ID NUMBER(10,0),
-    Document_Type VARCHAR2(50) NOT NULL CHECK (Document_Type IN ('Transcript', 'Essay', 'Recommendation', 'Certificate', 'English Test')),
-    Document_File VARCHAR2(255) NOT NULL,
-    CONSTRAINT fk_document_application FOREIGN KEY (Application_ID) REFERENCES Application(ID) ON DELETE CASCADE,
-    CONSTRAINT fk_document_institution FOREIGN KEY (Institution_ID) REFERENCES Institution(ID),
-    CONSTRAINT chk_transcript_institution CHECK (Document_Type != 'Transcript' OR Institution_ID IS NOT NULL)
-)
-/
-
-CREATE OR REPLACE VIEW Applicant_Summary_View AS
-SELECT 
-    ap.ID AS Applicant_ID,
-    ap.First_Name,
-    ap.Last_Name,
-    i.Name AS Institution_Name,
-    ap.GPA,
-    COUNT(a.ID) AS Total_Applications,
-    COUNT(CASE WHEN a.Outcome = 'Accepted' THEN 1 END) AS Accepted_Count
-FROM Applicant ap
-JOIN Institution i ON ap.Institution_ID = i.ID
-LEFT JOIN Application a ON ap.ID = a.Applicant_ID
-GROUP BY ap.ID, ap.First_Name, ap.Last_Name, i.Name, ap.GPA
-/
-
-CREATE OR REPLACE VIEW Application_Document_View AS
-SELECT 
-    a.ID AS Application_ID,
-    ap.First_Name,
-    ap.Last_Name,
-    d.Document_Type,
-    d.Document_File,
-    i.Name AS Institution_Name,
-    p.Name AS Program_Name
-FROM Application a
-JOIN Applicant ap ON a.Applicant_ID = ap.ID
-JOIN Program p ON a.Program_ID = p.ID
-LEFT JOIN Application_Document d ON a.ID = d.Application_ID
-LEFT JOIN Institution i ON ap.Institution_ID = i.ID
-/
-
-CREATE OR REPLACE VIEW Program_Outcome_View AS
-SELECT 
-    p.ID AS Program_ID,
-    p.Name AS Program_Name,
-    COUNT(a.ID) AS Total_Applications,
-    COUNT(CASE WHEN a.Outcome = 'Accepted' THEN 1 END) AS Accepted,
-    COUNT(CASE WHEN a.Outcome = 'Rejected' THEN 1 END) AS Rejected,
-    COUNT(CASE WHEN a.Outcome = 'Pending' THEN 1 END) AS Pending,
-    ROUND(AVG(ap.GPA), 2) AS Avg_Applicant_GPA
-FROM Program p
-LEFT JOIN Application a ON p.ID = a.Program_ID
-LEFT JOIN Applicant ap ON a.Applicant_ID = ap.ID
-GROUP BY p.ID, p.Name
-/
-
-INSERT INTO Institution (ID, Name, City, State_Province, Country, Accreditation_Status) VALUES (1, 'Central Secondary', 'Toronto', 'ON', 'Canada', 'Accredited')/
-INSERT INTO Institution (ID, Name, City, State_Province, Country, Accreditation_Status) VALUES (2, 'Riverside Academy', 'Vancouver', 'BC', 'Canada', 'Accredited')/
-INSERT INTO Institution (ID, Name, City, State_Province, Country, Accreditation_Status) VALUES (3, 'Oakwood School', 'London', 'England', 'UK', 'Accredited')/
-
-INSERT INTO Program (ID, Name, Minimum_GPA, Duration_Years, Enrollment_Status) VALUES (1, 'Computer Science', 3.5, 4, 'Open')/
-INSERT INTO Program (ID, Name, Minimum_GPA, Duration_Years, Enrollment_Status) VALUES (2, 'Business Admin', 3.0, 4, 'Open')/
-INSERT INTO Program (ID, Name, Minimum_GPA, Duration_Years, Enrollment_Status) VALUES (3, 'Engineering', 3.7, 4, 'Closed')/
-
-INSERT INTO Applicant (ID, First_Name, Last_Name, Date_of_Birth, Email, Institution_ID, GPA) VALUES (1001, 'John', 'Doe', TO_DATE('2007-05-15', 'YYYY-MM-DD'), 'john.doe@email.com', 1, 3.8)/
-INSERT INTO Applicant (ID, First_Name, Last_Name, Date_of_Birth, Email, Institution_ID, GPA) VALUES (1002, 'Jane', 'Smith', TO_DATE('2006-11-22', 'YYYY-MM-DD'), 'jane.smith@email.com', 2, 3.5)/
-INSERT INTO Applicant (ID, First_Name, Last_Name, Date_of_Birth, Email, Institution_ID, GPA) VALUES (1003, 'Alice', 'Johnson', TO_DATE('2007-03-10', 'YYYY-MM-DD'), 'alice.j@email.com', 1, 3.9)/
-
-INSERT INTO Application (ID, Applicant_ID, Program_ID, Submission_Date, Status, Decision_Date, Outcome, Outcome_Notes) VALUES (1, 1001, 1, TO_DATE('2025-01-15', 'YYYY-MM-DD'), 'Completed', TO_DATE('2025-03-01', 'YYYY-MM-DD'), 'Accepted', 'Strong GPA and transcript')/
-INSERT INTO Application (ID, Applicant_ID, Program_ID, Submission_Date, Status, Decision_Date, Outcome, Outcome_Notes) VALUES (2, 1002, 2, TO_DATE('2025-02-10', 'YYYY-MM-DD'), 'Completed', TO_DATE('2025-03-15', 'YYYY-MM-DD'), 'Rejected', 'GPA below threshold; weak essay')/
-INSERT INTO Application (ID, Applicant_ID, Program_ID, Submission_Date, Status, Decision_Date, Outcome, Outcome_Notes) VALUES (3, 1003, 1, TO_DATE('2025-01-20', 'YYYY-MM-DD'), 'Submitted', NULL, 'Pending', 'Awaiting review')/
-
-INSERT INTO Application_Document (ID, Application_ID, Institution_ID, Document_Type, Document_File) VALUES (1, 1, 1, 'Transcript', 'transcript_1001.pdf')/
-INSERT INTO Application_Document (ID, Application_ID, Institution_ID, Document_Type, Document_File) VALUES (2, 1, NULL, 'Essay', 'essay_1001.pdf')/
-INSERT INTO Application_Document (ID, Application_ID, Institution_ID, Document_Type, Document_File) VALUES (3, 1, NULL, 'Recommendation', 'rec_1001_1.pdf')/
-INSERT INTO Application_Document (ID, Application_ID, Institution_ID, Document_Type, Document_File) VALUES (4, 2, 2, 'Transcript', 'transcript_1002.pdf')/
-INSERT INTO Application_Document (ID, Application_ID, Institution_ID, Document_Type, Document_File) VALUES (5, 2, NULL, 'English Test', 'det_1002.pdf')/
-"""
-
-def execute_query(sql: str):
+# New IDs come from one sequence per table, named <TABLE>_SEQ. With
+# ID_BLOCK_SIZE > 0 each worker reserves IDs in blocks so most inserts need no
+# ID round trip at all.
+ID_BLOCK_SIZE = settings.id_block_size
+id_allocator = IdAllocator(ID_BLOCK_SIZE)
+
+def sequence_for(oracle_table: str) -> str:
+    return f"{oracle_table}_SEQ"
+
+def allocate_ids(conn, oracle_table: str, count: int) -> list[int]:
+    if ID_BLOCK_SIZE > 0:
+        generation = table_versions.snapshot([RESETS])[0]
+        return id_allocator.allocate(conn, sequence_for(oracle_table), count, generation)
+    return fetch_sequence_values(conn, sequence_for(oracle_table), count)
+
+# Per-table version counters, bumped by every write. They are shared through a
+# small SQLite file so that with several worker processes a write in one worker
+# invalidates the cached results of all of them. RESETS counts database resets.
+RESETS = 'RESETS'
+if settings.shared_state_path == ":memory:":
+    table_versions = TableVersions([*ALLOWED_TABLES.values(), RESETS])
+else:
+    table_versions = SharedTableVersions(settings.shared_state_path, [*ALLOWED_TABLES.values(), RESETS])
+
+# Change events for the browsers subscribed to /api/changes, relayed between
+# worker processes through the same SQLite file as the table versions
+change_feed = ChangeFeed(None if settings.shared_state_path == ":memory:" else settings.shared_state_path)
+API_TABLES = {oracle_table: table for table, oracle_table in ALLOWED_TABLES.items()}
+
+QUERY_CACHE_SIZE = settings.query_cache_size
+query_cache = QueryCache(QUERY_CACHE_SIZE, table_versions)
+
+def tables_changed(tables) -> dict[str, int]:
+    bumped = table_versions.bump(tables)
+    query_cache.invalidate(tables)
+    return bumped
+
+# Optional in-process SQLite replica that answers the heavy analytic queries
+# locally instead of on the shared Oracle instance
+REPLICA_QUERIES = {'9', '10', '15', '16', '17', '18', '19'}
+replica = AnalyticReplica(table_versions) if settings.analytic_replica else None
+
+# In-process counts behind the status and outcome summaries (#8, #12, #17 and
+# the Program_Outcome_View and Applicant_Summary_View views), updated by delta
+aggregates = AggregateStore(table_versions) if settings.aggregate_store else None
+AGGREGATE_TABLES = {name: base_tables(sql, VIEW_TABLES, ALLOWED_TABLES.values()) for name, sql in AGGREGATE_SQL.items()}
+
+# The in-process copies every write is applied to
+table_copies = [copy for copy in (replica, aggregates) if copy is not None]
+
+IN_LIST_LIMIT = 1000
+
+def written_rows(conn, oracle_table: str, ids, rows: list[dict] | None = None) -> list[tuple]:
+    # The inserted or updated rows as TABLE_COLUMNS tuples. They are read back
+    # from Oracle so the copies hold exactly what was committed, including
+    # defaults, unless the endpoint already read them back itself.
+    columns = TABLE_COLUMNS[oracle_table]
+    if rows is not None:
+        return [tuple(row[c.lower()] for c in columns) for row in rows]
+    rows = []
     with conn.cursor() as cur:
-        cur.execute(sql)
+        for chunk in batches(ids, IN_LIST_LIMIT):
+            binds = ", ".join(f":{i + 1}" for i in range(len(chunk)))
+            cur.execute(f"SELECT {', '.join(columns)} FROM {oracle_table} WHERE ID IN ({binds})", chunk)
+            rows.extend(cur.fetchall())
+    return rows
+
+def record_write(conn, oracle_table: str, inserted_ids=(), deleted_ids=(), updated_ids=(),
+                 rows: list[dict] | None = None):
+    # Called after a successful commit. rows are the rows inserted, updated or
+    # deleted, each announced by its own change event; writes without them
+    # (bulk writes) are announced as an invalidation of the table. The copies
+    # apply updates as inserts that replace the row.
+    changed = [oracle_table]
+    if table_copies and (inserted_ids or updated_ids):
+        written = written_rows(conn, oracle_table, [*inserted_ids, *updated_ids], rows)
+        for copy in table_copies:
+            copy.apply_inserts(oracle_table, written)
+    if deleted_ids:
+        for copy in table_copies:
+            copy.apply_deletes(oracle_table, list(deleted_ids))
+        changed.extend(CASCADE_DELETES.get(oracle_table, ()))
+    bumped = tables_changed(changed)
+    for copy in table_copies:
+        copy.advance(bumped)
+    if rows is not None:
+        op = "insert" if inserted_ids else "update" if updated_ids else "delete"
+        for row in rows:
+            change_feed.publish(API_TABLES[oracle_table], op, row)
+    else:
+        change_feed.publish(API_TABLES[oracle_table], "invalidate")
+    for child in changed[1:]:
+        change_feed.publish(API_TABLES[child], "invalidate")
+
+def _output_type_handler(cursor, metadata):
+    # Convert dates to ISO strings inside the driver's fetch instead of testing
+    # every value in Python afterwards.
+    if metadata.type_code in (oracledb.DB_TYPE_DATE, oracledb.DB_TYPE_TIMESTAMP):
+        return cursor.var(metadata.type_code, arraysize=cursor.arraysize, outconverter=datetime.datetime.isoformat)
+
+def fetch_result(conn, sql: str, params=None, labels: Labels = Labels("")):
+    with conn.cursor() as cur:
+        start = time.perf_counter()
+        cur.execute(sql, params or {})
+        executed = time.perf_counter()
         columns = [desc[0].lower() for desc in cur.description]
         rows = cur.fetchall()
-        result = []
-        for row in rows:
-            row_dict = {}
-            for i, val in enumerate(row):
-                if isinstance(val, datetime.date):
-                    row_dict[columns[i]] = val.isoformat()
-                else:
-                    row_dict[columns[i]] = val
-            result.append(row_dict)
-        return result
+        record_statement(labels, sql, params, executed - start, time.perf_counter() - executed,
+                         len(rows), fetch_round_trips(cur, len(rows)))
+        return columns, rows
+
+async def fetch_result_async(conn, sql: str, params=None, labels: Labels = Labels("")):
+    with conn.cursor() as cur:
+        start = time.perf_counter()
+        await cur.execute(sql, params or {})
+        executed = time.perf_counter()
+        columns = [desc[0].lower() for desc in cur.description]
+        rows = await cur.fetchall()
+        record_statement(labels, sql, params, executed - start, time.perf_counter() - executed,
+                         len(rows), fetch_round_trips(cur, len(rows)))
+        return columns, rows
+
+# Conditional GET: a response's ETag is derived from the versions of the tables
+# it reads and the query string, so If-None-Match is answered without touching
+# Oracle. The snapshot is taken before the query runs, so a write racing with it
+# can only make the next revalidation miss, never serve stale data.
+def result_etag(tables, variant: str) -> str:
+    versions = table_versions.snapshot(tables)
+    key = f"{table_versions.epoch}|{','.join(sorted(tables))}|{versions}|{variant}"
+    return f'W/"{hashlib.sha256(key.encode()).hexdigest()[:24]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+def with_etag(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+def not_modified(etag: str) -> Response:
+    return with_etag(Response(status_code=304), etag)
+
+ResultShape = Literal["records", "columns"]
+
+def shape_result(columns, rows, shape: str):
+    if shape == "columns":
+        return {"columns": columns, "rows": rows}
+    return [dict(zip(columns, row)) for row in rows]
+
+def encode_cursor(table: str, last_id: int, sort: str = "id", order: str = "asc", last_value=None) -> str:
+    payload = {"t": table, "a": last_id}
+    if (sort, order) != ("id", "asc"):
+        payload.update(s=sort, o=order, v=last_value)
+    payload = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+def decode_cursor(table: str, cursor: str, sort: str = "id", order: str = "asc") -> tuple[int, object]:
+    # Returns the ID and sort column value of the last row of the previous page
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if payload["t"] != table:
+            raise ValueError("cursor belongs to another table")
+        if (payload.get("s", "id"), payload.get("o", "asc")) != (sort, order):
+            raise ValueError("cursor belongs to another sort order")
+        return int(payload["a"]), payload.get("v")
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+
+def query_validation_error(e: ValidationError, name: str | None = None) -> RequestValidationError:
+    return RequestValidationError([
+        {**error, "loc": ("query", name) if name else ("query", *error["loc"])}
+        for error in e.errors(include_url=False)
+    ])
+
+def body_validation_error(e: ValidationError) -> RequestValidationError:
+    return RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)])
+
+def validation_message(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors(include_url=False))
+
+# Table filters: <column>=value for equality, <column>__gte and <column>__lte
+# for ranges and <column>__prefix for strings, on the columns whitelisted in
+# FILTER_COLUMNS. Values are converted to the column's type and bound, and
+# parameters are applied in sorted order so equal filter sets share one SQL text.
+TABLE_PARAMS = {"limit", "after_id", "cursor", "include_total", "format", "shape", "sort", "order", "q"}
+FILTER_OPERATORS = {"": "=", "gte": ">=", "lte": "<=", "prefix": "LIKE"}
+FILTER_ADAPTERS = {t: TypeAdapter(t) for columns in FILTER_COLUMNS.values() for t in columns.values()}
+
+def like_prefix(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+def filter_value(name: str, value_type, value):
+    try:
+        return FILTER_ADAPTERS[value_type].validate_python(value)
+    except ValidationError as e:
+        raise query_validation_error(e, name)
+
+def table_filters(oracle_table: str, query_params, q: str | None) -> tuple[list[str], dict]:
+    columns = FILTER_COLUMNS[oracle_table]
+    clauses, binds = [], {}
+    for i, (name, value) in enumerate(sorted(query_params.multi_items())):
+        if name in TABLE_PARAMS:
+            continue
+        column, _, op = name.partition("__")
+        if column not in columns or op not in FILTER_OPERATORS or (op == "prefix" and columns[column] is not str):
+            raise HTTPException(status_code=400, detail=f"Unknown filter {name}; filterable columns: {', '.join(columns)}")
+        bind = f"{column}_{op or 'eq'}"
+        if bind in binds:
+            bind = f"{bind}_{i}"
+        if op == "prefix":
+            clauses.append(f"{column} LIKE :{bind} ESCAPE '\\'")
+            binds[bind] = like_prefix(value)
+        else:
+            clauses.append(f"{column} {FILTER_OPERATORS[op]} :{bind}")
+            binds[bind] = filter_value(name, columns[column], value)
+    if q:
+        if oracle_table not in SEARCH_COLUMNS:
+            raise HTTPException(status_code=400, detail="This table has no searchable columns")
+        matches = [f"LOWER({column}) LIKE :q ESCAPE '\\'" for column in SEARCH_COLUMNS[oracle_table]]
+        clauses.append(f"({' OR '.join(matches)})")
+        binds["q"] = like_prefix(q.lower())
+    return clauses, binds
+
+def order_by_clause(sort: str, order: str) -> str:
+    if sort == "id":
+        return f"ID {order.upper()}"
+    return f"{sort} {order.upper()} NULLS LAST, ID"
+
+def keyset_clause(sort: str, order: str, last_value) -> str:
+    # Rows that come after (last_value, after_id) in order_by_clause's order
+    if sort == "id":
+        return f"ID {'>' if order == 'asc' else '<'} :after_id"
+    if last_value is None:
+        return f"({sort} IS NULL AND ID > :after_id)"
+    op = ">" if order == "asc" else "<"
+    return f"({sort} {op} :after_value OR ({sort} = :after_value AND ID > :after_id) OR {sort} IS NULL)"
+
+def select_sql(oracle_table: str, clauses, order_by: str | None = None, limit: bool = False, select: str = "*") -> str:
+    sql = f"SELECT {select} FROM {oracle_table}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    if order_by:
+        sql += f" ORDER BY {order_by}"
+    if limit:
+        sql += " FETCH FIRST :limit ROWS ONLY"
+    return sql
+
+StreamFormat = Literal["json", "ndjson", "csv", "arrow", "parquet"]
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    **ARROW_MEDIA_TYPES,
+}
+
+async def _stream_rows(conn, cur, fmt: str, labels: Labels, params, execute_s: float):
+    fetch_s = serialize_s = 0.0
+    row_count = 0
+    try:
+        columns = [desc[0].lower() for desc in cur.description]
+        if fmt == "csv":
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(columns)
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        while True:
+            start = time.perf_counter()
+            rows = await cur.fetchmany()
+            fetched = time.perf_counter()
+            fetch_s += fetched - start
+            if not rows:
+                break
+            row_count += len(rows)
+            if fmt == "ndjson":
+                chunk = b"".join(orjson.dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+            else:
+                writer.writerows(rows)
+                chunk = buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+            serialize_s += time.perf_counter() - fetched
+            yield chunk
+    finally:
+        cur.close()
+        await async_pool.release(conn)
+        record_statement(labels, cur.statement, params, execute_s, fetch_s, row_count, fetch_round_trips(cur, row_count))
+        SERIALIZE_SECONDS.observe(serialize_s, labels)
+
+async def _stream_arrow(conn, batches, first, fmt: str, labels: Labels, sql: str, params, execute_s: float):
+    fetch_s = serialize_s = 0.0
+    row_count = 0
+    try:
+        table = to_arrow_table(first)
+        writer = ArrowWriter(fmt, table.schema)
+        while table is not None:
+            start = time.perf_counter()
+            chunk = writer.write(table)
+            serialize_s += time.perf_counter() - start
+            row_count += table.num_rows
+            if chunk:
+                yield chunk
+            start = time.perf_counter()
+            df = await anext(batches, None)
+            fetch_s += time.perf_counter() - start
+            table = to_arrow_table(df) if df is not None else None
+        yield writer.close()
+    finally:
+        await batches.aclose()
+        await async_pool.release(conn)
+        round_trips = 1 + math.ceil(max(row_count + 1 - STREAM_ARRAYSIZE, 0) / STREAM_ARRAYSIZE)
+        record_statement(labels, sql, params, execute_s, fetch_s, row_count, round_trips)
+        SERIALIZE_SECONDS.observe(serialize_s, labels)
+
+async def stream_arrow_query(sql: str, fmt: str, filename: str, labels: Labels, params=None):
+    # Rows are fetched straight into Arrow columns by python-oracledb's data
+    # frame API, one STREAM_ARRAYSIZE batch at a time, and written out as an
+    # Arrow IPC stream or Parquet without a Python object per cell.
+    if pyarrow is None:
+        raise HTTPException(status_code=501, detail=f"format={fmt} needs the pyarrow package")
+    conn = await acquire_async_conn()
+    batches = None
+    try:
+        conn.outputtypehandler = arrow_type_handler
+        start = time.perf_counter()
+        batches = conn.fetch_df_batches(sql, params or {}, size=STREAM_ARRAYSIZE)
+        first = await anext(batches, None)
+        if first is None:
+            # No rows means no batch to take the schema from
+            first = await conn.fetch_df_all(sql, params or {})
+        execute_s = time.perf_counter() - start
+    except BaseException:
+        if batches is not None:
+            await batches.aclose()
+        await async_pool.release(conn)
+        raise
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{ARROW_EXTENSIONS[fmt]}"'}
+    body = _stream_arrow(conn, batches, first, fmt, labels, sql, params, execute_s)
+    return StreamingResponse(body, media_type=STREAM_MEDIA_TYPES[fmt], headers=headers)
+
+async def stream_query(sql: str, fmt: str, filename: str, labels: Labels, params=None):
+    # The statement runs before the response starts so SQL errors still map to an
+    # error status; rows are then fetched one arraysize batch at a time.
+    if fmt in ARROW_FORMATS:
+        return await stream_arrow_query(sql, fmt, filename, labels, params)
+    conn = await acquire_async_conn()
+    try:
+        cur = conn.cursor()
+        cur.arraysize = STREAM_ARRAYSIZE
+        cur.prefetchrows = STREAM_ARRAYSIZE
+        start = time.perf_counter()
+        await cur.execute(sql, params or {})
+        execute_s = time.perf_counter() - start
+    except BaseException:
+        await async_pool.release(conn)
+        raise
+    headers = {}
+    if fmt == "csv":
+        headers["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+    body = _stream_rows(conn, cur, fmt, labels, params, execute_s)
+    return StreamingResponse(body, media_type=STREAM_MEDIA_TYPES[fmt], headers=headers)
 
 @app.get("/api/tables/{table}")
-def get_table(table: str):
+async def get_table(
+    request: Request,
+    table: str,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after_id: int | None = None,
+    cursor: str | None = None,
+    include_total: bool = False,
+    fmt: StreamFormat = Query("json", alias="format"),
+    shape: ResultShape = "records",
+    sort: str = Query("id", description="Column to sort by"),
+    order: Literal["asc", "desc"] = "asc",
+    q: str | None = Query(None, max_length=100, description="Case-insensitive prefix search over name and email columns"),
+):
     if table not in ALLOWED_TABLES:
         raise HTTPException(status_code=404, detail="Table not found")
     oracle_table = ALLOWED_TABLES[table]
-    sql = f"SELECT * FROM {oracle_table} ORDER BY ID"
-    return execute_query(sql)
+    labels = Labels("get_table", table)
+    paginated = limit is not None or after_id is not None or cursor is not None
+    if fmt != "json" and paginated:
+        raise HTTPException(status_code=400, detail=f"format={fmt} streams the whole table and cannot be paginated")
+    sort = sort.lower()
+    if sort not in FILTER_COLUMNS[oracle_table]:
+        raise HTTPException(status_code=400, detail=f"Cannot sort by {sort}; sortable columns: {', '.join(FILTER_COLUMNS[oracle_table])}")
+    if after_id is not None and sort != "id":
+        raise HTTPException(status_code=400, detail="after_id only applies to the default sort; use cursor")
+    clauses, binds = table_filters(oracle_table, request.query_params, q)
+    order_by = order_by_clause(sort, order)
+    etag = result_etag([oracle_table], request.url.query)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    if fmt != "json":
+        return with_etag(await stream_query(select_sql(oracle_table, clauses, order_by), fmt, table, labels, binds), etag)
+    if not paginated:
+        async with async_checkout() as conn:
+            columns, rows = await fetch_result_async(conn, select_sql(oracle_table, clauses, order_by), binds, labels)
+        with timed(SERIALIZE_SECONDS, labels):
+            response = ORJSONResponse(shape_result(columns, rows, shape))
+        return with_etag(response, etag)
+
+    # Keyset pagination: seek past the last row seen instead of using OFFSET
+    last_value = None
+    if cursor is not None:
+        after_id, last_value = decode_cursor(table, cursor, sort, order)
+    limit = limit or DEFAULT_PAGE_SIZE
+    params = {**binds, "limit": limit + 1}
+    page_clauses = clauses
+    if after_id is not None:
+        page_clauses = [*clauses, keyset_clause(sort, order, last_value)]
+        params["after_id"] = after_id
+        if last_value is not None and sort != "id":
+            params["after_value"] = filter_value("cursor", FILTER_COLUMNS[oracle_table][sort], last_value)
+    async with async_checkout() as conn:
+        columns, rows = await fetch_result_async(conn, select_sql(oracle_table, page_clauses, order_by, limit=True), params, labels)
+        if include_total:
+            _, count = await fetch_result_async(conn, select_sql(oracle_table, clauses, select="COUNT(*)"), binds, labels)
+            total = count[0][0]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_row = rows[-1]
+        next_cursor = encode_cursor(table, last_row[columns.index("id")], sort, order, last_row[columns.index(sort)])
+    if shape == "columns":
+        page = {"columns": columns, "rows": rows, "next_cursor": next_cursor}
+    else:
+        page = {"items": shape_result(columns, rows, shape), "next_cursor": next_cursor}
+    if include_total:
+        page["total"] = total
+    with timed(SERIALIZE_SECONDS, labels):
+        response = ORJSONResponse(page)
+    return with_etag(response, etag)
+
+def fetch_row(conn, oracle_table: str, row_id: int, labels: Labels, lock: bool = False) -> dict | None:
+    sql = f"SELECT * FROM {oracle_table} WHERE ID = :id" + (" FOR UPDATE" if lock else "")
+    columns, rows = fetch_result(conn, sql, {"id": row_id}, labels)
+    return dict(zip(columns, rows[0])) if rows else None
+
+def fetch_rows(conn, oracle_table: str, ids, labels: Labels, lock: bool = False) -> dict[int, dict]:
+    found = {}
+    for chunk in batches(list(ids), IN_LIST_LIMIT):
+        binds = ", ".join(f":{i + 1}" for i in range(len(chunk)))
+        sql = f"SELECT * FROM {oracle_table} WHERE ID IN ({binds})" + (" FOR UPDATE" if lock else "")
+        columns, rows = fetch_result(conn, sql, chunk, labels)
+        for values in rows:
+            row = dict(zip(columns, values))
+            found[row["id"]] = row
+    return found
+
+@functools.lru_cache(maxsize=1024)
+def insert_sql(oracle_table: str, keys: tuple, from_sequence: bool = False) -> str:
+    # Built once per table and column set. keys are validated column names in
+    # the model's order, so the same columns always give the same text and
+    # reuse one parsed cursor from the statement cache.
+    fields = ", ".join([k.upper() for k in keys])
+    placeholders = ", ".join([f":{k}" for k in keys])
+    id_expr = f"{sequence_for(oracle_table)}.NEXTVAL" if from_sequence else ":id"
+    sql = f"INSERT INTO {oracle_table} (ID, {fields}) VALUES ({id_expr}, {placeholders})"
+    return sql + " RETURNING ID INTO :new_id" if from_sequence else sql
+
+def batches(items, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
 
 @app.post("/api/tables/{table}")
 def insert_table(table: str, data: dict = Body()):
     if table not in ALLOWED_TABLES:
         raise HTTPException(status_code=404, detail="Table not found")
     oracle_table = ALLOWED_TABLES[table]
+    # Rows the schema's constraints would reject never reach the database
+    try:
+        data = validate_row(oracle_table, data)
+    except ValidationError as e:
+        raise body_validation_error(e)
+    if write_queue is not None:
+        return write_queue.submit(("insert", oracle_table, tuple(data)), data)
+    with checkout() as conn:
+        return insert_one(conn, oracle_table, data)
+
+def insert_one(conn, oracle_table: str, data: dict) -> dict:
+    labels = Labels("insert_table", API_TABLES[oracle_table])
+    with conn.cursor() as cur:
+        if ID_BLOCK_SIZE > 0:
+            new_id = allocate_ids(conn, oracle_table, 1)[0]
+            execute_statement(labels, cur, insert_sql(oracle_table, tuple(data)), {"id": new_id, **data})
+        else:
+            sql = insert_sql(oracle_table, tuple(data), from_sequence=True)
+            new_id_var = cur.var(int)
+            execute_statement(labels, cur, sql, {**data, "new_id": new_id_var})
+            new_id = new_id_var.getvalue()[0]
+        row = fetch_row(conn, oracle_table, new_id, labels)
+        conn.commit()
+    record_write(conn, oracle_table, inserted_ids=[new_id], rows=[row])
+    return row
+
+@app.post("/api/tables/{table}/bulk")
+def bulk_insert(table: str, rows: list[dict] = Body(), conn=Depends(get_conn)):
+    if table not in ALLOWED_TABLES:
+        raise HTTPException(status_code=404, detail="Table not found")
+    oracle_table = ALLOWED_TABLES[table]
+    if not rows:
+        return {"ids": [], "errors": []}
+    # Failed rows are reported by their index in the request, whether the
+    # model or the database rejected them
+    valid = {}
+    errors = []
+    for i, row in enumerate(rows):
+        try:
+            valid[i] = validate_row(oracle_table, row)
+        except ValidationError as e:
+            errors.append({"index": i, "error": validation_message(e)})
+    ids = [None] * len(rows)
+    if not valid:
+        return {"ids": ids, "errors": errors}
+    for i, new_id in zip(valid, allocate_ids(conn, oracle_table, len(valid))):
+        ids[i] = new_id
+
+    # executemany needs the same bind names in every row, so rows are grouped by
+    # their column set
+    groups = {}
+    for i, row in valid.items():
+        groups.setdefault(tuple(row), []).append(i)
+    labels = Labels("bulk_insert", table)
     with conn.cursor() as cur:
-        cur.execute(f"SELECT NVL(MAX(ID), 0) + 1 FROM {oracle_table}")
-        new_id = cur.fetchone()[0]
-    fields = ", ".join([k.upper() for k in data.keys()])
-    placeholders = ", ".join([f":{k}" for k in data.keys()])
-    sql = f"INSERT INTO {oracle_table} (ID, {fields}) VALUES (:id, {placeholders})"
-    bind_data = {"id": new_id, **data}
+        for keys, indexes in groups.items():
+            sql = insert_sql(oracle_table, keys)
+            for chunk in batches(indexes, BULK_BATCH_SIZE):
+                execute_many(labels, cur, sql, [{"id": ids[i], **valid[i]} for i in chunk], batcherrors=True)
+                for error in cur.getbatcherrors():
+                    i = chunk[error.offset]
+                    errors.append({"index": i, "error": error.message})
+                    ids[i] = None
+        conn.commit()
+    if any(i is not None for i in ids):
+        record_write(conn, oracle_table, inserted_ids=[i for i in ids if i is not None])
+    return {"ids": ids, "errors": sorted(errors, key=lambda e: e["index"])}
+
+@app.delete("/api/tables/{table}")
+def bulk_delete(
+    table: str,
+    ids: str | None = Query(None, description="Comma-separated IDs"),
+    body_ids: list[int] | None = Body(None, embed=True, alias="ids"),
+    conn=Depends(get_conn),
+):
+    if table not in ALLOWED_TABLES:
+        raise HTTPException(status_code=404, detail="Table not found")
+    oracle_table = ALLOWED_TABLES[table]
+    try:
+        row_ids = body_ids if body_ids is not None else [int(i) for i in (ids or "").split(",") if i.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    if not row_ids:
+        raise HTTPException(status_code=400, detail="No ids given")
+    sql = f"DELETE FROM {oracle_table} WHERE ID = :id"
+    deleted = []
+    missing = []
+    errors = []
+    labels = Labels("bulk_delete", table)
     with conn.cursor() as cur:
-        cur.execute(sql, bind_data)
+        for chunk in batches(row_ids, BULK_BATCH_SIZE):
+            execute_many(labels, cur, sql, [{"id": i} for i in chunk], batcherrors=True, arraydmlrowcounts=True)
+            failed = set()
+            for error in cur.getbatcherrors():
+                failed.add(error.offset)
+                errors.append({"id": chunk[error.offset], "error": error.message})
+            for offset, count in enumerate(cur.getarraydmlrowcounts()):
+                if count:
+                    deleted.append(chunk[offset])
+                elif offset not in failed:
+                    missing.append(chunk[offset])
         conn.commit()
-    return {"id": new_id}
+    if deleted:
+        record_write(conn, oracle_table, deleted_ids=deleted)
+    return {"deleted": len(deleted), "missing": missing, "errors": errors}
 
 @app.delete("/api/tables/{table}/{row_id}")
 def delete_row(table: str, row_id: int):
     if table not in ALLOWED_TABLES:
         raise HTTPException(status_code=404, detail="Table not found")
     oracle_table = ALLOWED_TABLES[table]
-    sql = f"DELETE FROM {oracle_table} WHERE ID = :id"
+    if write_queue is not None:
+        return write_queue.submit(("delete", oracle_table), row_id)
+    with checkout() as conn:
+        return delete_one(conn, oracle_table, row_id)
+
+def delete_one(conn, oracle_table: str, row_id: int) -> dict:
+    labels = Labels("delete_row", API_TABLES[oracle_table])
+    # The row is locked and read in the same transaction so the response and
+    # the change event carry exactly what was deleted
+    row = fetch_row(conn, oracle_table, row_id, labels, lock=True)
+    if row is None:
+        conn.rollback()
+        raise HTTPException(status_code=404, detail="Row not found")
     with conn.cursor() as cur:
-        cur.execute(sql, {"id": row_id})
+        execute_statement(labels, cur, f"DELETE FROM {oracle_table} WHERE ID = :id", {"id": row_id})
         conn.commit()
-    return {"status": "deleted"}
+    record_write(conn, oracle_table, deleted_ids=[row_id], rows=[row])
+    return row
+
+def insert_batch(conn, oracle_table: str, keys: tuple, rows: list[dict]) -> list:
+    # Queued inserts with the same columns: one executemany, one read-back
+    # and one commit. Rows the database rejects get their error as a 400.
+    labels = Labels("insert_table", API_TABLES[oracle_table])
+    ids = allocate_ids(conn, oracle_table, len(rows))
+    results = [None] * len(rows)
+    with conn.cursor() as cur:
+        binds = [{"id": row_id, **row} for row_id, row in zip(ids, rows)]
+        execute_many(labels, cur, insert_sql(oracle_table, keys), binds, batcherrors=True)
+        for error in cur.getbatcherrors():
+            results[error.offset] = HTTPException(status_code=400, detail=error.message)
+    inserted = [row_id for row_id, result in zip(ids, results) if result is None]
+    stored = fetch_rows(conn, oracle_table, inserted, labels) if inserted else {}
+    conn.commit()
+    if inserted:
+        record_write(conn, oracle_table, inserted_ids=inserted, rows=[stored[i] for i in inserted])
+    return [stored[row_id] if result is None else result for row_id, result in zip(ids, results)]
+
+def delete_batch(conn, oracle_table: str, ids: list[int]) -> list:
+    # Queued deletes from one table, locked and read in one statement and
+    # deleted with one executemany and one commit. An ID queued twice is
+    # deleted once; the second request sees it missing.
+    labels = Labels("delete_row", API_TABLES[oracle_table])
+    found = fetch_rows(conn, oracle_table, set(ids), labels, lock=True)
+    results = [HTTPException(status_code=404, detail="Row not found") for _ in ids]
+    positions = {}
+    for position, row_id in enumerate(ids):
+        if row_id in found and row_id not in positions:
+            positions[row_id] = position
+            results[position] = found[row_id]
+    if positions:
+        with conn.cursor() as cur:
+            binds = [{"id": row_id} for row_id in positions]
+            execute_many(labels, cur, f"DELETE FROM {oracle_table} WHERE ID = :id", binds, batcherrors=True)
+            for error in cur.getbatcherrors():
+                results[positions[binds[error.offset]["id"]]] = HTTPException(status_code=400, detail=error.message)
+    conn.commit()
+    deleted = [row_id for row_id, position in positions.items() if isinstance(results[position], dict)]
+    if deleted:
+        record_write(conn, oracle_table, deleted_ids=deleted, rows=[found[i] for i in deleted])
+    return results
+
+def flush_writes(key: tuple, items: list) -> list:
+    op, oracle_table = key[:2]
+    WRITE_BATCH_ROWS.observe(len(items), (op, API_TABLES[oracle_table]))
+    with checkout() as conn:
+        if op == "insert":
+            return insert_batch(conn, oracle_table, key[2], items)
+        return delete_batch(conn, oracle_table, items)
+
+# Optional group commit: concurrent single-row inserts and deletes are queued
+# per table for up to WRITE_QUEUE_WINDOW_MS and written in batches
+write_queue = None
+if settings.write_queue:
+    write_queue = WriteQueue(flush_writes, settings.write_queue_window_ms / 1000, settings.write_queue_batch_size)
+
+# Document files, stored by content hash; the row records the digest and size
+document_store = DocumentStore(settings.document_store_path, settings.document_max_bytes)
+
+def attach_document_file(row_id: int, digest: str, size: int) -> dict | None:
+    labels = Labels("put_document_file", "application_documents")
+    sql = "UPDATE APPLICATION_DOCUMENT SET Document_SHA256 = :digest, Document_Size = :size_bytes WHERE ID = :id"
+    with checkout() as conn:
+        with conn.cursor() as cur:
+            execute_statement(labels, cur, sql, {"digest": digest, "size_bytes": size, "id": row_id})
+            if cur.rowcount == 0:
+                conn.rollback()
+                return None
+            row = fetch_row(conn, 'APPLICATION_DOCUMENT', row_id, labels)
+            conn.commit()
+        record_write(conn, 'APPLICATION_DOCUMENT', updated_ids=[row_id], rows=[row])
+    return row
+
+@app.put("/api/application_documents/{row_id}/file")
+async def put_document_file(request: Request, row_id: int):
+    # The request body is the file, streamed to disk as it arrives. Replacing
+    # a file only changes the row; the old content stays until a sweep.
+    labels = Labels("put_document_file", "application_documents")
+    length = request.headers.get("content-length")
+    if length is not None and length.isdigit() and int(length) > document_store.max_bytes:
+        raise HTTPException(status_code=413, detail=f"Files are limited to {document_store.max_bytes} bytes")
+    # Checked first so a missing row does not cost the upload
+    sql = "SELECT ID FROM APPLICATION_DOCUMENT WHERE ID = :id"
+    async with async_checkout() as conn:
+        _, rows = await fetch_result_async(conn, sql, {"id": row_id}, labels)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Row not found")
+    try:
+        digest, size = await document_store.save(request.stream())
+    except DocumentTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    row = await asyncio.to_thread(attach_document_file, row_id, digest, size)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Row not found")
+    return row
+
+@app.api_route("/api/application_documents/{row_id}/file", methods=["GET", "HEAD"])
+async def get_document_file(request: Request, row_id: int):
+    # Served from disk with range support; the content digest is the ETag
+    labels = Labels("get_document_file", "application_documents")
+    sql = "SELECT Document_File, Document_SHA256 FROM APPLICATION_DOCUMENT WHERE ID = :id"
+    async with async_checkout() as conn:
+        _, rows = await fetch_result_async(conn, sql, {"id": row_id}, labels)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Row not found")
+    filename, digest = rows[0]
+    if digest is None:
+        raise HTTPException(status_code=404, detail="No file has been uploaded for this document")
+    etag = f'"{digest}"'
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    path = document_store.path(digest)
+    try:
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="The document's file is missing from the document store")
+    media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=filename, stat_result=stat_result,
+                        headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+async def run_prepared_query(labels: Labels, sql: str, params=None):
+    if aggregates is not None and labels.query in AGGREGATE_QUERIES:
+        if aggregates.is_current(QUERY_TABLES[labels.query]):
+            with timed(STATEMENT_SECONDS, (*labels, "aggregate")):
+                return aggregates.result(labels.query)
+        aggregates.refresh_in_background(checkout)
+    if replica is not None and labels.query in REPLICA_QUERIES:
+        if replica.is_current(QUERY_TABLES[labels.query]):
+            with timed(STATEMENT_SECONDS, (*labels, "replica")):
+                result = await asyncio.to_thread(replica.fetch, sql, params)
+            if result is not None:
+                return result
+        else:
+            replica.refresh_in_background(checkout)
+    async with async_checkout() as conn:
+        return await fetch_result_async(conn, sql, params, labels)
+
+def query_binds(query_key: str, query_params) -> dict:
+    # Bind values for a parameterized query, validated from the query string.
+    # The SQL text never changes, so every value reuses one parsed cursor.
+    model = QUERY_PARAMETERS.get(query_key)
+    if model is None:
+        return {}
+    values = {name: query_params[name] for name in model.model_fields if name in query_params}
+    try:
+        return model(**values).model_dump()
+    except ValidationError as e:
+        raise query_validation_error(e)
+
+async def cached_prepared_query(labels: Labels, binds: dict):
+    # A connection is only checked out on a cache miss
+    query_key = labels.query
+    tables = QUERY_TABLES[query_key]
+    cache_key = (query_key, *sorted(binds.items()))
+    result = query_cache.get(cache_key, tables)
+    if result is None:
+        snapshot = table_versions.snapshot(tables)
+        result = await run_prepared_query(labels, PREPARED_QUERIES[query_key], binds)
+        query_cache.put(cache_key, tables, snapshot, result)
+    return result
+
+@app.get("/api/prepared-queries")
+async def get_prepared_queries(
+    request: Request,
+    keys: str = Query(description="Comma-separated query keys, e.g. 8,12,17"),
+    shape: ResultShape = "records",
+):
+    # Each query runs on its own pooled connection at the same time, so the
+    # whole batch takes about as long as its slowest query. Query string
+    # parameters apply to every query that declares them.
+    query_keys = list(dict.fromkeys(k.strip() for k in keys.split(",") if k.strip()))
+    if not query_keys:
+        raise HTTPException(status_code=400, detail="No query keys given")
+    unknown = [k for k in query_keys if k not in PREPARED_QUERIES]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Query not found: {', '.join(unknown)}")
+    binds = {k: query_binds(k, request.query_params) for k in query_keys}
+    etag = result_etag(set().union(*(QUERY_TABLES[k] for k in query_keys)), request.url.query)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    results = await asyncio.gather(*(cached_prepared_query(Labels("get_prepared_queries", query=k), binds[k]) for k in query_keys))
+    with timed(SERIALIZE_SECONDS, Labels("get_prepared_queries")):
+        response = ORJSONResponse({k: shape_result(columns, rows, shape) for k, (columns, rows) in zip(query_keys, results)})
+    return with_etag(response, etag)
 
 @app.get("/api/prepared-queries/{query_key}")
-def get_prepared_query(query_key: str):
+async def get_prepared_query(
+    request: Request,
+    query_key: str,
+    fmt: StreamFormat = Query("json", alias="format"),
+    shape: ResultShape = "records",
+):
     if query_key not in PREPARED_QUERIES:
         raise HTTPException(status_code=404, detail="Query not found")
-    sql = PREPARED_QUERIES[query_key]
-    return execute_query(sql)
+    binds = query_binds(query_key, request.query_params)
+    labels = Labels("get_prepared_query", query=query_key)
+    etag = result_etag(QUERY_TABLES[query_key], f"{query_key}?{request.url.query}")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    if fmt != "json":
+        return with_etag(await stream_query(PREPARED_QUERIES[query_key], fmt, f"query_{query_key}", labels, binds), etag)
+    columns, rows = await cached_prepared_query(labels, binds)
+    with timed(SERIALIZE_SECONDS, labels):
+        response = ORJSONResponse(shape_result(columns, rows, shape))
+    return with_etag(response, etag)
 
-@app.post("/api/reset")
-def reset_db():
-    blocks = [block.strip() for block in RESET_SCRIPT.split('/') if block.strip()]
+# Reset: the whole RESET_SCRIPT runs as a single PL/SQL block, and when the
+# stored schema version already matches only the data is truncated and reseeded.
+SCHEMA_VERSION = hashlib.sha256(RESET_SCRIPT.encode()).hexdigest()[:16]
+
+# Delimiters for q-quoted literals, tried in turn: a statement must not
+# contain the closing delimiter followed by a quote
+Q_QUOTE_DELIMITERS = ("[]", "{}", "<>", "()", "!!", "##", "||", "~~")
+
+def q_quote(text: str) -> str:
+    for opening, closing in Q_QUOTE_DELIMITERS:
+        if closing + "'" not in text:
+            return f"q'{opening}{text}{closing}'"
+    raise ValueError(f"No q-quote delimiter fits the statement: {text}")
+
+def script_block(script: str) -> str:
+    parts = []
+    for stmt in script_statements(script):
+        if stmt.upper().startswith(("BEGIN", "DECLARE")):
+            parts.append(stmt)
+        else:
+            parts.append(f"EXECUTE IMMEDIATE {q_quote(stmt)};")
+    return "BEGIN\n" + "\n".join(parts) + "\nEND;"
+
+def truncate_block(oracle_tables) -> str:
+    names = ", ".join(f"'{t}'" for t in oracle_tables)
+    truncates = "\n".join(f"    EXECUTE IMMEDIATE 'TRUNCATE TABLE {t}';" for t in oracle_tables)
+    return f"""
+BEGIN
+    FOR c IN (SELECT table_name, constraint_name FROM user_constraints
+              WHERE constraint_type = 'R' AND table_name IN ({names})) LOOP
+        EXECUTE IMMEDIATE 'ALTER TABLE ' || c.table_name || ' DISABLE CONSTRAINT ' || c.constraint_name;
+    END LOOP;
+{truncates}
+    FOR c IN (SELECT table_name, constraint_name FROM user_constraints
+              WHERE constraint_type = 'R' AND table_name IN ({names})) LOOP
+        EXECUTE IMMEDIATE 'ALTER TABLE ' || c.table_name || ' ENABLE CONSTRAINT ' || c.constraint_name;
+    END LOOP;
+END;"""
+
+def sync_sequences_block(oracle_tables) -> str:
+    # Oracle 12c has no ALTER SEQUENCE ... RESTART, so sequences are recreated
+    # to start after the highest seeded ID.
+    steps = "\n".join(
+        f"    SELECT NVL(MAX(ID), 0) + 1 INTO next_id FROM {t};\n"
+        f"    EXECUTE IMMEDIATE 'DROP SEQUENCE {sequence_for(t)}';\n"
+        f"    EXECUTE IMMEDIATE 'CREATE SEQUENCE {sequence_for(t)} START WITH ' || next_id;"
+        for t in oracle_tables
+    )
+    return f"DECLARE\n    next_id NUMBER;\nBEGIN\n{steps}\nEND;"
+
+RESET_BLOCK = script_block(RESET_SCRIPT)
+TRUNCATE_BLOCK = truncate_block(list(SEED_DATA)[::-1])
+SYNC_SEQUENCES_BLOCK = sync_sequences_block(list(SEED_DATA))
+
+def installed_schema_version(conn):
     with conn.cursor() as cur:
-        for block in blocks:
-            print(f"Executing block:\n{block}\n")
-            cur.execute(block)
+        try:
+            cur.execute("SELECT MAX(Version) FROM Schema_Version")
+        except oracledb.DatabaseError:
+            return None
+        return cur.fetchone()[0]
+
+def seed_tables(conn, data):
+    with conn.cursor() as cur:
+        for oracle_table, (columns, rows) in data.items():
+            placeholders = ", ".join(f":{i + 1}" for i in range(len(columns)))
+            sql = f"INSERT INTO {oracle_table} ({', '.join(columns)}) VALUES ({placeholders})"
+            for chunk in batches(rows, BULK_BATCH_SIZE):
+                execute_many(Labels("reset", API_TABLES[oracle_table]), cur, sql, chunk)
         conn.commit()
-    return {"status": "reset"}
-
-@app.get("/")
-def root():
-    html = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Database App</title>
-    <link href="https://cdn.jsdelivr.net/npm/@mdi/font@latest/css/materialdesignicons.min.css" rel="stylesheet">
-    <link href="https://cdn.jsdelivr.net/npm/vuetify@3/dist/vuetify.min.css" rel="stylesheet">
-    <script src="https://unpkg.com/vue@3/dist/vue.global.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/vuetify@3/dist/vuetify.min.js"></script>
-</head>
-<body>
-    <div id="app">
-        <v-app>
-            <v-navigation-drawer app>
-                <v-list>
-                    <v-list-item
-                        v-for="section in sections"
-                        :key="section"
-                        :title="section"
-                        @click="selected = section"
-                    ></v-list-item>
-                    <v-list-item @click="resetDatabase">Reset Database</v-list-item>
-                </v-list>
-            </v-navigation-drawer>
-            <v-main>
-                <div v-if="selected !== 'Prepared Queries'">
-                    <v-btn @click="addRow">Add Row</v-btn>
-                    <v-data-table :headers="headers" :items="tableData" :items-per-page="-1">
-                        <template v-slot:item.actions="{ item }">
-                            <v-btn icon @click="deleteRow(item.id)">
-                                <v-icon>mdi-delete</v-icon>
-                            </v-btn>
-                        </template>
-                    </v-data-table>
-                    <v-dialog v-model="showAdd" max-width="500">
-                        <v-card>
-                            <v-card-title>Add New Row</v-card-title>
-                            <v-card-text>
-                                <v-text-field
-                                    v-for="field in fields"
-                                    :key="field"
-                                    v-model="newRow[field]"
-                                    :label="field.toUpperCase()"
-                                ></v-text-field>
-                            </v-card-text>
-                            <v-card-actions>
-                                <v-btn color="primary" @click="submitAdd">Save</v-btn>
-                                <v-btn @click="showAdd = false">Cancel</v-btn>
-                            </v-card-actions>
-                        </v-card>
-                    </v-dialog>
-                </div>
-                <div v-else>
-                    <v-select
-                        v-model="selectedQuery"
-                        :items="queries"
-                        item-title="title"
-                        item-value="value"
-                        label="Select Query"
-                    ></v-select>
-                    <v-data-table
-                        v-if="queryData.length > 0"
-                        :headers="queryHeaders"
-                        :items="queryData"
-                        :items-per-page="-1"
-                    ></v-data-table>
-                </div>
-            </v-main>
-        </v-app>
-    </div>
-    <script>
-        const { createApp } = Vue;
-        const { createVuetify } = Vuetify;
-
-        const vuetify = createVuetify();
-
-        createApp({
-            data() {
-                return {
-                    sections: ['Institutions', 'Programs', 'Applicants', 'Applications', 'Application Documents', 'Prepared Queries'],
-                    selected: 'Institutions',
-                    tableData: [],
-                    headers: [],
-                    showAdd: false,
-                    fields: [],
-                    newRow: {},
-                    selectedQuery: null,
-                    queryData: [],
-                    queryHeaders: [],
-                    tableMap: {
-                        'Institutions': 'institutions',
-                        'Programs': 'programs',
-                        'Applicants': 'applicants',
-                        'Applications': 'applications',
-                        'Application Documents': 'application_documents'
-                    },
-                    fieldMap: {
-                        'Institutions': ['name', 'city', 'state_province', 'country', 'accreditation_status'],
-                        'Programs': ['name', 'minimum_gpa', 'duration_years', 'enrollment_status'],
-                        'Applicants': ['first_name', 'last_name', 'date_of_birth', 'email', 'institution_id', 'gpa'],
-                        'Applications': ['applicant_id', 'program_id', 'submission_date', 'status', 'decision_date', 'outcome', 'outcome_notes'],
-                        'Application Documents': ['application_id', 'institution_id', 'document_type', 'document_file']
-                    },
-                    queries: [
-                        { title: 'List all institution names and their accreditation status, ordered by name', value: '1' },
-                        { title: 'List all open programs sorted alphabetically', value: '2' },
-                        { title: 'List applicants names and GPAs, ordered by GPA descending', value: '3' },
-                        { title: 'List all applications ordered by submission date', value: '4' },
-                        { title: 'List all documents submitted, ordered by application ID', value: '5' },
-                        { title: 'List all programs with a minimum GPA of at least 3.5, from highest to lowest', value: '6' },
-                        { title: 'List applicants with GPA above the average GPA, ordered by GPA descending', value: '7' },
-                        { title: 'Count of applications by status, ordered by count descending', value: '8' },
-                        { title: 'Calculate average, min, max GPAs per institution, including standard deviation', value: '9' },
-                        { title: 'Display programs where applicant GPA > program average GPA', value: '10' },
-                        { title: 'Show applicants without a submitted transcript', value: '11' },
-                        { title: 'Show all programs with at least one accepted applicant', value: '12' },
-                        { title: 'Display all pending/waitlisted applicants for open programs', value: '13' },
-                        { title: 'Show all applicants accepted to Computer Science but not Business Admin', value: '14' },
-                        { title: 'Compare applicants average GPA to the programs average GPA', value: '15' },
-                        { title: 'Display all submitted documents and programs of accepted applicants', value: '16' },
-                        { title: 'Program Acceptance Rate and Average GPA', value: '17' },
-                        { title: 'Show average amount of documents per applicant, per institution', value: '18' },
-                        { title: 'Display applicants with high GPAs and pending applications', value: '19' }
-                    ]
-                };
-            },
-            watch: {
-                selected: 'fetchData',
-                selectedQuery: 'fetchQueryData'
-            },
-            methods: {
-                async fetchData() {
-                    if (this.selected === 'Prepared Queries') return;
-                    const table = this.tableMap[this.selected];
-                    const res = await fetch(`/api/tables/${table}`);
-                    this.tableData = await res.json();
-                    if (this.tableData.length > 0) {
-                        this.headers = Object.keys(this.tableData[0]).map(key => ({ title: key.toUpperCase(), key }));
-                    }
-                    this.headers.push({ title: 'ACTIONS', key: 'actions', sortable: false });
-                },
-                addRow() {
-                    this.fields = this.fieldMap[this.selected];
-                    this.newRow = {};
-                    this.showAdd = true;
-                },
-                async submitAdd() {
-                    const table = this.tableMap[this.selected];
-                    await fetch(`/api/tables/${table}`, {
-                        method: 'POST',
-                        headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify(this.newRow)
-                    });
-                    this.showAdd = false;
-                    this.fetchData();
-                },
-                async deleteRow(id) {
-                    const table = this.tableMap[this.selected];
-                    await fetch(`/api/tables/${table}/${id}`, { method: 'DELETE' });
-                    this.fetchData();
-                },
-                async fetchQueryData() {
-                    if (!this.selectedQuery) return;
-                    const res = await fetch(`/api/prepared-queries/${this.selectedQuery}`);
-                    this.queryData = await res.json();
-                    if (this.queryData.length > 0) {
-                        this.queryHeaders = Object.keys(this.queryData[0]).map(key => ({ title: key.toUpperCase(), key }));
-                    }
-                },
-                async resetDatabase() {
-                    await fetch('/api/reset', { method: 'POST' });
-                    this.fetchData();
-                    this.queryData = [];
-                    this.selectedQuery = null;
-                }
-            },
-            mounted() {
-                this.fetchData();
-            }
-        }).use(vuetify).mount('#app');
-    </script>
-</body>
-</html>
-    """
-    return HTMLResponse(content=html)
+        execute_statement(Labels("reset"), cur, SYNC_SEQUENCES_BLOCK)
+
+def reset_schema(conn, data, rebuild: bool = False) -> str:
+    mode = "truncate"
+    versions_before = table_versions.as_dict()
+    labels = Labels("reset")
+    with conn.cursor() as cur:
+        if rebuild or installed_schema_version(conn) != SCHEMA_VERSION:
+            mode = "rebuild"
+            execute_statement(labels, cur, RESET_BLOCK)
+            execute_statement(labels, cur, "INSERT INTO Schema_Version (Version) VALUES (:version)", {"version": SCHEMA_VERSION})
+        else:
+            execute_statement(labels, cur, TRUNCATE_BLOCK)
+    seed_tables(conn, data)
+    for copy in table_copies:
+        copy.load(data, versions_before)
+    id_allocator.reset()
+    bumped = tables_changed([*ALLOWED_TABLES.values(), RESETS])
+    for copy in table_copies:
+        copy.advance(bumped)
+    change_feed.publish(None, "invalidate")
+    return mode
+
+@app.post("/api/reset")
+def reset_db(rebuild: bool = False, conn=Depends(get_conn)):
+    mode = reset_schema(conn, SEED_DATA, rebuild)
+    return {"status": "reset", "mode": mode, "schema_version": SCHEMA_VERSION}
+
+FEED_KEEPALIVE_S = 15
+
+@app.get("/api/changes")
+async def change_events(
+    request: Request,
+    tables: str | None = Query(None, description="Comma-separated tables to follow; all when omitted"),
+):
+    # Server-sent events, one per write: {"table", "op", "row"} with op insert
+    # or delete and the full row, or op invalidate with no row when a whole
+    # table changed (bulk writes, cascades). table is null after a reset,
+    # meaning every table. Browsers reconnect with Last-Event-ID and get the
+    # events they missed.
+    wanted = None
+    if tables:
+        wanted = {t.strip() for t in tables.split(",") if t.strip()}
+        unknown = wanted - ALLOWED_TABLES.keys()
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Table not found: {', '.join(sorted(unknown))}")
+    last_event_id = request.headers.get("last-event-id", "")
+    queue = change_feed.subscribe(int(last_event_id) if last_event_id.isdigit() else None)
+
+    async def events():
+        try:
+            yield b"retry: 2000\n\n"
+            while True:
+                try:
+                    seq, event = await asyncio.wait_for(queue.get(), FEED_KEEPALIVE_S)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if wanted is None or event["table"] is None or event["table"] in wanted:
+                    yield b"id: %d\ndata: %b\n\n" % (seq, orjson.dumps(event, default=str))
+        finally:
+            change_feed.unsubscribe(queue)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+@app.get("/api/pool")
+def pool_stats():
+    if pool is None:
+        return {"opened": 0}
+    stats = {
+        "opened": pool.opened,
+        "busy": pool.busy,
+        "min": pool.min,
+        "max": pool.max,
+        "increment": pool.increment,
+        "wait_timeout_ms": pool.wait_timeout,
+        "ping_interval_s": pool.ping_interval,
+        "stmtcachesize": pool.stmtcachesize,
+    }
+    if async_pool is not None:
+        stats["async"] = {"opened": async_pool.opened, "busy": async_pool.busy, "max": async_pool.max}
+    return stats
+
+@app.get("/api/id-allocator")
+def id_allocator_stats():
+    return id_allocator.stats()
+
+@app.get("/api/replica")
+def replica_stats():
+    if replica is None:
+        return {"enabled": False}
+    return {"enabled": True, **replica.stats()}
+
+@app.post("/api/replica/refresh")
+def refresh_replica(conn=Depends(get_conn)):
+    if replica is None:
+        raise HTTPException(status_code=404, detail="Analytic replica is disabled")
+    replica.snapshot(conn)
+    replica.advance(tables_changed(ALLOWED_TABLES.values()))
+    return {"enabled": True, **replica.stats()}
+
+@app.get("/api/aggregates")
+def aggregate_stats():
+    if aggregates is None:
+        return {"enabled": False}
+    return {"enabled": True, **aggregates.stats()}
+
+@app.get("/api/aggregates/{name}")
+async def get_aggregate(request: Request, name: str, shape: ResultShape = "records"):
+    # The summary views, answered like the prepared queries #8, #12 and #17:
+    # from the aggregate store while it is current, otherwise from Oracle
+    if name not in AGGREGATE_SQL:
+        raise HTTPException(status_code=404, detail=f"Unknown aggregate; available: {', '.join(AGGREGATE_SQL)}")
+    labels = Labels("get_aggregate", query=name)
+    tables = AGGREGATE_TABLES[name]
+    etag = result_etag(tables, f"{name}?{request.url.query}")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    if aggregates is not None and aggregates.is_current(tables):
+        with timed(STATEMENT_SECONDS, (*labels, "aggregate")):
+            columns, rows = aggregates.result(name)
+    else:
+        if aggregates is not None:
+            aggregates.refresh_in_background(checkout)
+        async with async_checkout() as conn:
+            columns, rows = await fetch_result_async(conn, AGGREGATE_SQL[name], None, labels)
+    with timed(SERIALIZE_SECONDS, labels):
+        response = ORJSONResponse(shape_result(columns, rows, shape))
+    return with_etag(response, etag)
+
+@app.post("/api/aggregates/check")
+def check_aggregates(conn=Depends(get_conn)):
+    # Reconciles the store with Oracle: every result is recomputed there and
+    # compared, and the store is reloaded if any differs
+    if aggregates is None:
+        raise HTTPException(status_code=404, detail="Aggregate store is disabled")
+    return {**aggregates.check(conn), **aggregates.stats()}
+
+@app.get("/api/write-queue")
+def write_queue_stats():
+    if write_queue is None:
+        return {"enabled": False}
+    return {"enabled": True, **write_queue.stats()}
+
+@app.get("/api/document-store")
+def document_store_stats():
+    return document_store.stats()
+
+@app.post("/api/document-store/sweep")
+def sweep_document_store(conn=Depends(get_conn)):
+    # Removes stored files that no row refers to, once they are an hour old
+    labels = Labels("sweep_document_store", "application_documents")
+    sql = "SELECT DISTINCT Document_SHA256 FROM APPLICATION_DOCUMENT WHERE Document_SHA256 IS NOT NULL"
+    _, rows = fetch_result(conn, sql, None, labels)
+    return {**document_store.sweep({digest for (digest,) in rows}), **document_store.stats()}
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/cache")
+def cache_stats():
+    return {**query_cache.stats(), "table_versions": table_versions.as_dict(), "change_feed": change_feed.stats()}
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+def asset_response(request: Request, asset, cache_control: str) -> Response:
+    headers = {"ETag": asset.etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if etag_matches(request, asset.etag):
+        return Response(status_code=304, headers=headers)
+    encoding, body = asset.negotiate(request.headers.get("accept-encoding", ""))
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type=asset.media_type, headers=headers)
+
+@app.get("/static/{path:path}", include_in_schema=False)
+def static_file(request: Request, path: str):
+    # Every URL carries its content hash, so it can be cached for good
+    asset = static_assets.by_url.get(f"/static/{path}")
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return asset_response(request, asset, IMMUTABLE)
+
+@app.get("/", include_in_schema=False)
+def root(request: Request):
+    if not settings.serve_front_end:
+        raise HTTPException(status_code=404, detail="Not found")
+    if static_assets.index is None:
+        static_assets.build()
+    return asset_response(request, static_assets.index, "no-cache")
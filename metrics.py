@@ -0,0 +1,127 @@
+import math
+import struct
+import hashlib
+import threading
+import functools
+from typing import NamedTuple
+
+# Seconds; spans a fast indexed lookup up to a full reset
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ROW_BUCKETS = (0, 1, 10, 50, 100, 1000, 10000, 100000, 1000000)
+
+_SQL_ID_ALPHABET = "0123456789abcdfghjkmnpqrstuvwxyz"
+
+
+class Labels(NamedTuple):
+    # What a statement was run for: the endpoint function, the API table name
+    # and the prepared-query key, empty when they do not apply.
+    endpoint: str
+    table: str = ""
+    query: str = ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, labels=(), amount: float = 1):
+        with self._lock:
+            self._values[tuple(labels)] = self._values.get(tuple(labels), 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._lock = threading.Lock()
+        # labels -> [per-bucket counts, sum, count]
+        self._series = {}
+
+    def observe(self, value: float, labels=()):
+        labels = tuple(labels)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = f'le="{_format_number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_number(total)}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        # Prometheus text exposition format, version 0.0.4
+        return "\n".join(line for metric in self._metrics for line in metric.render()) + "\n"
+
+
+@functools.lru_cache(maxsize=1024)
+def sql_id(sql: str) -> str:
+    # The SQL_ID Oracle shows in V$SQL for this exact statement text: the last
+    # 8 bytes of the MD5 of the text (plus a NUL), in Oracle's base 32.
+    digest = hashlib.md5(sql.encode() + b"\x00").digest()
+    high, low = struct.unpack("<II", digest[8:16])
+    value = (high << 32) | low
+    chars = []
+    for _ in range(13):
+        value, digit = divmod(value, 32)
+        chars.append(_SQL_ID_ALPHABET[digit])
+    return "".join(reversed(chars))
@@ -0,0 +1,211 @@
+import re
+import datetime
+from decimal import Decimal
+from typing import Annotated, ClassVar, Literal
+
+from pydantic import AfterValidator, BaseModel, BeforeValidator, ConfigDict, Field, ValidationError, create_model, model_validator
+from pydantic_core import InitErrorDetails, PydanticCustomError
+
+from schema import ALLOWED_TABLES, RESET_SCRIPT, script_statements
+
+# Request models for inserts, one per table, generated from the CREATE TABLE
+# statements in RESET_SCRIPT: column types and sizes, NOT NULLs, defaults and
+# the single-column CHECKs (IN lists, BETWEEN, > n). The multi-column
+# constraints and the not-in-the-future rules behind the virtual columns are
+# mirrored by hand in TABLE_RULES below. IDs come from the sequences and the
+# virtual columns are computed, so neither can be given.
+
+_CREATE_TABLE = re.compile(r"^CREATE\s+TABLE\s+(\w+)\s*\((.*)\)\s*$", re.IGNORECASE | re.DOTALL)
+_COLUMN = re.compile(r"^(\w+)\s+(VARCHAR2\((\d+)\)|NUMBER\((\d+),\s*(\d+)\)|DATE)(?!\w)(.*)$", re.IGNORECASE | re.DOTALL)
+_DEFAULT = re.compile(r"\bDEFAULT\s+(?:'([^']*)'|(\w+))", re.IGNORECASE)
+_CHECK_IN = re.compile(r"\bCHECK\s*\(\s*\w+\s+IN\s*\(([^)]*)\)\s*\)", re.IGNORECASE)
+_CHECK_BETWEEN = re.compile(r"\bCHECK\s*\(\s*\w+\s+BETWEEN\s+([\d.]+)\s+AND\s+([\d.]+)\s*\)", re.IGNORECASE)
+_CHECK_GREATER = re.compile(r"\bCHECK\s*\(\s*\w+\s*>\s*([\d.]+)\s*\)", re.IGNORECASE)
+
+
+def _split_top_level(body: str) -> list[str]:
+    # The comma-separated items of a CREATE TABLE body, ignoring commas inside
+    # parentheses
+    items, depth, start = [], 0, 0
+    for i, char in enumerate(body):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            items.append(body[start:i].strip())
+            start = i + 1
+    items.append(body[start:].strip())
+    return [item for item in items if item]
+
+
+def _fits_in_bytes(size: int):
+    # VARCHAR2 sizes are in bytes, so multi-byte text can be too long for the
+    # column with fewer characters than that
+    def check(value: str) -> str:
+        if len(value.encode()) > size:
+            raise PydanticCustomError("string_too_long", "String should have at most {max_bytes} bytes", {"max_bytes": size})
+        return value
+    return AfterValidator(check)
+
+
+def _naive_local(value: datetime.datetime) -> datetime.datetime:
+    # DATE has no time zone, so an offset-suffixed value is stored as the
+    # local time it refers to, and compared that way by the rules below
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _empty_as_null(value):
+    # Oracle stores '' as NULL, which is what a cleared form field sends
+    return None if value == "" else value
+
+
+def _field(definition: str):
+    # (annotation, default) for one column definition, or None for columns
+    # that cannot be inserted
+    match = _COLUMN.match(definition)
+    upper = definition.upper()
+    if match is None or "PRIMARY KEY" in upper or "GENERATED ALWAYS" in upper:
+        return None
+    _, sql_type, length, precision, scale, rest = match.groups()
+    not_null = "NOT NULL" in rest.upper()
+    default = _DEFAULT.search(rest)
+    constraints = {}
+    if (check := _CHECK_BETWEEN.search(rest)) is not None:
+        constraints.update(ge=Decimal(check.group(1)), le=Decimal(check.group(2)))
+    if (check := _CHECK_GREATER.search(rest)) is not None:
+        constraints.update(gt=Decimal(check.group(1)))
+
+    if (check := _CHECK_IN.search(rest)) is not None:
+        annotation = Literal[tuple(re.findall(r"'([^']*)'", check.group(1)))]
+    elif length is not None:
+        # Oracle stores '' as NULL, so NOT NULL text must not be empty
+        annotation = Annotated[str, Field(min_length=1 if not_null else 0, max_length=int(length)),
+                               _fits_in_bytes(int(length))]
+    elif precision is not None and int(scale) == 0:
+        limit = 10 ** int(precision) - 1
+        annotation = Annotated[int, Field(**{"ge": -limit, "le": limit, **constraints})]
+    elif precision is not None:
+        annotation = Annotated[Decimal, Field(max_digits=int(precision), decimal_places=int(scale), **constraints)]
+    else:
+        # DATE columns bind as datetimes, as in FILTER_COLUMNS
+        annotation = Annotated[datetime.datetime, AfterValidator(_naive_local)]
+
+    if default is not None:
+        # Left to the database when not given; SYSDATE has no value here
+        return annotation, default.group(1)
+    if not_null:
+        return annotation, ...
+    return Annotated[annotation | None, BeforeValidator(_empty_as_null)], None
+
+
+class RowModel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    # (constraint name, rule) pairs; a rule yields (field, message) for each
+    # field the constraint rejects
+    rules: ClassVar[tuple] = ()
+
+    @model_validator(mode="after")
+    def check_table_constraints(self):
+        errors = [
+            InitErrorDetails(
+                type=PydanticCustomError("check_constraint", message, {"constraint": constraint}),
+                loc=(field,),
+                input=getattr(self, field),
+            )
+            for constraint, rule in self.rules
+            for field, message in rule(self)
+        ]
+        if errors:
+            raise ValidationError.from_exception_data(type(self).__name__, errors)
+        return self
+
+
+def _not_future(field: str):
+    # is_date_not_future(): later than midnight today is in the future
+    def rule(row):
+        value = getattr(row, field)
+        if value is not None and value > datetime.datetime.combine(datetime.date.today(), datetime.time()):
+            yield field, "Date should not be in the future"
+    return rule
+
+
+def _decision_logic(row):
+    # An application is either decided (Completed, with a decision date no
+    # earlier than its submission) or still Pending without a decision date
+    if row.outcome == 'Pending':
+        if row.decision_date is not None:
+            yield 'decision_date', "Decision date should be empty while the outcome is Pending"
+        if row.status not in ('Submitted', 'Under Review'):
+            yield 'status', "Status should be 'Submitted' or 'Under Review' while the outcome is Pending"
+        return
+    if row.status != 'Completed':
+        yield 'status', f"Status should be 'Completed' when the outcome is {row.outcome}"
+    if row.decision_date is None:
+        yield 'decision_date', f"Decision date is required when the outcome is {row.outcome}"
+    elif row.submission_date is None and row.decision_date < datetime.datetime.now():
+        # The submission date defaults to SYSDATE, the time of the insert
+        yield 'decision_date', "Decision date should not be in the past when the submission date is not given"
+    elif row.submission_date is not None and row.decision_date < row.submission_date:
+        yield 'decision_date', "Decision date should not be before the submission date"
+
+
+def _transcript_institution(row):
+    if row.document_type == 'Transcript' and row.institution_id is None:
+        yield 'institution_id', "Institution is required for a Transcript"
+
+
+def _document_content(row):
+    if row.document_sha256 is None and row.document_size is not None:
+        yield 'document_sha256', "Digest is required when a size is given"
+    elif row.document_sha256 is not None and row.document_size is None:
+        yield 'document_size', "Size is required when a digest is given"
+    elif row.document_sha256 is not None and len(row.document_sha256) != 64:
+        yield 'document_sha256', "Digest should have 64 characters"
+    elif row.document_size is not None and row.document_size < 0:
+        yield 'document_size', "Size should not be negative"
+
+
+TABLE_RULES = {
+    'APPLICANT': (('ck_birth_not_future', _not_future('date_of_birth')),),
+    'APPLICATION': (
+        ('ck_sub_not_future', _not_future('submission_date')),
+        ('ck_application_decision_logic', _decision_logic),
+    ),
+    'APPLICATION_DOCUMENT': (
+        ('chk_transcript_institution', _transcript_institution),
+        ('chk_document_content', _document_content),
+    ),
+}
+
+
+def row_models(script: str) -> dict[str, type[RowModel]]:
+    models = {}
+    for stmt in script_statements(script):
+        match = _CREATE_TABLE.match(stmt)
+        if match is None or match.group(1).upper() not in ALLOWED_TABLES.values():
+            continue
+        oracle_table = match.group(1).upper()
+        fields = {}
+        for definition in _split_top_level(match.group(2)):
+            field = _field(definition)
+            if field is not None:
+                fields[_COLUMN.match(definition).group(1).lower()] = field
+        name = "".join(part.title() for part in oracle_table.split("_")) + "Row"
+        model = create_model(name, __base__=RowModel, **fields)
+        model.rules = TABLE_RULES.get(oracle_table, ())
+        models[oracle_table] = model
+    return models
+
+
+ROW_MODELS = row_models(RESET_SCRIPT)
+
+
+def validate_row(oracle_table: str, data: dict) -> dict:
+    # The row's values in the model's column order, which keeps the INSERT
+    # text the same for the same columns; columns not given are left out so
+    # the database applies their defaults. Raises ValidationError.
+    return ROW_MODELS[oracle_table].model_validate(data).model_dump(exclude_unset=True)
@@ -0,0 +1,72 @@
+import sqlite3
+
+from cache import VersionedCopy
+from local_db import LocalDatabase
+from schema import TABLE_COLUMNS
+
+SNAPSHOT_ARRAYSIZE = 10000
+
+
+class AnalyticReplica(VersionedCopy):
+    # In-process SQLite copy of the five tables, kept current as described in
+    # VersionedCopy.
+    name = "Analytic replica"
+
+    def __init__(self, versions):
+        super().__init__(versions)
+        self.db = LocalDatabase()
+        self.served = 0
+        self.fallbacks = 0
+
+    def snapshot(self, conn):
+        current = self.versions.as_dict()
+        data = {}
+        with conn.cursor() as cur:
+            cur.arraysize = SNAPSHOT_ARRAYSIZE
+            cur.prefetchrows = SNAPSHOT_ARRAYSIZE
+            for oracle_table, columns in TABLE_COLUMNS.items():
+                cur.execute(f"SELECT {', '.join(columns)} FROM {oracle_table}")
+                data[oracle_table] = (columns, cur.fetchall())
+        self.load(data, current)
+
+    def load(self, data, versions=None):
+        self.ready = False
+        self.db.load(data)
+        self._loaded(versions)
+
+    def fetch(self, sql: str, params=None):
+        try:
+            result = self.db.fetch(sql, params)
+        except sqlite3.Error:
+            with self._lock:
+                self.fallbacks += 1
+            return None
+        with self._lock:
+            self.served += 1
+        return result
+
+    def apply_inserts(self, oracle_table: str, rows):
+        # rows are TABLE_COLUMNS tuples read back from Oracle, so the replica
+        # stores exactly what was committed, including defaults
+        self._apply(self.db.upsert, oracle_table, TABLE_COLUMNS[oracle_table], rows)
+
+    def apply_deletes(self, oracle_table: str, ids):
+        self._apply(self.db.delete, oracle_table, ids)
+
+    def _apply(self, method, *args):
+        if not self.ready:
+            return
+        try:
+            method(*args)
+        except sqlite3.Error:
+            self.ready = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "current_tables": self.current_tables(),
+                "snapshots": self.snapshots,
+                "queries_served": self.served,
+                "fallbacks": self.fallbacks,
+            }
@@ -0,0 +1,512 @@
+import re
+import datetime
+from decimal import Decimal
+from typing import Literal
+from pydantic import BaseModel, Field
+
+ALLOWED_TABLES = {
+    'institutions': 'INSTITUTION',
+    'programs': 'PROGRAM',
+    'applicants': 'APPLICANT',
+    'applications': 'APPLICATION',
+    'application_documents': 'APPLICATION_DOCUMENT'
+}
+
+PREPARED_QUERIES = {
+    '1': """
+SELECT DISTINCT Name AS Institution_Name, Accreditation_Status
+FROM Institution
+ORDER BY Name
+""",
+    '2': """
+SELECT Name AS Program_Name, Minimum_GPA, Duration_Years, Enrollment_Status
+FROM Program
+WHERE Enrollment_Status = :enrollment_status
+GROUP BY Name, Minimum_GPA, Duration_Years, Enrollment_Status
+ORDER BY Name
+""",
+    '3': """
+SELECT DISTINCT First_Name, Last_Name, GPA
+FROM Applicant
+ORDER BY GPA DESC
+""",
+    '4': """
+SELECT ID AS Application_ID, Applicant_ID, Program_ID, Submission_Date, Status
+FROM Application
+GROUP BY ID, Applicant_ID, Program_ID, Submission_Date, Status
+ORDER BY Submission_Date
+""",
+    '5': """
+SELECT DISTINCT Application_ID, Document_Type, Document_File
+FROM Application_Document
+ORDER BY Application_ID, Document_Type
+""",
+    '6': """
+SELECT Name AS Program_Name, Minimum_GPA, Enrollment_Status
+FROM Program
+WHERE Minimum_GPA >= :min_gpa
+GROUP BY Name, Minimum_GPA, Enrollment_Status
+ORDER BY Minimum_GPA DESC
+""",
+    '7': """
+SELECT DISTINCT First_Name, Last_Name, GPA
+FROM Applicant
+WHERE GPA > (SELECT AVG(GPA) FROM Applicant)
+ORDER BY GPA DESC
+""",
+    '8': """
+SELECT Status, COUNT(*) AS Application_Count
+FROM Application
+GROUP BY Status
+ORDER BY Application_Count DESC
+""",
+    '9': """
+SELECT i.Name AS Institution_Name,
+    ROUND(AVG(a.GPA), 2) AS Avg_GPA,
+    MIN(a.GPA) AS Min_GPA,
+    MAX(a.GPA) AS Max_GPA,
+    ROUND(STDDEV(a.GPA), 2) AS StdDev_GPA
+FROM Applicant a
+JOIN Institution i ON a.Institution_ID = i.ID
+GROUP BY i.Name
+ORDER BY Avg_GPA DESC
+""",
+    '10': """
+SELECT p.Name AS Program_Name, ROUND(AVG(a.GPA), 2) AS Program_Avg_GPA
+FROM Program p
+JOIN Application ap ON p.ID = ap.Program_ID
+JOIN Applicant a ON ap.Applicant_ID = a.ID
+GROUP BY p.Name
+HAVING AVG(a.GPA) > (SELECT AVG(GPA) FROM Applicant)
+ORDER BY Program_Avg_GPA DESC
+""",
+    '11': """
+SELECT ap.First_Name, ap.Last_Name, ap.Email
+FROM Applicant ap
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM Application a
+    JOIN Application_Document d ON a.ID = d.Application_ID
+    WHERE d.Document_Type = 'Transcript'
+      AND a.Applicant_ID = ap.ID)
+ORDER BY ap.Last_Name
+""",
+    '12': """
+SELECT p.Name AS Program_Name, COUNT(a.ID) AS Accepted_Applications
+FROM Program p
+JOIN Application a ON p.ID = a.Program_ID
+WHERE a.Outcome = 'Accepted'
+GROUP BY p.Name
+HAVING COUNT(a.ID) > 0
+ORDER BY Accepted_Applications DESC
+""",
+    '13': """
+SELECT DISTINCT ap.First_Name, ap.Last_Name, p.Name AS Program_Name, a.Status, a.Outcome
+FROM Application a
+JOIN Applicant ap ON a.Applicant_ID = ap.ID
+JOIN Program p ON a.Program_ID = p.ID
+WHERE p.Enrollment_Status = :enrollment_status
+  AND a.Outcome IN ('Pending', 'Waitlisted')
+ORDER BY ap.Last_Name, p.Name
+""",
+    '14': """
+(SELECT ap.First_Name, ap.Last_Name, ap.Email, p.Name AS Program_Name
+FROM Applicant ap
+JOIN Application a ON ap.ID = a.Applicant_ID
+JOIN Program p ON a.Program_ID = p.ID
+WHERE p.Name = :program
+    AND a.Outcome = 'Accepted')
+MINUS
+(SELECT ap.First_Name, ap.Last_Name, ap.Email, p.Name AS Program_Name
+FROM Applicant ap
+JOIN Application a ON ap.ID = a.Applicant_ID
+JOIN Program p ON a.Program_ID = p.ID
+WHERE p.Name = :excluded_program
+    AND a.Outcome = 'Accepted')
+ORDER BY Last_Name
+""",
+    '15': """
+SELECT 
+    asv.First_Name,
+    asv.Last_Name,
+    asv.GPA AS Applicant_GPA,
+    pov.Program_Name,
+    pov.Avg_Applicant_GPA AS Program_Avg_GPA,
+    ROUND(asv.GPA - pov.Avg_Applicant_GPA, 2) AS GPA_Difference
+FROM Applicant_Summary_View asv
+JOIN Application a ON asv.Applicant_ID = a.Applicant_ID
+JOIN Program_Outcome_View pov ON a.Program_ID = pov.Program_ID
+ORDER BY GPA_Difference DESC
+""",
+    '16': """
+SELECT DISTINCT
+    asv.First_Name,
+    asv.Last_Name,
+    adv.Program_Name,
+    adv.Document_Type,
+    adv.Document_File
+FROM Applicant_Summary_View asv
+JOIN Application_Document_View adv 
+    ON asv.Applicant_ID = adv.Applicant_ID
+JOIN Program_Outcome_View pov 
+    ON adv.Program_ID = pov.Program_ID
+WHERE pov.Accepted > 0
+ORDER BY asv.Last_Name, adv.Program_Name
+""",
+    '17': """
+SELECT 
+    pov.Program_Name,
+    pov.Total_Applications,
+    pov.Accepted,
+    ROUND((pov.Accepted / NULLIF(pov.Total_Applications, 0)) * 100, 2) AS Acceptance_Rate,
+    pov.Avg_Applicant_GPA
+FROM Program_Outcome_View pov
+WHERE pov.Total_Applications > 0
+ORDER BY Acceptance_Rate DESC, pov.Avg_Applicant_GPA DESC
+""",
+    '18': """
+SELECT 
+    asv.Institution_Name,
+    COUNT(DISTINCT asv.Applicant_ID) AS Total_Applicants,
+    SUM(asv.Accepted_Count) AS Total_Accepted,
+    COUNT(DISTINCT adv.Document_File) AS Total_Documents,
+    ROUND(COUNT(DISTINCT adv.Document_File) / NULLIF(COUNT(DISTINCT asv.Applicant_ID), 0), 2) AS Avg_Documents_Per_Applicant
+FROM Applicant_Summary_View asv
+JOIN Application_Document_View adv 
+    ON asv.Applicant_ID = adv.Applicant_ID
+JOIN Program_Outcome_View pov 
+    ON adv.Program_ID = pov.Program_ID
+GROUP BY asv.Institution_Name
+ORDER BY Total_Accepted DESC
+""",
+    '19': """
+SELECT DISTINCT
+    asv.First_Name,
+    asv.Last_Name,
+    asv.GPA,
+    adv.Program_Name,
+    pov.Pending
+FROM Applicant_Summary_View asv
+JOIN Application_Document_View adv 
+    ON asv.Applicant_ID = adv.Applicant_ID
+JOIN Program_Outcome_View pov 
+    ON adv.Program_ID = pov.Program_ID
+WHERE asv.GPA >= :min_gpa
+  AND pov.Pending > 0
+ORDER BY asv.GPA DESC, adv.Program_Name
+"""
+}
+
+# Bind variables of the parameterized prepared queries. Values arrive as query
+# string parameters and are validated against these models; the defaults are
+# the literals the queries originally had. GPAs are Decimals so they bind as
+# NUMBER rather than BINARY_DOUBLE.
+class EnrollmentStatusParams(BaseModel):
+    enrollment_status: Literal['Open', 'Closed'] = 'Open'
+
+class ProgramGpaParams(BaseModel):
+    min_gpa: Decimal = Field(Decimal('3.5'), ge=0, le=4, decimal_places=2)
+
+class ProgramComparisonParams(BaseModel):
+    program: str = Field('Computer Science', min_length=1, max_length=100)
+    excluded_program: str = Field('Business Admin', min_length=1, max_length=100)
+
+class ApplicantGpaParams(BaseModel):
+    min_gpa: Decimal = Field(Decimal('3.7'), ge=0, le=4, decimal_places=2)
+
+QUERY_PARAMETERS = {
+    '2': EnrollmentStatusParams,
+    '6': ProgramGpaParams,
+    '13': EnrollmentStatusParams,
+    '14': ProgramComparisonParams,
+    '19': ApplicantGpaParams,
+}
+
+def default_binds(query_key: str) -> dict:
+    model = QUERY_PARAMETERS.get(query_key)
+    return model().model_dump() if model else {}
+
+RESET_SCRIPT = """
+BEGIN EXECUTE IMMEDIATE 'DROP TABLE Application_Document CASCADE CONSTRAINTS'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TABLE Application CASCADE CONSTRAINTS'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TABLE Applicant CASCADE CONSTRAINTS'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TABLE Program CASCADE CONSTRAINTS'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TABLE Institution CASCADE CONSTRAINTS'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP VIEW Applicant_Summary_View'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP VIEW Application_Document_View'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP VIEW Program_Outcome_View'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP SEQUENCE Institution_Seq'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP SEQUENCE Program_Seq'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP SEQUENCE Applicant_Seq'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP SEQUENCE Application_Seq'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP SEQUENCE Application_Document_Seq'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TABLE Schema_Version'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+
+CREATE OR REPLACE FUNCTION is_date_not_future (
+    p_date IN DATE
+) RETURN VARCHAR2 DETERMINISTIC IS
+BEGIN
+    RETURN CASE WHEN p_date > TRUNC(SYSDATE) THEN 'N' ELSE 'Y' END;
+END;
+/
+
+CREATE TABLE Institution (
+    ID NUMBER(10,0) PRIMARY KEY,
+    Name VARCHAR2(100) NOT NULL,
+    City VARCHAR2(50) NOT NULL,
+    State_Province VARCHAR2(50),
+    Country VARCHAR2(50) NOT NULL,
+    Accreditation_Status VARCHAR2(20) NOT NULL CHECK (Accreditation_Status IN ('Accredited','Provisional','Unaccredited'))
+)
+/
+
+CREATE TABLE Program (
+    ID NUMBER(10,0) PRIMARY KEY,
+    Name VARCHAR2(100) NOT NULL,
+    Minimum_GPA NUMBER(3,2) NOT NULL CHECK (Minimum_GPA BETWEEN 0.0 AND 4.0),
+    Duration_Years NUMBER(2,0) NOT NULL CHECK (Duration_Years > 0),
+    Enrollment_Status VARCHAR2(10) NOT NULL CHECK (Enrollment_Status IN ('Open', 'Closed'))
+)
+/
+
+CREATE TABLE Applicant (
+    ID NUMBER(10,0) PRIMARY KEY,
+    First_Name VARCHAR2(50) NOT NULL,
+    Last_Name VARCHAR2(50) NOT NULL,
+    Date_of_Birth DATE NOT NULL,
+    Email VARCHAR2(100) NOT NULL UNIQUE,
+    Institution_ID NUMBER(10,0) NOT NULL,
+    GPA NUMBER(3,2) NOT NULL CHECK (GPA BETWEEN 0.0 AND 4.0),
+    not_future_birth_ind VARCHAR2(1) GENERATED ALWAYS AS (CAST(is_date_not_future(Date_of_Birth) AS VARCHAR2(1))) VIRTUAL,
+    CONSTRAINT ck_birth_not_future CHECK (not_future_birth_ind = 'Y'),
+    CONSTRAINT fk_applicant_institution FOREIGN KEY (Institution_ID) REFERENCES Institution(ID)
+)
+/
+
+CREATE TABLE Application (
+    ID NUMBER(10,0) PRIMARY KEY,
+    Applicant_ID NUMBER(10,0) NOT NULL,
+    Program_ID NUMBER(10,0) NOT NULL,
+    Submission_Date DATE DEFAULT SYSDATE NOT NULL,
+    Status VARCHAR2(20) DEFAULT 'Submitted' NOT NULL CHECK (Status IN ('Submitted', 'Under Review', 'Completed')),
+    Decision_Date DATE,
+    Outcome VARCHAR2(20) NOT NULL CHECK (Outcome IN ('Accepted', 'Rejected', 'Pending', 'Waitlisted')),
+    Outcome_Notes VARCHAR2(1000),
+    not_future_sub_ind VARCHAR2(1) GENERATED ALWAYS AS (CAST(is_date_not_future(Submission_Date) AS VARCHAR2(1))) VIRTUAL,
+    CONSTRAINT ck_sub_not_future CHECK (not_future_sub_ind = 'Y'),
+    CONSTRAINT fk_application_applicant FOREIGN KEY (Applicant_ID) REFERENCES Applicant(ID),
+    CONSTRAINT fk_application_program FOREIGN KEY (Program_ID) REFERENCES Program(ID),
+    CONSTRAINT ck_application_decision_logic CHECK (
+        (Outcome IN ('Accepted','Rejected','Waitlisted') AND Status='Completed' AND Decision_Date IS NOT NULL AND Decision_Date >= Submission_Date)
+        OR
+        (Outcome='Pending' AND Decision_Date IS NULL AND Status IN ('Submitted','Under Review'))
+    )
+)
+/
+
+CREATE TABLE Application_Document (
+    ID NUMBER(10,0) PRIMARY KEY,
+    Application_ID NUMBER(10,0) NOT NULL,
+    Institution_ID NUMBER(10,0),
+    Document_Type VARCHAR2(50) NOT NULL CHECK (Document_Type IN ('Transcript', 'Essay', 'Recommendation', 'Certificate', 'English Test')),
+    Document_File VARCHAR2(255) NOT NULL,
+    Document_SHA256 VARCHAR2(64),
+    Document_Size NUMBER(12,0),
+    CONSTRAINT fk_document_application FOREIGN KEY (Application_ID) REFERENCES Application(ID) ON DELETE CASCADE,
+    CONSTRAINT fk_document_institution FOREIGN KEY (Institution_ID) REFERENCES Institution(ID),
+    CONSTRAINT chk_transcript_institution CHECK (Document_Type != 'Transcript' OR Institution_ID IS NOT NULL),
+    CONSTRAINT chk_document_content CHECK (
+        (Document_SHA256 IS NULL AND Document_Size IS NULL)
+        OR
+        (LENGTH(Document_SHA256) = 64 AND Document_Size >= 0)
+    )
+)
+/
+
+CREATE INDEX idx_applicant_institution ON Applicant (Institution_ID)
+/
+CREATE INDEX idx_application_applicant ON Application (Applicant_ID)
+/
+CREATE INDEX idx_application_program ON Application (Program_ID)
+/
+CREATE INDEX idx_document_application ON Application_Document (Application_ID)
+/
+CREATE INDEX idx_document_institution ON Application_Document (Institution_ID)
+/
+
+CREATE INDEX idx_applicant_email_lower ON Applicant (LOWER(Email))
+/
+CREATE INDEX idx_applicant_last_name_lower ON Applicant (LOWER(Last_Name))
+/
+CREATE INDEX idx_applicant_first_name_lower ON Applicant (LOWER(First_Name))
+/
+CREATE INDEX idx_application_status ON Application (Status)
+/
+CREATE INDEX idx_application_outcome ON Application (Outcome)
+/
+CREATE INDEX idx_program_enrollment_status ON Program (Enrollment_Status)
+/
+
+CREATE OR REPLACE VIEW Applicant_Summary_View AS
+SELECT 
+    ap.ID AS Applicant_ID,
+    ap.First_Name,
+    ap.Last_Name,
+    i.Name AS Institution_Name,
+    ap.GPA,
+    COUNT(a.ID) AS Total_Applications,
+    COUNT(CASE WHEN a.Outcome = 'Accepted' THEN 1 END) AS Accepted_Count
+FROM Applicant ap
+JOIN Institution i ON ap.Institution_ID = i.ID
+LEFT JOIN Application a ON ap.ID = a.Applicant_ID
+GROUP BY ap.ID, ap.First_Name, ap.Last_Name, i.Name, ap.GPA
+/
+
+CREATE OR REPLACE VIEW Application_Document_View AS
+SELECT 
+    a.ID AS Application_ID,
+    ap.ID AS Applicant_ID,
+    p.ID AS Program_ID,
+    ap.First_Name,
+    ap.Last_Name,
+    d.Document_Type,
+    d.Document_File,
+    i.Name AS Institution_Name,
+    p.Name AS Program_Name
+FROM Application a
+JOIN Applicant ap ON a.Applicant_ID = ap.ID
+JOIN Program p ON a.Program_ID = p.ID
+LEFT JOIN Application_Document d ON a.ID = d.Application_ID
+LEFT JOIN Institution i ON ap.Institution_ID = i.ID
+/
+
+CREATE OR REPLACE VIEW Program_Outcome_View AS
+SELECT 
+    p.ID AS Program_ID,
+    p.Name AS Program_Name,
+    COUNT(a.ID) AS Total_Applications,
+    COUNT(CASE WHEN a.Outcome = 'Accepted' THEN 1 END) AS Accepted,
+    COUNT(CASE WHEN a.Outcome = 'Rejected' THEN 1 END) AS Rejected,
+    COUNT(CASE WHEN a.Outcome = 'Pending' THEN 1 END) AS Pending,
+    ROUND(AVG(ap.GPA), 2) AS Avg_Applicant_GPA
+FROM Program p
+LEFT JOIN Application a ON p.ID = a.Program_ID
+LEFT JOIN Applicant ap ON a.Applicant_ID = ap.ID
+GROUP BY p.ID, p.Name
+/
+
+CREATE SEQUENCE Institution_Seq
+/
+CREATE SEQUENCE Program_Seq
+/
+CREATE SEQUENCE Applicant_Seq
+/
+CREATE SEQUENCE Application_Seq
+/
+CREATE SEQUENCE Application_Document_Seq
+/
+
+CREATE TABLE Schema_Version (
+    Version VARCHAR2(64) NOT NULL
+)
+/
+"""
+
+# Seed rows per table, in foreign-key order. Loaded with array binds after a reset.
+SEED_DATA = {
+    'INSTITUTION': (
+        ('ID', 'Name', 'City', 'State_Province', 'Country', 'Accreditation_Status'),
+        [
+            (1, 'Central Secondary', 'Toronto', 'ON', 'Canada', 'Accredited'),
+            (2, 'Riverside Academy', 'Vancouver', 'BC', 'Canada', 'Accredited'),
+            (3, 'Oakwood School', 'London', 'England', 'UK', 'Accredited'),
+        ],
+    ),
+    'PROGRAM': (
+        ('ID', 'Name', 'Minimum_GPA', 'Duration_Years', 'Enrollment_Status'),
+        [
+            (1, 'Computer Science', 3.5, 4, 'Open'),
+            (2, 'Business Admin', 3.0, 4, 'Open'),
+            (3, 'Engineering', 3.7, 4, 'Closed'),
+        ],
+    ),
+    'APPLICANT': (
+        ('ID', 'First_Name', 'Last_Name', 'Date_of_Birth', 'Email', 'Institution_ID', 'GPA'),
+        [
+            (1001, 'John', 'Doe', datetime.date(2007, 5, 15), 'john.doe@email.com', 1, 3.8),
+            (1002, 'Jane', 'Smith', datetime.date(2006, 11, 22), 'jane.smith@email.com', 2, 3.5),
+            (1003, 'Alice', 'Johnson', datetime.date(2007, 3, 10), 'alice.j@email.com', 1, 3.9),
+        ],
+    ),
+    'APPLICATION': (
+        ('ID', 'Applicant_ID', 'Program_ID', 'Submission_Date', 'Status', 'Decision_Date', 'Outcome', 'Outcome_Notes'),
+        [
+            (1, 1001, 1, datetime.date(2025, 1, 15), 'Completed', datetime.date(2025, 3, 1), 'Accepted', 'Strong GPA and transcript'),
+            (2, 1002, 2, datetime.date(2025, 2, 10), 'Completed', datetime.date(2025, 3, 15), 'Rejected', 'GPA below threshold; weak essay'),
+            (3, 1003, 1, datetime.date(2025, 1, 20), 'Submitted', None, 'Pending', 'Awaiting review'),
+        ],
+    ),
+    'APPLICATION_DOCUMENT': (
+        ('ID', 'Application_ID', 'Institution_ID', 'Document_Type', 'Document_File', 'Document_SHA256', 'Document_Size'),
+        [
+            (1, 1, 1, 'Transcript', 'transcript_1001.pdf', None, None),
+            (2, 1, None, 'Essay', 'essay_1001.pdf', None, None),
+            (3, 1, None, 'Recommendation', 'rec_1001_1.pdf', None, None),
+            (4, 2, 2, 'Transcript', 'transcript_1002.pdf', None, None),
+            (5, 2, None, 'English Test', 'det_1002.pdf', None, None),
+        ],
+    ),
+}
+
+# RESET_SCRIPT statements are separated by lines holding only "/", as in SQL*Plus
+def script_statements(script: str) -> list[str]:
+    return [stmt.strip() for stmt in re.split(r"^\s*/\s*$", script, flags=re.MULTILINE) if stmt.strip()]
+
+# Stored (non-virtual) columns of each table
+TABLE_COLUMNS = {oracle_table: columns for oracle_table, (columns, _) in SEED_DATA.items()}
+
+# Columns the table endpoint can filter and sort on, with the type query string
+# values are converted to before binding. DATE columns bind as datetimes.
+FILTER_COLUMNS = {
+    'INSTITUTION': {
+        'id': int, 'name': str, 'city': str, 'state_province': str, 'country': str, 'accreditation_status': str,
+    },
+    'PROGRAM': {
+        'id': int, 'name': str, 'minimum_gpa': Decimal, 'duration_years': int, 'enrollment_status': str,
+    },
+    'APPLICANT': {
+        'id': int, 'first_name': str, 'last_name': str, 'date_of_birth': datetime.datetime, 'email': str,
+        'institution_id': int, 'gpa': Decimal,
+    },
+    'APPLICATION': {
+        'id': int, 'applicant_id': int, 'program_id': int, 'submission_date': datetime.datetime, 'status': str,
+        'decision_date': datetime.datetime, 'outcome': str,
+    },
+    'APPLICATION_DOCUMENT': {
+        'id': int, 'application_id': int, 'institution_id': int, 'document_type': str, 'document_file': str,
+        'document_sha256': str, 'document_size': int,
+    },
+}
+
+# Columns matched by the table endpoint's text search, a lower-cased prefix
+# match backed by the LOWER() indexes in RESET_SCRIPT. Email equality filters
+# use the index of its UNIQUE constraint.
+SEARCH_COLUMNS = {
+    'INSTITUTION': ('Name',),
+    'PROGRAM': ('Name',),
+    'APPLICANT': ('First_Name', 'Last_Name', 'Email'),
+}
@@ -0,0 +1,122 @@
+import os
+import hashlib
+import tempfile
+import tomllib
+import dataclasses
+
+DEFAULT_DSN = "(DESCRIPTION=(ADDRESS=(PROTOCOL=TCP)(Host=localhost)(Port=1521))(CONNECT_DATA=(SID=orcl12c)))"
+DEFAULT_CONFIG_FILE = "config.toml"
+
+
+@dataclasses.dataclass(frozen=True)
+class Settings:
+    oracle_user: str | None = None
+    oracle_password: str | None = None
+    oracle_dsn: str = DEFAULT_DSN
+    pool_min: int = 1
+    pool_max: int = 8
+    async_pool_max: int = 8
+    pool_increment: int = 1
+    pool_wait_timeout_ms: int = 5000
+    pool_ping_interval_s: int = 60
+    stmt_cache_size: int = 50
+    warmup_statements: bool = False
+    stream_arraysize: int = 1000
+    bulk_batch_size: int = 5000
+    id_block_size: int = 0
+    query_cache_size: int = 256
+    # JSON responses at least this large are gzipped
+    gzip_min_bytes: int = 1024
+    analytic_replica: bool = False
+    aggregate_store: bool = True
+    # Statements slower than this are logged with their SQL_ID and binds; 0 disables
+    slow_query_ms: int = 500
+    # "local" runs on the embedded SQLite stand-in instead of Oracle, with
+    # local_latency_ms added to every statement (see loadtest.py)
+    db_backend: str = "oracle"
+    local_latency_ms: float = 0.0
+    # Group commit of concurrent single-row inserts and deletes
+    write_queue: bool = False
+    write_queue_window_ms: float = 2.0
+    write_queue_batch_size: int = 100
+    # Uploaded document files, stored by content hash
+    document_store_path: str = "document_store"
+    document_max_bytes: int = 64 * 1024 * 1024
+    # Off runs the API alone, without the web page or its vendored files
+    serve_front_end: bool = True
+    # SQLite file holding the table version counters shared by all worker
+    # processes on this host; ":memory:" keeps them per process.
+    shared_state_path: str | None = None
+
+
+DB_BACKENDS = ("oracle", "local")
+
+# Environment variable for each setting; they take precedence over the config file
+ENV_VARS = {
+    "oracle_user": "ORACLE_USER",
+    "oracle_password": "ORACLE_PASSWORD",
+    "oracle_dsn": "ORACLE_DSN",
+    "pool_min": "ORACLE_POOL_MIN",
+    "pool_max": "ORACLE_POOL_MAX",
+    "async_pool_max": "ORACLE_ASYNC_POOL_MAX",
+    "pool_increment": "ORACLE_POOL_INCREMENT",
+    "pool_wait_timeout_ms": "ORACLE_POOL_WAIT_TIMEOUT_MS",
+    "pool_ping_interval_s": "ORACLE_POOL_PING_INTERVAL_S",
+    "stmt_cache_size": "ORACLE_STMT_CACHE_SIZE",
+    "warmup_statements": "WARMUP_STATEMENTS",
+    "stream_arraysize": "STREAM_ARRAYSIZE",
+    "bulk_batch_size": "BULK_BATCH_SIZE",
+    "id_block_size": "ID_BLOCK_SIZE",
+    "query_cache_size": "QUERY_CACHE_SIZE",
+    "gzip_min_bytes": "GZIP_MIN_BYTES",
+    "analytic_replica": "ANALYTIC_REPLICA",
+    "aggregate_store": "AGGREGATE_STORE",
+    "slow_query_ms": "SLOW_QUERY_MS",
+    "shared_state_path": "SHARED_STATE_PATH",
+    "db_backend": "DB_BACKEND",
+    "local_latency_ms": "LOCAL_LATENCY_MS",
+    "write_queue": "WRITE_QUEUE",
+    "write_queue_window_ms": "WRITE_QUEUE_WINDOW_MS",
+    "write_queue_batch_size": "WRITE_QUEUE_BATCH_SIZE",
+    "document_store_path": "DOCUMENT_STORE_PATH",
+    "document_max_bytes": "DOCUMENT_MAX_BYTES",
+    "serve_front_end": "SERVE_FRONT_END",
+}
+
+
+def _convert(field: dataclasses.Field, value):
+    if isinstance(value, str) and field.type is bool:
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(value, str) and field.type is int:
+        return int(value)
+    if isinstance(value, (str, int)) and field.type is float:
+        return float(value)
+    return value
+
+
+def load_settings(environ=os.environ) -> Settings:
+    path = environ.get("APP_CONFIG", DEFAULT_CONFIG_FILE)
+    values = {}
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            values.update(tomllib.load(f))
+    elif "APP_CONFIG" in environ:
+        raise FileNotFoundError(f"Config file {path} not found")
+    for name, var in ENV_VARS.items():
+        if var in environ:
+            values[name] = environ[var]
+
+    fields = {field.name: field for field in dataclasses.fields(Settings)}
+    unknown = set(values) - set(fields)
+    if unknown:
+        raise ValueError(f"Unknown settings in {path}: {', '.join(sorted(unknown))}")
+    settings = Settings(**{name: _convert(fields[name], value) for name, value in values.items()})
+    if settings.db_backend not in DB_BACKENDS:
+        raise ValueError(f"db_backend must be one of {', '.join(DB_BACKENDS)}, not {settings.db_backend!r}")
+    if settings.write_queue_batch_size < 1:
+        raise ValueError("write_queue_batch_size must be at least 1")
+    if settings.shared_state_path is None:
+        key = hashlib.sha256(f"{settings.oracle_user}@{settings.oracle_dsn}".encode()).hexdigest()[:12]
+        path = os.path.join(tempfile.gettempdir(), f"university-app-{key}.sqlite")
+        settings = dataclasses.replace(settings, shared_state_path=path)
+    return settings
@@ -0,0 +1,258 @@
+const { createApp } = Vue;
+const { createVuetify } = Vuetify;
+
+const vuetify = createVuetify();
+
+// Last response per URL; revalidated with If-None-Match so unchanged
+// tables and queries come back as an empty 304.
+const responseCache = new Map();
+
+// Columns the table endpoint does not sort on
+const unsortableColumns = ['outcome_notes', 'not_future_birth_ind', 'not_future_sub_ind'];
+
+// Server-sent change events from /api/changes, applied to the page as patches
+let changeFeed = null;
+
+function feedOpen() {
+    return changeFeed !== null && changeFeed.readyState === EventSource.OPEN;
+}
+
+async function fetchJson(url) {
+    const cached = responseCache.get(url);
+    const headers = cached ? { 'If-None-Match': cached.etag } : {};
+    const res = await fetch(url, { headers, cache: 'no-store' });
+    if (res.status === 304 && cached) return cached.data;
+    const data = await res.json();
+    const etag = res.headers.get('ETag');
+    if (res.ok && etag) responseCache.set(url, { etag, data });
+    return data;
+}
+
+createApp({
+    data() {
+        return {
+            sections: ['Institutions', 'Programs', 'Applicants', 'Applications', 'Application Documents', 'Prepared Queries'],
+            selected: 'Institutions',
+            tableData: [],
+            headers: [],
+            totalItems: 0,
+            itemsPerPage: 50,
+            cursors: [null],
+            nextCursor: null,
+            sortBy: [],
+            search: '',
+            searchTerm: '',
+            searchTimer: null,
+            loading: false,
+            showAdd: false,
+            fields: [],
+            newRow: {},
+            // Why the last insert was refused: messages by field, and any
+            // error not tied to one
+            addErrors: {},
+            addError: '',
+            selectedQuery: null,
+            queryData: [],
+            queryHeaders: [],
+            tableMap: {
+                'Institutions': 'institutions',
+                'Programs': 'programs',
+                'Applicants': 'applicants',
+                'Applications': 'applications',
+                'Application Documents': 'application_documents'
+            },
+            fieldMap: {
+                'Institutions': ['name', 'city', 'state_province', 'country', 'accreditation_status'],
+                'Programs': ['name', 'minimum_gpa', 'duration_years', 'enrollment_status'],
+                'Applicants': ['first_name', 'last_name', 'date_of_birth', 'email', 'institution_id', 'gpa'],
+                'Applications': ['applicant_id', 'program_id', 'submission_date', 'status', 'decision_date', 'outcome', 'outcome_notes'],
+                'Application Documents': ['application_id', 'institution_id', 'document_type', 'document_file']
+            },
+            queries: [
+                { title: 'List all institution names and their accreditation status, ordered by name', value: '1' },
+                { title: 'List all open programs sorted alphabetically', value: '2' },
+                { title: 'List applicants names and GPAs, ordered by GPA descending', value: '3' },
+                { title: 'List all applications ordered by submission date', value: '4' },
+                { title: 'List all documents submitted, ordered by application ID', value: '5' },
+                { title: 'List all programs with a minimum GPA of at least 3.5, from highest to lowest', value: '6' },
+                { title: 'List applicants with GPA above the average GPA, ordered by GPA descending', value: '7' },
+                { title: 'Count of applications by status, ordered by count descending', value: '8' },
+                { title: 'Calculate average, min, max GPAs per institution, including standard deviation', value: '9' },
+                { title: 'Display programs where applicant GPA > program average GPA', value: '10' },
+                { title: 'Show applicants without a submitted transcript', value: '11' },
+                { title: 'Show all programs with at least one accepted applicant', value: '12' },
+                { title: 'Display all pending/waitlisted applicants for open programs', value: '13' },
+                { title: 'Show all applicants accepted to Computer Science but not Business Admin', value: '14' },
+                { title: 'Compare applicants average GPA to the programs average GPA', value: '15' },
+                { title: 'Display all submitted documents and programs of accepted applicants', value: '16' },
+                { title: 'Program Acceptance Rate and Average GPA', value: '17' },
+                { title: 'Show average amount of documents per applicant, per institution', value: '18' },
+                { title: 'Display applicants with high GPAs and pending applications', value: '19' }
+            ]
+        };
+    },
+    watch: {
+        selected() {
+            this.sortBy = [];
+            this.search = '';
+            this.searchTerm = '';
+        },
+        search() {
+            clearTimeout(this.searchTimer);
+            this.searchTimer = setTimeout(() => { this.searchTerm = this.search || ''; }, 300);
+        },
+        tableQuery: 'fetchData',
+        selectedQuery: 'fetchQueryData'
+    },
+    computed: {
+        tableQuery() {
+            return JSON.stringify([this.selected, this.itemsPerPage, this.sortBy, this.searchTerm]);
+        },
+        searchable() {
+            return ['Institutions', 'Programs', 'Applicants'].includes(this.selected);
+        },
+        pageLabel() {
+            if (this.tableData.length === 0) return `0 of ${this.totalItems}`;
+            const start = (this.cursors.length - 1) * this.itemsPerPage + 1;
+            return `${start}-${start + this.tableData.length - 1} of ${this.totalItems}`;
+        }
+    },
+    methods: {
+        async fetchData() {
+            if (this.selected === 'Prepared Queries') return;
+            this.cursors = [null];
+            await this.loadPage();
+        },
+        async loadPage() {
+            const table = this.tableMap[this.selected];
+            const cursor = this.cursors[this.cursors.length - 1];
+            const params = new URLSearchParams({ limit: this.itemsPerPage });
+            if (this.sortBy.length > 0) {
+                params.set('sort', this.sortBy[0].key);
+                params.set('order', this.sortBy[0].order);
+            }
+            if (this.searchTerm && this.searchable) params.set('q', this.searchTerm);
+            if (cursor) {
+                params.set('cursor', cursor);
+            } else {
+                params.set('include_total', 'true');
+            }
+            this.loading = true;
+            const page = await fetchJson(`/api/tables/${table}?${params}`);
+            this.loading = false;
+            this.tableData = page.items;
+            this.nextCursor = page.next_cursor;
+            if (page.total !== undefined) this.totalItems = page.total;
+            if (this.tableData.length > 0) {
+                this.headers = Object.keys(this.tableData[0]).map(key => ({ title: key.toUpperCase(), key, sortable: !unsortableColumns.includes(key) }));
+            }
+            this.headers.push({ title: 'ACTIONS', key: 'actions', sortable: false });
+        },
+        nextPage() {
+            this.cursors.push(this.nextCursor);
+            this.loadPage();
+        },
+        prevPage() {
+            this.cursors.pop();
+            this.loadPage();
+        },
+        addRow() {
+            this.fields = this.fieldMap[this.selected];
+            this.newRow = {};
+            this.addErrors = {};
+            this.addError = '';
+            this.showAdd = true;
+        },
+        async submitAdd() {
+            const table = this.tableMap[this.selected];
+            const res = await fetch(`/api/tables/${table}`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(this.newRow)
+            });
+            if (!res.ok) {
+                this.showAddErrors(res);
+                return;
+            }
+            this.showAdd = false;
+            // With the change feed connected the insert event patches the page
+            if (res.ok && !feedOpen()) this.applyChange({ table, op: 'insert', row: await res.json() });
+        },
+        async showAddErrors(res) {
+            const body = await res.json().catch(() => ({}));
+            this.addErrors = {};
+            this.addError = '';
+            if (!Array.isArray(body.detail)) {
+                this.addError = body.detail || `Insert failed (${res.status})`;
+                return;
+            }
+            // 422 details locate the field as ["body", field]
+            for (const error of body.detail) {
+                const field = error.loc[1];
+                if (this.fields.includes(field)) {
+                    this.addErrors[field] = [...(this.addErrors[field] || []), error.msg];
+                } else {
+                    this.addError = [this.addError, `${field}: ${error.msg}`].filter(Boolean).join('; ');
+                }
+            }
+        },
+        async deleteRow(id) {
+            const table = this.tableMap[this.selected];
+            const res = await fetch(`/api/tables/${table}/${id}`, { method: 'DELETE' });
+            if (res.ok && !feedOpen()) this.applyChange({ table, op: 'delete', row: await res.json() });
+        },
+        applyChange(event) {
+            if (event.table === null) {
+                responseCache.clear();
+                this.fetchData();
+                this.fetchQueryData();
+                return;
+            }
+            if (this.selected === 'Prepared Queries') {
+                this.fetchQueryData();
+                return;
+            }
+            if (event.table !== this.tableMap[this.selected]) return;
+            // Where a row belongs is only known for the default order without
+            // a search; anything else reloads the current page.
+            const ordered = this.sortBy.length === 0 && !this.searchTerm;
+            const index = event.row ? this.tableData.findIndex(r => r.id === event.row.id) : -1;
+            if (event.op === 'insert' && ordered && index < 0 && this.tableData.length > 0) {
+                this.totalItems += 1;
+                if (this.nextCursor === null && this.tableData.length < this.itemsPerPage) {
+                    this.tableData.push(event.row);
+                } else if (this.nextCursor === null) {
+                    this.loadPage();
+                }
+            } else if (event.op === 'delete' && (ordered || index >= 0)) {
+                if (index >= 0) this.tableData.splice(index, 1);
+                this.totalItems = Math.max(this.totalItems - 1, 0);
+            } else if (event.op === 'update' && ordered) {
+                if (index >= 0) this.tableData.splice(index, 1, event.row);
+            } else if (event.op !== 'insert' || index < 0) {
+                this.loadPage();
+            }
+        },
+        async fetchQueryData() {
+            if (!this.selectedQuery) return;
+            this.queryData = await fetchJson(`/api/prepared-queries/${this.selectedQuery}`);
+            if (this.queryData.length > 0) {
+                this.queryHeaders = Object.keys(this.queryData[0]).map(key => ({ title: key.toUpperCase(), key }));
+            }
+        },
+        async resetDatabase() {
+            await fetch('/api/reset', { method: 'POST' });
+            this.queryData = [];
+            this.selectedQuery = null;
+            if (!feedOpen()) this.applyChange({ table: null, op: 'invalidate', row: null });
+        },
+        followChanges() {
+            changeFeed = new EventSource('/api/changes');
+            changeFeed.onmessage = e => this.applyChange(JSON.parse(e.data));
+        }
+    },
+    mounted() {
+        this.fetchData();
+        this.followChanges();
+    }
+}).use(vuetify).mount('#app');
@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pytest
+
+# The app runs on the SQLite stand-in, with its shared state in memory, and
+# without the web page, whose vendored files are downloaded separately
+os.environ.update(DB_BACKEND="local", SHARED_STATE_PATH=":memory:", SERVE_FRONT_END="0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture
+def client(app_client):
+    # Every test starts from the seed data
+    app_client.post("/api/reset").raise_for_status()
+    return app_client
+
+
+@pytest.fixture
+def dataset(client):
+    # A generated dataset, large enough for several pages of every table
+    import main
+    from datagen import generate
+
+    with main.checkout() as conn:
+        main.reset_schema(conn, generate(300, seed=11))
+    return client
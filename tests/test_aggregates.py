@@ -0,0 +1,75 @@
+import main
+from aggregates import AGGREGATE_SQL
+
+
+def database_records(name: str) -> list[dict]:
+    with main.checkout() as conn:
+        columns, rows = main.fetch_result(conn, AGGREGATE_SQL[name])
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def check(client) -> dict:
+    # Compares queries #8, #12 and #17 and both views with the database
+    result = client.post("/api/aggregates/check").json()
+    assert result["mismatches"] == {}
+    return result
+
+
+def test_store_is_loaded_on_reset(dataset):
+    stats = dataset.get("/api/aggregates").json()
+    assert stats["enabled"] and stats["ready"]
+    assert stats["rows"]["applications"] == len(dataset.get("/api/tables/applications").json())
+    assert check(dataset)["reloaded"] is False
+    assert dataset.get("/api/aggregates/no_such_view").status_code == 404
+
+
+def test_views_are_served_from_the_store(dataset):
+    served = dataset.get("/api/aggregates").json()["results_served"]
+    for name in ("program_outcome_view", "applicant_summary_view"):
+        assert dataset.get(f"/api/aggregates/{name}").json() == database_records(name)
+    assert dataset.get("/api/aggregates").json()["results_served"] == served + 2
+
+
+def test_writes_keep_the_store_consistent(dataset):
+    institution = {"name": "Delta U", "city": "Riga", "country": "Latvia", "accreditation_status": "Accredited"}
+    institution_id = dataset.post("/api/tables/institutions", json=institution).json()["id"]
+    applicant = {"first_name": "Del", "last_name": "Ta", "email": "delta@example.com",
+                 "date_of_birth": "2002-03-04T00:00:00", "institution_id": institution_id, "gpa": "3.85"}
+    applicant_id = dataset.post("/api/tables/applicants", json=applicant).json()["id"]
+    program_ids = [row["id"] for row in dataset.get("/api/tables/programs?limit=2").json()["items"]]
+    applications = [{"applicant_id": applicant_id, "program_id": program_id, "outcome": outcome,
+                     "status": "Completed", "submission_date": "2025-01-10T00:00:00", "decision_date": "2025-03-01T00:00:00"}
+                    for program_id, outcome in zip(program_ids, ("Accepted", "Rejected"))]
+    assert dataset.post("/api/tables/applications/bulk", json=applications).json()["errors"] == []
+    pending = {"applicant_id": applicant_id, "program_id": program_ids[0], "outcome": "Pending"}
+    assert dataset.post("/api/tables/applications", json=pending).status_code == 200
+
+    # Deleting an application also deletes its documents
+    application_id = dataset.get("/api/tables/application_documents?limit=1").json()["items"][0]["application_id"]
+    assert dataset.delete(f"/api/tables/applications/{application_id}").status_code == 200
+    removed = dataset.get("/api/tables/applications?limit=3").json()["items"]
+    result = dataset.delete(f"/api/tables/applications?ids={','.join(str(row['id']) for row in removed)}").json()
+    assert result["deleted"] == 3
+
+    stats = dataset.get("/api/aggregates").json()
+    assert stats["ready"]
+    assert stats["rows"]["application_documents"] == len(dataset.get("/api/tables/application_documents").json())
+    summary = {row["applicant_id"]: row for row in dataset.get("/api/aggregates/applicant_summary_view").json()}
+    assert (summary[applicant_id]["total_applications"], summary[applicant_id]["accepted_count"]) == (3, 1)
+    assert check(dataset)["reloaded"] is False
+
+
+def test_store_written_elsewhere_is_not_used(dataset, monkeypatch):
+    # Another worker's write moves the shared version past the store's, so
+    # results come from the database until the store is refreshed
+    monkeypatch.setattr(main.aggregates, "refresh_in_background", lambda checkout: None)
+    with main.checkout() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM APPLICATION WHERE ID = (SELECT MIN(ID) FROM APPLICATION)")
+        conn.commit()
+    main.tables_changed(["APPLICATION"])
+    served = dataset.get("/api/aggregates").json()["results_served"]
+    assert dataset.get("/api/aggregates/program_outcome_view").json() == database_records("program_outcome_view")
+    assert dataset.get("/api/aggregates").json()["results_served"] == served
+    assert dataset.post("/api/aggregates/check").json()["reloaded"] is True
+    assert check(dataset)["reloaded"] is False
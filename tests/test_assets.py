@@ -0,0 +1,29 @@
+from assets import VENDOR_FILES, StaticAssets, cdn_url
+
+
+def write_static(root, vendor_files):
+    (root / "index.html").write_text("".join(f'<script src="asset:{path}"></script>' for path in VENDOR_FILES))
+    for path in vendor_files:
+        target = root.joinpath(*path.split("/"))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(b"/* vendored */")
+
+
+def test_missing_vendor_files_load_from_the_cdn(tmp_path):
+    write_static(tmp_path, list(VENDOR_FILES)[1:])
+    assets = StaticAssets(str(tmp_path))
+    assets.build()
+    assert assets.missing_vendor_files == [list(VENDOR_FILES)[0]]
+    page = assets.index.variants["identity"].decode()
+    # All of them, not only the missing one
+    assert all(f'src="{cdn_url(path)}"' in page for path in VENDOR_FILES)
+
+
+def test_page_refers_only_to_local_files(tmp_path):
+    write_static(tmp_path, VENDOR_FILES)
+    assets = StaticAssets(str(tmp_path))
+    assets.build()
+    assert assets.missing_vendor_files == []
+    page = assets.index.variants["identity"].decode()
+    assert "https://" not in page
+    assert page.count('src="/static/vendor/') == len(VENDOR_FILES)
@@ -0,0 +1,59 @@
+import main
+
+
+def institution(name: str, **values) -> dict:
+    return {"name": name, "city": "Lyon", "country": "France", "accreditation_status": "Accredited", **values}
+
+
+def test_bulk_insert_reports_failed_rows_by_index(client, monkeypatch):
+    # Small batches, so errors have to be mapped back across executemany calls
+    monkeypatch.setattr(main, "BULK_BATCH_SIZE", 2)
+    applicant = {"first_name": "Bulk", "last_name": "Row", "date_of_birth": "2000-01-01T00:00:00", "gpa": "3.1"}
+    institution_id = client.get("/api/tables/institutions?limit=1").json()["items"][0]["id"]
+    rows = [
+        {**applicant, "email": "bulk0@example.com", "institution_id": institution_id},
+        {**applicant, "email": "bulk1@example.com", "institution_id": 999_999},  # no such institution
+        {**applicant, "email": "bulk2@example.com", "institution_id": institution_id, "gpa": "7"},
+        {**applicant, "email": "bulk3@example.com", "institution_id": institution_id},
+        {**applicant, "email": "bulk0@example.com", "institution_id": institution_id},  # duplicate email
+    ]
+    result = client.post("/api/tables/applicants/bulk", json=rows).json()
+    assert [error["index"] for error in result["errors"]] == [1, 2, 4]
+    assert result["errors"][1]["error"].startswith("gpa:")
+    assert result["ids"][1] is None and result["ids"][2] is None and result["ids"][4] is None
+    stored = {row["id"]: row["email"] for row in client.get("/api/tables/applicants").json()}
+    assert stored[result["ids"][0]] == "bulk0@example.com"
+    assert stored[result["ids"][3]] == "bulk3@example.com"
+
+
+def test_bulk_insert_with_different_column_sets(client):
+    rows = [institution("With Province", state_province="Rhone"), institution("Without Province")]
+    result = client.post("/api/tables/institutions/bulk", json=rows).json()
+    assert result["errors"] == [] and None not in result["ids"]
+    stored = {row["id"]: row for row in client.get("/api/tables/institutions").json()}
+    assert stored[result["ids"][0]]["state_province"] == "Rhone"
+    assert stored[result["ids"][1]]["state_province"] is None
+
+
+def test_bulk_insert_of_nothing(client):
+    assert client.post("/api/tables/institutions/bulk", json=[]).json() == {"ids": [], "errors": []}
+
+
+def test_bulk_delete_reports_missing_and_failed_rows(client):
+    new_ids = client.post("/api/tables/institutions/bulk", json=[institution("A"), institution("B")]).json()["ids"]
+    referenced = client.get("/api/tables/applicants?limit=1").json()["items"][0]["institution_id"]
+    result = client.request("DELETE", "/api/tables/institutions",
+                            json={"ids": [new_ids[0], 999_999, referenced, new_ids[1]]}).json()
+    assert result["deleted"] == 2
+    assert result["missing"] == [999_999]
+    assert [error["id"] for error in result["errors"]] == [referenced]
+    remaining = {row["id"] for row in client.get("/api/tables/institutions").json()}
+    assert not remaining & set(new_ids) and referenced in remaining
+
+
+def test_bulk_delete_ids_in_the_query_string(client):
+    new_ids = client.post("/api/tables/institutions/bulk", json=[institution("C"), institution("D")]).json()["ids"]
+    result = client.delete(f"/api/tables/institutions?ids={new_ids[0]},{new_ids[1]}").json()
+    assert result == {"deleted": 2, "missing": [], "errors": []}
+    assert client.delete("/api/tables/institutions?ids=1,x").status_code == 400
+    assert client.delete("/api/tables/institutions").status_code == 400
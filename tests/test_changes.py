@@ -0,0 +1,107 @@
+import contextlib
+import queue
+
+import anyio
+import orjson
+
+import main
+from feed import INVALIDATE_ALL
+
+INSTITUTION = {"name": "Feed College", "city": "Turin", "country": "Italy", "accreditation_status": "Accredited"}
+
+
+class Subscription:
+    # Reads server-sent events from a running /api/changes request
+    def __init__(self):
+        self.chunks = queue.Queue()
+        self.buffer = b""
+
+    def next_event(self, timeout: float = 5) -> dict:
+        while b"\n\n" not in self.buffer:
+            self.buffer += self.chunks.get(timeout=timeout)
+        block, self.buffer = self.buffer.split(b"\n\n", 1)
+        fields = dict(line.split(b": ", 1) for line in block.split(b"\n") if not line.startswith(b":"))
+        return {key.decode(): value for key, value in fields.items()}
+
+    def next_change(self) -> tuple[int, dict]:
+        event = self.next_event()
+        return int(event["id"]), orjson.loads(event["data"])
+
+
+@contextlib.contextmanager
+def subscribe(client, query: str = "", last_event_id: int | None = None):
+    # The stream never ends, so it is run on the test client's event loop
+    # directly rather than through a request, and cancelled at the end
+    subscription = Subscription()
+    headers = [] if last_event_id is None else [(b"last-event-id", str(last_event_id).encode())]
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+             "path": "/api/changes", "raw_path": b"/api/changes", "query_string": query.encode(),
+             "headers": headers, "client": ("test", 1), "server": ("test", 80), "root_path": ""}
+
+    async def receive():
+        await anyio.sleep_forever()
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            subscription.chunks.put(message.get("body", b""))
+
+    task = client.portal.start_task_soon(main.app, scope, receive, send)
+    try:
+        assert subscription.next_event() == {"retry": b"2000"}
+        yield subscription
+    finally:
+        task.cancel()
+
+
+def test_single_row_writes_send_the_row(client):
+    with subscribe(client) as feed:
+        new_id = client.post("/api/tables/institutions", json=INSTITUTION).json()["id"]
+        _, event = feed.next_change()
+        assert event["table"] == "institutions" and event["op"] == "insert"
+        assert event["row"]["id"] == new_id and event["row"]["name"] == INSTITUTION["name"]
+
+        client.delete(f"/api/tables/institutions/{new_id}")
+        _, event = feed.next_change()
+        assert (event["table"], event["op"], event["row"]["id"]) == ("institutions", "delete", new_id)
+
+
+def test_bulk_writes_cascades_and_reset_invalidate(client):
+    application_id = client.get("/api/tables/applications?limit=1").json()["items"][0]["id"]
+    with subscribe(client) as feed:
+        client.post("/api/tables/institutions/bulk", json=[INSTITUTION, INSTITUTION])
+        assert feed.next_change()[1] == {"table": "institutions", "op": "invalidate", "row": None}
+
+        client.delete(f"/api/tables/applications/{application_id}")
+        assert feed.next_change()[1]["op"] == "delete"
+        assert feed.next_change()[1] == {"table": "application_documents", "op": "invalidate", "row": None}
+
+        client.post("/api/reset")
+        assert feed.next_change()[1] == {"table": None, "op": "invalidate", "row": None}
+
+
+def test_tables_filter(client):
+    program_id = client.get("/api/tables/programs?limit=1").json()["items"][0]["id"]
+    applicant_id = client.get("/api/tables/applicants?limit=1").json()["items"][0]["id"]
+    with subscribe(client, "tables=applications") as feed:
+        client.post("/api/tables/institutions", json=INSTITUTION)
+        client.post("/api/tables/applications", json={"applicant_id": applicant_id, "program_id": program_id, "outcome": "Pending"})
+        _, event = feed.next_change()
+        assert (event["table"], event["op"]) == ("applications", "insert")
+    assert client.get("/api/changes?tables=users").status_code == 404
+
+
+def test_reconnect_replays_missed_events(client):
+    with subscribe(client) as feed:
+        client.post("/api/tables/institutions", json=INSTITUTION)
+        last_seen, _ = feed.next_change()
+    missed = [client.post("/api/tables/institutions", json={**INSTITUTION, "name": f"Missed {i}"}).json()["id"]
+              for i in range(2)]
+
+    with subscribe(client, last_event_id=last_seen) as feed:
+        replayed = [feed.next_change() for _ in missed]
+    assert [seq for seq, _ in replayed] == [last_seen + 1, last_seen + 2]
+    assert [event["row"]["id"] for _, event in replayed] == missed
+
+    # Too old, or from before a restart: the client reloads everything instead
+    with subscribe(client, last_event_id=last_seen + 1000) as feed:
+        assert feed.next_change()[1] == INVALIDATE_ALL
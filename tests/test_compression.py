@@ -0,0 +1,49 @@
+import gzip
+import io
+import json
+
+import pytest
+
+import main
+from datagen import generate
+
+
+@pytest.fixture
+def client(client):
+    # Enough rows for the responses to pass GZIP_MIN_BYTES
+    with main.checkout() as conn:
+        main.reset_schema(conn, generate(200, seed=3))
+    return client
+
+
+def test_json_and_text_are_gzipped(client):
+    response = client.get("/api/tables/applicants", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert response.json()
+
+    # Streamed bodies are compressed as they are sent
+    response = client.get("/api/tables/applicants?format=ndjson", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_small_responses_are_not_gzipped(client):
+    response = client.get("/api/tables/programs?limit=1", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_without_accept_encoding_nothing_is_gzipped(client):
+    response = client.get("/api/tables/applicants", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+def test_exports_are_not_gzipped(client, fmt):
+    pytest.importorskip("pyarrow")
+    response = client.get(f"/api/tables/applicants?format={fmt}", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    with pytest.raises(gzip.BadGzipFile):
+        gzip.GzipFile(fileobj=io.BytesIO(response.content)).read()
@@ -0,0 +1,55 @@
+INSTITUTION = {"name": "Etag Institute", "city": "Bern", "country": "Switzerland", "accreditation_status": "Accredited"}
+
+
+def revalidate(client, url: str, etag: str):
+    return client.get(url, headers={"If-None-Match": etag})
+
+
+def test_unchanged_table_answers_304(client):
+    response = client.get("/api/tables/programs")
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "no-cache"
+    revalidated = revalidate(client, "/api/tables/programs", etag)
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    # Strong and list forms of the same tag match too
+    assert revalidate(client, "/api/tables/programs", f'"x", {etag.removeprefix("W/")}').status_code == 304
+    assert revalidate(client, "/api/tables/programs", "*").status_code == 304
+    assert revalidate(client, "/api/tables/programs", 'W/"other"').status_code == 200
+
+
+def test_query_string_is_part_of_the_tag(client):
+    assert client.get("/api/tables/programs").headers["etag"] != client.get("/api/tables/programs?limit=2").headers["etag"]
+
+
+def test_writes_change_the_tags_of_the_tables_they_touch(client):
+    institutions = client.get("/api/tables/institutions").headers["etag"]
+    programs = client.get("/api/tables/programs").headers["etag"]
+    query = client.get("/api/prepared-queries/1").headers["etag"]
+    new_id = client.post("/api/tables/institutions", json=INSTITUTION).json()["id"]
+
+    response = revalidate(client, "/api/tables/institutions", institutions)
+    assert response.status_code == 200
+    assert new_id in [row["id"] for row in response.json()]
+    assert revalidate(client, "/api/prepared-queries/1", query).status_code == 200
+    assert revalidate(client, "/api/tables/programs", programs).status_code == 304
+
+    institutions = client.get("/api/tables/institutions").headers["etag"]
+    client.delete(f"/api/tables/institutions/{new_id}")
+    assert revalidate(client, "/api/tables/institutions", institutions).status_code == 200
+
+
+def test_reset_changes_every_tag(client):
+    etag = client.get("/api/tables/programs").headers["etag"]
+    client.post("/api/reset")
+    assert revalidate(client, "/api/tables/programs", etag).status_code == 200
+
+
+def test_multi_query_and_aggregate_tags(client):
+    for url in ("/api/prepared-queries?keys=1,2", "/api/aggregates/program_outcome_view"):
+        etag = client.get(url).headers["etag"]
+        assert revalidate(client, url, etag).status_code == 304
+    etag = client.get("/api/prepared-queries?keys=1,2").headers["etag"]
+    client.post("/api/tables/institutions", json=INSTITUTION)
+    assert revalidate(client, "/api/prepared-queries?keys=1,2", etag).status_code == 200
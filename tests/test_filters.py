@@ -0,0 +1,73 @@
+from decimal import Decimal
+
+from test_pagination import pages
+
+
+def ids(response) -> list[int]:
+    return sorted(row["id"] for row in response.json())
+
+
+def test_equality_range_and_prefix_filters(dataset):
+    applicants = dataset.get("/api/tables/applicants").json()
+    institution_id = applicants[0]["institution_id"]
+    assert ids(dataset.get(f"/api/tables/applicants?institution_id={institution_id}")) == sorted(
+        a["id"] for a in applicants if a["institution_id"] == institution_id)
+
+    response = dataset.get("/api/tables/applicants?gpa__gte=3.0&gpa__lte=3.5")
+    assert ids(response) == sorted(a["id"] for a in applicants if Decimal("3.0") <= Decimal(str(a["gpa"])) <= Decimal("3.5"))
+
+    prefix = applicants[0]["last_name"][:2]
+    assert ids(dataset.get(f"/api/tables/applicants?last_name__prefix={prefix}")) == sorted(
+        a["id"] for a in applicants if a["last_name"].startswith(prefix))
+
+
+def test_prefix_wildcards_are_literal(dataset):
+    assert dataset.get("/api/tables/applicants?last_name__prefix=%25").json() == []
+    assert dataset.get("/api/tables/applicants?last_name__prefix=_").json() == []
+
+
+def test_unknown_filters_and_bad_values(dataset):
+    assert dataset.get("/api/tables/applicants?password=x").status_code == 400
+    assert dataset.get("/api/tables/applicants?gpa__between=1").status_code == 400
+    # Prefix matching only applies to string columns
+    assert dataset.get("/api/tables/applicants?gpa__prefix=3").status_code == 400
+    response = dataset.get("/api/tables/applicants?gpa__gte=high")
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["query", "gpa__gte"]
+    assert dataset.get("/api/tables/applicants?sort=password").status_code == 400
+
+
+def test_sorted_pages_walk_the_whole_table(dataset):
+    applicants = dataset.get("/api/tables/applicants").json()
+    seen = [row for page in pages(dataset, "/api/tables/applicants?limit=30&sort=gpa&order=desc") for row in page["items"]]
+    assert [row["id"] for row in seen] == [
+        a["id"] for a in sorted(applicants, key=lambda a: (-Decimal(str(a["gpa"])), a["id"]))]
+
+
+def test_sort_keeps_nulls_last_across_pages(dataset):
+    applications = dataset.get("/api/tables/applications").json()
+    assert any(a["decision_date"] is None for a in applications)
+    url = "/api/tables/applications?limit=25&sort=decision_date&order=asc"
+    seen = [row["id"] for page in pages(dataset, url) for row in page["items"]]
+    assert seen == [a["id"] for a in sorted(
+        applications, key=lambda a: (a["decision_date"] is None, a["decision_date"] or "", a["id"]))]
+
+
+def test_cursor_is_tied_to_its_sort_order(dataset):
+    cursor = dataset.get("/api/tables/applicants?limit=5&sort=gpa").json()["next_cursor"]
+    assert dataset.get(f"/api/tables/applicants?limit=5&sort=gpa&cursor={cursor}").status_code == 200
+    assert dataset.get(f"/api/tables/applicants?limit=5&sort=gpa&order=desc&cursor={cursor}").status_code == 400
+    assert dataset.get(f"/api/tables/applicants?limit=5&cursor={cursor}").status_code == 400
+    assert dataset.get("/api/tables/applicants?sort=gpa&after_id=1").status_code == 400
+
+
+def test_search_matches_name_and_email_prefixes(dataset):
+    applicants = dataset.get("/api/tables/applicants").json()
+    term = applicants[0]["first_name"][:3]
+    expected = sorted(a["id"] for a in applicants if any(
+        a[column].lower().startswith(term.lower()) for column in ("first_name", "last_name", "email")))
+    assert ids(dataset.get(f"/api/tables/applicants?q={term.upper()}")) == expected
+
+    response = dataset.get(f"/api/tables/applicants?q={term}&institution_id={applicants[0]['institution_id']}")
+    assert applicants[0]["id"] in ids(response)
+    assert dataset.get("/api/tables/applications?q=x").status_code == 400
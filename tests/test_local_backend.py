@@ -0,0 +1,54 @@
+import io
+
+import pytest
+
+pyarrow = pytest.importorskip("pyarrow")
+import pyarrow.ipc
+import pyarrow.parquet
+
+
+def test_table_as_arrow(client):
+    response = client.get("/api/tables/programs?format=arrow")
+    assert response.status_code == 200
+    table = pyarrow.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == len(client.get("/api/tables/programs").json())
+    assert table.column_names[0].upper() == "ID"
+
+
+def test_table_as_parquet(client):
+    response = client.get("/api/tables/applicants?format=parquet")
+    assert response.status_code == 200
+    table = pyarrow.parquet.read_table(io.BytesIO(response.content))
+    assert table.num_rows == len(client.get("/api/tables/applicants").json())
+
+
+def test_empty_result_as_parquet(client):
+    response = client.get("/api/tables/applicants?format=parquet&gpa__gte=4")
+    assert response.status_code == 200
+    assert pyarrow.parquet.read_table(io.BytesIO(response.content)).num_rows == 0
+
+
+def test_document_file_ranges(client, tmp_path, monkeypatch):
+    import main
+
+    monkeypatch.setattr(main.document_store, "root", str(tmp_path))
+    body = bytes(range(256)) * 1024
+    response = client.put("/api/application_documents/1/file", content=body)
+    assert response.status_code == 200
+    assert response.json()["document_size"] == len(body)
+
+    response = client.get("/api/application_documents/1/file")
+    assert response.status_code == 200
+    assert response.content == body
+    assert "content-encoding" not in response.headers
+
+    response = client.get("/api/application_documents/1/file", headers={"Range": "bytes=1000-1999"})
+    assert response.status_code == 206
+    assert response.content == body[1000:2000]
+    assert response.headers["content-range"] == f"bytes 1000-1999/{len(body)}"
+
+
+def test_reset_metrics_use_api_table_names(client):
+    metrics = client.get("/metrics").text
+    assert 'endpoint="reset",table="application_documents"' in metrics
+    assert 'table="application_document"' not in metrics
@@ -0,0 +1,58 @@
+import datetime
+
+
+def test_cleared_optional_fields_insert_null(client):
+    row = {"application_id": 1, "document_type": "Essay", "document_file": "essay.pdf",
+           "institution_id": "", "document_sha256": "", "document_size": ""}
+    response = client.post("/api/tables/application_documents", json=row)
+    assert response.status_code == 200
+    inserted = response.json()
+    assert inserted["institution_id"] is None
+    assert inserted["document_size"] is None
+
+    applicant = client.get("/api/tables/applicants?limit=1").json()["items"][0]
+    program = client.get("/api/tables/programs?limit=1").json()["items"][0]
+    row = {"applicant_id": applicant["id"], "program_id": program["id"], "outcome": "Pending", "decision_date": ""}
+    response = client.post("/api/tables/applications", json=row)
+    assert response.status_code == 200
+    assert response.json()["decision_date"] is None
+
+
+def test_invalid_rows_name_the_field(client):
+    row = {"first_name": "Ada", "last_name": "Lovelace", "email": "ada@example.com",
+           "date_of_birth": "2000-01-01", "institution_id": 1, "gpa": "4.5"}
+    response = client.post("/api/tables/applicants", json=row)
+    assert response.status_code == 422
+    assert [error["loc"] for error in response.json()["detail"]] == [["body", "gpa"]]
+
+    response = client.post("/api/tables/applicants", json={**row, "gpa": ""})
+    assert response.status_code == 422
+    assert [error["loc"] for error in response.json()["detail"]] == [["body", "gpa"]]
+
+
+def test_offset_dates_are_stored_as_local_time(client):
+    row = {"first_name": "Ada", "last_name": "Lovelace", "email": "ada@example.com",
+           "date_of_birth": "2007-05-15T00:00:00Z", "institution_id": 1, "gpa": "3.5"}
+    response = client.post("/api/tables/applicants", json=row)
+    assert response.status_code == 200
+    expected = datetime.datetime(2007, 5, 15, tzinfo=datetime.timezone.utc).astimezone().replace(tzinfo=None)
+    assert response.json()["date_of_birth"] == expected.isoformat()
+
+    future = (datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=2)).isoformat()
+    response = client.post("/api/tables/applicants", json={**row, "email": "ada2@example.com", "date_of_birth": future})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["ctx"] == {"constraint": "ck_birth_not_future"}
+
+
+def test_decision_date_defaults_against_submission_now(client):
+    applicant = client.get("/api/tables/applicants?limit=1").json()["items"][0]
+    program = client.get("/api/tables/programs?limit=1").json()["items"][0]
+    row = {"applicant_id": applicant["id"], "program_id": program["id"], "status": "Completed",
+           "outcome": "Accepted", "decision_date": "2020-01-01T00:00:00"}
+    response = client.post("/api/tables/applications", json=row)
+    assert response.status_code == 422
+    assert [error["loc"] for error in response.json()["detail"]] == [["body", "decision_date"]]
+
+    tomorrow = (datetime.datetime.now() + datetime.timedelta(days=1)).isoformat()
+    response = client.post("/api/tables/applications", json={**row, "decision_date": tomorrow})
+    assert response.status_code == 200
@@ -0,0 +1,53 @@
+def pages(client, url):
+    cursor = None
+    while True:
+        page = client.get(url + (f"&cursor={cursor}" if cursor else "")).json()
+        yield page
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return
+
+
+def test_cursor_walks_the_whole_table_once(dataset):
+    everything = dataset.get("/api/tables/applicants").json()
+    seen = []
+    for page in pages(dataset, "/api/tables/applicants?limit=40"):
+        assert len(page["items"]) <= 40
+        seen.extend(row["id"] for row in page["items"])
+    assert seen == sorted(row["id"] for row in everything)
+
+
+def test_page_size_and_total(dataset):
+    page = dataset.get("/api/tables/applicants?limit=25&include_total=true").json()
+    assert len(page["items"]) == 25
+    assert page["total"] == len(dataset.get("/api/tables/applicants").json())
+    assert page["next_cursor"] is not None
+
+    page = dataset.get("/api/tables/applicants?limit=5").json()
+    assert "total" not in page
+
+
+def test_last_page_has_no_cursor(dataset):
+    total = len(dataset.get("/api/tables/programs").json())
+    page = dataset.get(f"/api/tables/programs?limit={total}").json()
+    assert len(page["items"]) == total
+    assert page["next_cursor"] is None
+
+
+def test_after_id_seeks_past_a_row(dataset):
+    first = dataset.get("/api/tables/applications?limit=10").json()["items"]
+    after = dataset.get(f"/api/tables/applications?limit=5&after_id={first[4]['id']}").json()["items"]
+    assert [row["id"] for row in after] == [row["id"] for row in first[5:10]]
+
+
+def test_columns_shape(dataset):
+    page = dataset.get("/api/tables/institutions?limit=3&shape=columns").json()
+    assert page["columns"][0] == "id"
+    assert len(page["rows"]) == 3 and len(page["rows"][0]) == len(page["columns"])
+
+
+def test_invalid_cursors_are_rejected(dataset):
+    cursor = dataset.get("/api/tables/applicants?limit=5").json()["next_cursor"]
+    assert dataset.get(f"/api/tables/programs?limit=5&cursor={cursor}").status_code == 400
+    assert dataset.get("/api/tables/applicants?limit=5&cursor=not-a-cursor").status_code == 400
+    assert dataset.get(f"/api/tables/applicants?limit={10_000}").status_code == 422
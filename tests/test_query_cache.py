@@ -0,0 +1,43 @@
+import main
+
+INSTITUTION = {"name": "Aardvark College", "city": "Leeds", "country": "United Kingdom",
+               "accreditation_status": "Provisional"}
+
+
+def cache_counts(client) -> tuple[int, int]:
+    stats = client.get("/api/cache").json()
+    return stats["hits"], stats["misses"]
+
+
+def test_repeated_queries_are_served_from_the_cache(client):
+    first = client.get("/api/prepared-queries/1").json()
+    hits, misses = cache_counts(client)
+    assert client.get("/api/prepared-queries/1").json() == first
+    assert cache_counts(client) == (hits + 1, misses)
+
+
+def test_bind_values_are_cached_separately(client):
+    open_programs = client.get("/api/prepared-queries/2?enrollment_status=Open").json()
+    closed_programs = client.get("/api/prepared-queries/2?enrollment_status=Closed").json()
+    assert {row["enrollment_status"] for row in open_programs} <= {"Open"}
+    assert {row["enrollment_status"] for row in closed_programs} <= {"Closed"}
+
+
+def test_writes_invalidate_only_queries_reading_the_table(client):
+    for key in ("1", "2", "15"):
+        client.get(f"/api/prepared-queries/{key}")
+    assert client.post("/api/tables/institutions", json=INSTITUTION).status_code == 200
+
+    hits, misses = cache_counts(client)
+    rows = client.get("/api/prepared-queries/1").json()
+    assert "Aardvark College" in [row["institution_name"] for row in rows]
+    # #15 reads Institution through Applicant_Summary_View
+    client.get("/api/prepared-queries/15")
+    assert cache_counts(client) == (hits, misses + 2)
+    client.get("/api/prepared-queries/2")
+    assert cache_counts(client) == (hits + 1, misses + 2)
+
+
+def test_query_dependencies_expand_views():
+    assert main.QUERY_TABLES["1"] == {"INSTITUTION"}
+    assert main.QUERY_TABLES["15"] >= {"APPLICANT", "APPLICATION", "INSTITUTION", "PROGRAM"}
@@ -0,0 +1,79 @@
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+import main
+from datagen import generate
+from replica import AnalyticReplica
+from schema import PREPARED_QUERIES
+
+
+@pytest.fixture
+def replica(client, monkeypatch):
+    with main.checkout() as conn:
+        main.reset_schema(conn, generate(500, seed=7))
+    replica = AnalyticReplica(main.table_versions)
+    with main.checkout() as conn:
+        replica.snapshot(conn)
+    # Kept current by the API's writes, as with ANALYTIC_REPLICA=1
+    monkeypatch.setattr(main, "table_copies", [*main.table_copies, replica])
+    return replica
+
+
+def decimal(value) -> Decimal:
+    return Decimal(str(value))
+
+
+def oracle_round(value: Decimal) -> Decimal:
+    # Oracle's ROUND(n, 2) on an exact NUMBER
+    return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def test_replica_tracks_api_writes(client, replica):
+    # The stand-in runs the same SQLite translation as the replica, so this
+    # checks that inserts and deletes reach the replica, not Oracle semantics;
+    # see test_replica_follows_number_arithmetic for those
+    institution = {"name": "Replica U", "city": "Oslo", "country": "Norway", "accreditation_status": "Accredited"}
+    institution_id = client.post("/api/tables/institutions", json=institution).json()["id"]
+    applicant = {"first_name": "Rep", "last_name": "Lica", "email": "rep@example.com",
+                 "date_of_birth": "2001-02-03T00:00:00", "institution_id": institution_id, "gpa": "3.97"}
+    applicant_id = client.post("/api/tables/applicants", json=applicant).json()["id"]
+    program_id = client.get("/api/tables/programs?limit=1").json()["items"][0]["id"]
+    application = {"applicant_id": applicant_id, "program_id": program_id, "outcome": "Pending"}
+    assert client.post("/api/tables/applications", json=application).status_code == 200
+    removed = client.get("/api/tables/applications?limit=1").json()["items"][0]["id"]
+    assert client.delete(f"/api/tables/applications/{removed}").status_code == 200
+
+    for query_key in sorted(main.REPLICA_QUERIES, key=int):
+        sql = PREPARED_QUERIES[query_key]
+        params = main.query_binds(query_key, {})
+        with main.checkout() as conn:
+            expected = main.fetch_result(conn, sql, params)
+        assert replica.fetch(sql, params) == (expected[0], expected[1]), query_key
+
+
+def test_replica_follows_number_arithmetic(client, replica):
+    # Expected values computed from the stored rows with exact decimals, the
+    # way Oracle evaluates NUMBER expressions, not through SQL
+    applicants = {row["id"]: row for row in client.get("/api/tables/applicants").json()}
+    programs = {row["id"]: row for row in client.get("/api/tables/programs").json()}
+    applications = client.get("/api/tables/applications").json()
+    gpas = defaultdict(list)
+    for application in applications:
+        gpas[application["program_id"]].append(decimal(applicants[application["applicant_id"]]["gpa"]))
+    averages = {program_id: oracle_round(sum(values) / len(values)) for program_id, values in gpas.items()}
+
+    expected = sorted(
+        (applicants[a["applicant_id"]]["last_name"], programs[a["program_id"]]["name"],
+         decimal(applicants[a["applicant_id"]]["gpa"]) - averages[a["program_id"]])
+        for a in applications
+    )
+    columns, rows = replica.fetch(PREPARED_QUERIES['15'])
+    last_name, program, difference = (columns.index(c) for c in ("last_name", "program_name", "gpa_difference"))
+    assert sorted((row[last_name], row[program], decimal(row[difference])) for row in rows) == expected
+
+    columns, rows = replica.fetch(PREPARED_QUERIES['10'])
+    by_name = {programs[program_id]["name"]: average for program_id, average in averages.items()}
+    for name, average in rows:
+        assert decimal(average) == by_name[name]
@@ -0,0 +1,16 @@
+import pytest
+
+import main
+
+
+def test_q_quote_picks_a_free_delimiter():
+    assert main.q_quote("SELECT 'a' FROM dual") == "q'[SELECT 'a' FROM dual]'"
+    assert main.q_quote("SELECT ']' FROM dual") == "q'{SELECT ']' FROM dual}'"
+    with pytest.raises(ValueError, match="SELECT"):
+        main.q_quote("SELECT " + " ".join(f"'{closing}'" for _, closing in main.Q_QUOTE_DELIMITERS))
+
+
+def test_reset_block_quotes_every_statement():
+    block = main.script_block("CREATE TABLE t (c VARCHAR2(10) CHECK (c IN ('[x]')))\n/\nBEGIN NULL; END;\n/\n")
+    assert "EXECUTE IMMEDIATE q'{CREATE TABLE t (c VARCHAR2(10) CHECK (c IN ('[x]')))}';" in block
+    assert "BEGIN NULL; END;" in block
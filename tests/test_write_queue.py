@@ -0,0 +1,85 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import main
+from writes import WriteQueue
+
+BATCH_SIZE = 4
+
+
+@pytest.fixture
+def queued(client, monkeypatch):
+    # A long window, so concurrent requests always end up in one batch,
+    # which is flushed as soon as it is full
+    monkeypatch.setattr(main, "write_queue", WriteQueue(main.flush_writes, 5, BATCH_SIZE))
+    return client
+
+
+def concurrently(call, args) -> list:
+    with ThreadPoolExecutor(len(args)) as pool:
+        return list(pool.map(call, args))
+
+
+def institution(name: str, **values) -> dict:
+    return {"name": name, "city": "Ghent", "country": "Belgium", "accreditation_status": "Accredited", **values}
+
+
+def test_concurrent_inserts_share_a_batch(queued):
+    responses = concurrently(lambda name: queued.post("/api/tables/institutions", json=institution(name)),
+                             [f"Queued {i}" for i in range(BATCH_SIZE)])
+    assert [r.status_code for r in responses] == [200] * BATCH_SIZE
+    stored = {row["id"]: row["name"] for row in queued.get("/api/tables/institutions").json()}
+    assert all(stored[r.json()["id"]] == r.json()["name"] for r in responses)
+    stats = queued.get("/api/write-queue").json()
+    assert stats["enabled"] and stats["batch_sizes"] == {str(BATCH_SIZE): 1} and stats["full_batches"] == 1
+
+
+def test_rejected_row_fails_alone(queued):
+    institution_id = queued.get("/api/tables/institutions?limit=1").json()["items"][0]["id"]
+    applicant = {"first_name": "Que", "last_name": "Ued", "date_of_birth": "2000-05-06T00:00:00", "gpa": "3.3"}
+    rows = [{**applicant, "email": f"queued{i}@example.com", "institution_id": institution_id} for i in range(BATCH_SIZE)]
+    rows[2]["institution_id"] = 999_999
+    responses = concurrently(lambda row: queued.post("/api/tables/applicants", json=row), rows)
+    assert [r.status_code for r in responses] == [200, 200, 400, 200]
+    emails = {row["email"] for row in queued.get("/api/tables/applicants").json()}
+    assert {row["email"] for row in rows} - emails == {"queued2@example.com"}
+
+
+def test_row_deleted_twice_in_a_batch(queued):
+    new_ids = queued.post("/api/tables/institutions/bulk", json=[institution("Gone"), institution("Also gone")]).json()["ids"]
+    responses = concurrently(lambda row_id: queued.delete(f"/api/tables/institutions/{row_id}"),
+                             [new_ids[0], new_ids[0], new_ids[1], 999_999])
+    assert sorted(r.status_code for r in responses[:2]) == [200, 404]
+    assert [r.status_code for r in responses[2:]] == [200, 404]
+    remaining = {row["id"] for row in queued.get("/api/tables/institutions").json()}
+    assert not remaining & set(new_ids)
+
+
+def test_batch_failure_reaches_every_writer():
+    def flush(key, items):
+        raise RuntimeError("connection lost")
+
+    queue = WriteQueue(flush, 5, 3)
+    errors = []
+
+    def write(item):
+        try:
+            queue.submit("key", item)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == ["connection lost"] * 3
+    assert queue.stats()["batches"] == 1
+
+
+def test_lone_write_is_flushed_after_the_window():
+    queue = WriteQueue(lambda key, items: [item * 2 for item in items], 0.01, 100)
+    assert queue.submit("key", 21) == 42
+    assert queue.stats()["batch_sizes"] == {1: 1}
@@ -0,0 +1,85 @@
+import threading
+from collections import Counter
+
+
+class _Batch:
+    def __init__(self):
+        self.items = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results = None
+        self.error = None
+
+
+class WriteQueue:
+    # Group commit for single-row writes. The first writer for a key (the kind
+    # of write, the table and the column set) waits up to window_s for others
+    # to join it, or until batch_size have, then hands the whole batch to
+    # flush(key, items), which writes it on one connection with one commit and
+    # returns a result or an exception per item. The others wait for it and
+    # each gets back its own result or has its own exception raised.
+    def __init__(self, flush, window_s: float, batch_size: int):
+        self.flush = flush
+        self.window_s = window_s
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._open = {}  # key -> batch still taking writes
+        self.batches = 0
+        self.writes = 0
+        self.full_batches = 0
+        self.largest_batch = 0
+        self.batch_sizes = Counter()
+
+    def submit(self, key, item):
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._open[key] = _Batch()
+            index = len(batch.items)
+            batch.items.append(item)
+            if len(batch.items) >= self.batch_size:
+                del self._open[key]
+                batch.full.set()
+        if leader:
+            batch.full.wait(self.window_s)
+            with self._lock:
+                if self._open.get(key) is batch:
+                    del self._open[key]
+            self._run(key, batch)
+        else:
+            batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+        result = batch.results[index]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _run(self, key, batch: _Batch):
+        size = len(batch.items)
+        with self._lock:
+            self.batches += 1
+            self.writes += size
+            self.full_batches += size >= self.batch_size
+            self.largest_batch = max(self.largest_batch, size)
+            self.batch_sizes[size] += 1
+        try:
+            batch.results = self.flush(key, batch.items)
+        except Exception as e:
+            batch.error = e
+        finally:
+            batch.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "window_ms": self.window_s * 1000,
+                "batch_size": self.batch_size,
+                "batches": self.batches,
+                "writes": self.writes,
+                "mean_batch_rows": round(self.writes / self.batches, 2) if self.batches else None,
+                "largest_batch": self.largest_batch,
+                "full_batches": self.full_batches,
+                "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            }